@@ -1,32 +1,142 @@
 from http.server import BaseHTTPRequestHandler
+from urllib.parse import unquote
 import sys
 import os
 
 # Add the parent directory to the path so we can import app
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app import app
+from werkzeug.serving import DechunkedInput  # noqa: E402
+from app import app  # noqa: E402
+
+
+def make_environ(request_handler, url_scheme: str = 'http') -> dict:
+    """PEP 3333 environ for the request `request_handler` has parsed; the body is read from its socket as the app asks."""
+    path, _, query = request_handler.path.partition('?')
+    environ = {
+        'REQUEST_METHOD': request_handler.command,
+        'SCRIPT_NAME': '',
+        'PATH_INFO': unquote(path, encoding='latin-1'),
+        'QUERY_STRING': query,
+        'SERVER_NAME': request_handler.server.server_address[0],
+        'SERVER_PORT': str(request_handler.server.server_address[1]),
+        'SERVER_PROTOCOL': request_handler.request_version,
+        'REMOTE_ADDR': request_handler.client_address[0],
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': request_handler.headers.get('X-Forwarded-Proto', url_scheme),
+        'wsgi.input': request_handler.rfile,
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': False,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    for key, value in request_handler.headers.items():
+        name = key.upper().replace('-', '_')
+        if name in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            environ[name] = value
+            continue
+        name = 'HTTP_' + name
+        environ[name] = f"{environ[name]},{value}" if name in environ else value
+    if request_handler.headers.get('Transfer-Encoding', '').strip().lower() == 'chunked':
+        environ['wsgi.input_terminated'] = True
+        environ['wsgi.input'] = DechunkedInput(request_handler.rfile)
+    return environ
+
 
 class handler(BaseHTTPRequestHandler):
-    def do_GET(self):
-        # Handle GET requests
-        self.send_response(200)
-        self.send_header('Content-type', 'text/html')
-        self.end_headers()
-        
-        # Import and run Flask app
-        with app.test_client() as client:
-            response = client.get(self.path)
-            self.wfile.write(response.data)
-    
-    def do_POST(self):
-        # Handle POST requests
-        content_length = int(self.headers['Content-Length'])
-        post_data = self.rfile.read(content_length)
-        
-        with app.test_client() as client:
-            response = client.post(self.path, data=post_data)
-            self.send_response(response.status_code)
-            self.send_header('Content-type', response.content_type)
+    """Runs every request through the Flask app as WSGI.
+
+    The request body is handed to the app as the socket stream (Werkzeug reads
+    it up to Content-Length, so uploads go straight into the spool), and the
+    status, headers and body the app produces are written back as they come;
+    responses without a Content-Length are sent chunked, so SSE and NDJSON
+    streams reach the client incrementally.
+    """
+
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; without this, Nagle + delayed ACK stalls small responses
+    disable_nagle_algorithm = True
+    wsgi_app = app
+
+    def run_wsgi(self):
+        environ = make_environ(self)
+        state = {'status': None, 'headers': None, 'sent': False, 'chunked': False}
+
+        def start_response(status, response_headers, exc_info=None):
+            if exc_info:
+                try:
+                    if state['sent']:
+                        raise exc_info[1].with_traceback(exc_info[2])
+                finally:
+                    exc_info = None
+            elif state['status'] is not None:
+                raise AssertionError('Headers already set')
+            state['status'], state['headers'] = status, response_headers
+            return write
+
+        def send_headers():
+            code, _, reason = state['status'].partition(' ')
+            code = int(code)
+            self.send_response(code, reason)
+            header_names = set()
+            for key, value in state['headers']:
+                self.send_header(key, value)
+                header_names.add(key.lower())
+            bodyless = self.command == 'HEAD' or code < 200 or code in (204, 304)
+            if not bodyless and 'content-length' not in header_names and 'transfer-encoding' not in header_names:
+                if self.request_version == 'HTTP/1.0':
+                    self.close_connection = True  # the end of the body is marked by closing the connection
+                else:
+                    state['chunked'] = True
+                    self.send_header('Transfer-Encoding', 'chunked')
             self.end_headers()
-            self.wfile.write(response.data)
+            state['sent'] = self.headers_sent = True
+
+        def write(data):
+            if not state['sent']:
+                send_headers()
+            if not data or self.command == 'HEAD':
+                return
+            if state['chunked']:
+                self.wfile.write(b'%X\r\n' % len(data) + data + b'\r\n')
+            else:
+                self.wfile.write(data)
+            self.wfile.flush()
+
+        app_iter = self.wsgi_app(environ, start_response)
+        try:
+            for data in app_iter:
+                write(data)
+            if not state['sent']:
+                write(b'')
+            if state['chunked']:
+                self.wfile.write(b'0\r\n\r\n')
+        finally:
+            if hasattr(app_iter, 'close'):
+                app_iter.close()
+        # A body the app did not read would be parsed as the next request; don't reuse the connection
+        if int(environ.get('CONTENT_LENGTH') or 0) > 0 or environ.get('wsgi.input_terminated'):
+            self.close_connection = True
+
+    def handle_one_request(self):
+        """Like the base class, but every method goes to the WSGI app."""
+        self.raw_requestline = self.rfile.readline(65537)
+        if len(self.raw_requestline) > 65536:
+            self.send_error(414)
+            return
+        if not self.raw_requestline:
+            self.close_connection = True
+            return
+        if not self.parse_request():
+            return
+        self.headers_sent = False
+        try:
+            self.run_wsgi()
+        except (ConnectionError, BrokenPipeError):
+            self.close_connection = True
+        except Exception as e:
+            print(f"[wsgi] Unhandled error for {self.command} {self.path}: {e}")
+            self.close_connection = True
+            if not self.headers_sent:
+                self.send_error(500)
+        self.wfile.flush()
@@ -1,6 +1,5 @@
 
-from flask import Flask, request, render_template, jsonify, redirect, url_for, flash
-import boto3
+from flask import Flask, Request, g, request, render_template, jsonify, redirect, url_for, flash, Response, stream_with_context
 import uuid
 import os
 import time
@@ -9,81 +8,185 @@ from werkzeug.utils import secure_filename
 
 # --- Import text processing logic ---
 import json
-import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin
 # --- End imports ---
 import threading
-import io
-from botocore.exceptions import ClientError
+import codecs
+import mimetypes
+import shutil
+import tarfile
+import zipfile
+from collections import deque
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+from vosk_engine import get_registry
+from vosk_parallel import ParallelTranscriber
+from job_scheduler import JobScheduler, QueueFullError, SchedulerClosedError
+from job_registry import JobRegistry
+from signbsl_cache import SignLookupCache, load_manifest, ERROR, MISS
+from signbsl_lookup import lookup_signbsl_video, signbsl_cache_key
+from signbsl_resolver import SignResolver
+import http_client
+from sign_lexicon import load_lexicon
+from phrase_trie import segment_words, StreamingSegmenter
+from upload_spool import UploadSpool, SpoolFullError
+from upload_dedup import UploadDedupIndex, NEW, COMPLETED
+from result_cache import ResultCache
+from text_memo import TranslationMemo, normalize_text
+from text_segments import iter_sentences
+from batch_registry import BatchRegistry
+from live_transcription import LiveTranscriber
+try:
+    from flask_sock import Sock
+except ImportError:  # live transcription is optional
+    Sock = None
+import atexit
+
+
+class SpoolingRequest(Request):
+    """Request whose uploaded files are written straight into UPLOAD_SPOOL by the form parser."""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        expected = content_length
+        if not expected and total_content_length:
+            # Files are parsed one after another: this one can only be as big as what is left of the body
+            expected = max(0, total_content_length - sum(s.tell() for s in g.get('spool_streams', ())))
+        stream = UPLOAD_SPOOL.create_stream(expected)
+        g.setdefault('spool_streams', []).append(stream)
+        return stream
+
+    @property
+    def max_content_length(self):
+        if self.endpoint == 'upload_batch':
+            return app.config['BATCH_MAX_CONTENT_MB'] * 1024 * 1024
+        return super().max_content_length
+
 
 app = Flask(__name__)
+app.request_class = SpoolingRequest
 app.config.from_object(Config)
 
-# Initialize AWS clients
-s3_client = boto3.client(
-    's3',
-    aws_access_key_id=app.config['AWS_ACCESS_KEY_ID'],
-    aws_secret_access_key=app.config['AWS_SECRET_ACCESS_KEY'],
-    region_name=app.config['AWS_REGION']
+# AWS clients are created on first use: importing boto3 and building a client is a large
+# share of cold start, and pages like / never touch S3
+s3_client = None
+_s3_client_lock = threading.Lock()
+
+def get_s3_client():
+    global s3_client
+    if s3_client is None:
+        with _s3_client_lock:
+            if s3_client is None:
+                import boto3
+                s3_client = boto3.client(
+                    's3',
+                    aws_access_key_id=app.config['AWS_ACCESS_KEY_ID'],
+                    aws_secret_access_key=app.config['AWS_SECRET_ACCESS_KEY'],
+                    region_name=app.config['AWS_REGION']
+                )
+    return s3_client
+
+# Multipart settings for streaming spooled uploads to S3 (boto3 is only imported on first upload)
+_transfer_config = None
+
+def get_transfer_config():
+    global _transfer_config
+    if _transfer_config is None:
+        from boto3.s3.transfer import TransferConfig
+        chunk = max(5, app.config['S3_MULTIPART_CHUNK_MB']) * 1024 * 1024  # S3's minimum part size is 5MB
+        _transfer_config = TransferConfig(
+            multipart_threshold=chunk,
+            multipart_chunksize=chunk,
+            max_concurrency=max(1, app.config['S3_UPLOAD_CONCURRENCY']),
+        )
+    return _transfer_config
+
+# Uploaded audio lives here until AWS answers or the local fallback has run
+UPLOAD_SPOOL = UploadSpool(
+    app.config['UPLOAD_SPOOL_DIR'],
+    max_disk_bytes=app.config['UPLOAD_SPOOL_MAX_MB'] * 1024 * 1024,
+    memory_budget_bytes=app.config['AUDIO_MEMORY_BUDGET_MB'] * 1024 * 1024,
+    memory_threshold_bytes=app.config['UPLOAD_IN_MEMORY_MAX_KB'] * 1024,
 )
 
+@app.teardown_request
+def discard_unclaimed_uploads(exc):
+    # Files the view did not adopt (wrong field, bad extension, errors) are dropped with the request
+    for stream in g.pop('spool_streams', ()):
+        UPLOAD_SPOOL.discard(stream)
+
+@app.errorhandler(SpoolFullError)
+def spool_full(e):
+    return jsonify({'success': False, 'message': str(e)}), 503
+
 ALLOWED_EXTENSIONS = {'wav', 'mp3', 'mp4', 'm4a', 'flac', 'webm', 'ogg'}
 
+# Shared Vosk model + recognizer pool for the local fallback (model loads once per process)
+vosk_registry = get_registry(
+    app.config['VOSK_MODEL_PATH'], app.config['VOSK_RECOGNIZER_POOL_SIZE'], app.config['VOSK_LOAD_RETRY_SECS'],
+)
+# Long recordings are split at pauses and recognized on a process pool forked after the model loads.
+# The pool is only forked here, at import, before any of the app's threads exist
+vosk_transcriber = ParallelTranscriber(
+    vosk_registry,
+    workers=app.config['VOSK_PARALLEL_WORKERS'],
+    min_parallel_secs=app.config['VOSK_PARALLEL_MIN_SECS'],
+    target_segment_secs=app.config['VOSK_SEGMENT_TARGET_SECS'],
+    max_segment_secs=app.config['VOSK_SEGMENT_MAX_SECS'],
+)
+atexit.register(vosk_transcriber.shutdown)
+if app.config['VOSK_PRELOAD']:
+    if vosk_transcriber.workers > 1:
+        vosk_transcriber.start()
+    else:
+        threading.Thread(target=vosk_registry.get_model, daemon=True).start()
+
+# Bounded worker pool for local transcription + timers for the AWS wait window
+job_scheduler = JobScheduler(
+    max_workers=app.config['TRANSCRIBE_WORKERS'],
+    max_queue=app.config['TRANSCRIBE_QUEUE_LIMIT'],
+    io_workers=app.config['AWS_WAIT_WORKERS'],
+)
+atexit.register(job_scheduler.shutdown, app.config['SHUTDOWN_DRAIN_SECS'])
+
+# Completion events for jobs started by this process (waiters block here instead of polling S3)
+job_registry = JobRegistry()
+
+# Completed results, so repeat status polls and results-page loads don't go back to S3
+RESULT_CACHE = ResultCache(
+    max_bytes=app.config['RESULT_CACHE_MAX_MB'] * 1024 * 1024,
+    disk_dir=app.config['RESULT_CACHE_DIR'],
+    disk_max_bytes=app.config['RESULT_CACHE_DISK_MAX_MB'] * 1024 * 1024,
+)
+# Sign sequences of recently translated text, so repeated phrases skip mapping entirely
+TEXT_MEMO = TranslationMemo(
+    max_entries=app.config['TEXT_MEMO_MAX_ENTRIES'],
+    ttl_secs=app.config['TEXT_MEMO_TTL_SECS'],
+)
+
 # --- Copying text processing and sign mapping logic from local_demo.py ---
-SIGN_MAPPING = {
-    # Multi-word phrases (these will be matched first due to greedy algorithm)
-    'thank you very much': 'https://via.placeholder.com/200x200/4CAF50/white?text=THANK+YOU+VERY+MUCH',
-    'how are you': 'https://via.placeholder.com/200x200/2196F3/white?text=HOW+ARE+YOU',
-    'nice to meet you': 'https://via.placeholder.com/200x200/9C27B0/white?text=NICE+TO+MEET+YOU',
-    'good morning': 'https://via.placeholder.com/200x200/FF9800/white?text=GOOD+MORNING',
-    'good afternoon': 'https://via.placeholder.com/200x200/FFC107/black?text=GOOD+AFTERNOON',
-    'good evening': 'https://via.placeholder.com/200x200/673AB7/white?text=GOOD+EVENING',
-    'good night': 'https://via.placeholder.com/200x200/424242/white?text=GOOD+NIGHT',
-    'thank you': 'https://via.placeholder.com/200x200/4CAF50/white?text=THANK+YOU',
-    'excuse me': 'https://via.placeholder.com/200x200/FF5722/white?text=EXCUSE+ME',
-    'i am': 'https://via.placeholder.com/200x200/607D8B/white?text=I+AM',
-    'you are': 'https://via.placeholder.com/200x200/795548/white?text=YOU+ARE',
-    'my name': 'https://via.placeholder.com/200x200/009688/white?text=MY+NAME',
-    'what is': 'https://via.placeholder.com/200x200/3F51B5/white?text=WHAT+IS',
-    'how much': 'https://via.placeholder.com/200x200/E91E63/white?text=HOW+MUCH',
-    'where is': 'https://via.placeholder.com/200x200/8BC34A/white?text=WHERE+IS',
-    'see you later': 'https://via.placeholder.com/200x200/FF9800/white?text=SEE+YOU+LATER',
-    'have a nice day': 'https://via.placeholder.com/200x200/4CAF50/white?text=HAVE+NICE+DAY',
-    'very much': 'https://via.placeholder.com/200x200/9E9E9E/white?text=VERY+MUCH',
-    'very good': 'https://via.placeholder.com/200x200/4CAF50/white?text=VERY+GOOD',
-    'please help': 'https://via.placeholder.com/200x200/FF5722/white?text=PLEASE+HELP',
-    'hello world': 'https://via.placeholder.com/200x200/2196F3/white?text=HELLO+WORLD',
-    'hello': 'https://via.placeholder.com/200x200/4CAF50/white?text=HELLO',
-    'world': 'https://via.placeholder.com/200x200/2196F3/white?text=WORLD',
-    'thank': 'https://via.placeholder.com/200x200/FF9800/white?text=THANK',
-    'you': 'https://via.placeholder.com/200x200/9C27B0/white?text=YOU',
-}
-SORTED_SIGN_KEYS = sorted(SIGN_MAPPING.keys(), key=lambda x: len(x.split()), reverse=True)
-SIGNBSL_CACHE = {}
+# Phrase lexicon shared with local_demo.py and the Lambda (compiled from lexicon/signs.json)
+SIGN_LEXICON = load_lexicon()
+# Pooled keep-alive connections to www.signbsl.com, sized for the lookup workers
+http_client.configure(
+    pool_size=app.config['SIGNBSL_HTTP_POOL_SIZE'],
+    connect_timeout=app.config['SIGNBSL_CONNECT_TIMEOUT'],
+    read_timeout=app.config['SIGNBSL_READ_TIMEOUT'],
+)
+SIGNBSL_CACHE = SignLookupCache(
+    app.config['SIGNBSL_CACHE_PATH'],
+    lru_size=app.config['SIGNBSL_CACHE_LRU_SIZE'],
+    max_entries=app.config['SIGNBSL_CACHE_MAX_ENTRIES'],
+    found_ttl=app.config['SIGNBSL_TTL_FOUND_SECS'],
+    not_found_ttl=app.config['SIGNBSL_TTL_NOT_FOUND_SECS'],
+    error_ttl=app.config['SIGNBSL_TTL_ERROR_SECS'],
+)
+# Words pre-resolved by signbsl_crawler.py never need a live lookup in the request path
+_manifest_entries = load_manifest(app.config['SIGNBSL_MANIFEST_PATH'])
+if _manifest_entries:
+    SIGNBSL_CACHE.preload(_manifest_entries)
+    print(f"[signbsl] Preloaded {len(_manifest_entries)} crawled lookups from {app.config['SIGNBSL_MANIFEST_PATH']}")
 
 def fetch_signbsl_video_url(word_or_phrase):
-    cache_key = word_or_phrase.lower().replace(' ', '-')
-    if cache_key in SIGNBSL_CACHE:
-        return SIGNBSL_CACHE[cache_key]
-    try:
-        formatted_word = word_or_phrase.lower().replace(' ', '-')
-        signbsl_url = f"https://www.signbsl.com/sign/{formatted_word}"
-        headers = {'User-Agent': 'Mozilla/5.0'}
-        response = requests.get(signbsl_url, headers=headers, timeout=10)
-        if response.status_code == 200:
-            soup = BeautifulSoup(response.content, 'html.parser')
-            video_tag = soup.find('video')
-            if video_tag:
-                source = video_tag.find('source')
-                video_url = urljoin(signbsl_url, source['src'] if source else video_tag['src'])
-                SIGNBSL_CACHE[cache_key] = video_url
-                return video_url
-        SIGNBSL_CACHE[cache_key] = None
-        return None
-    except Exception:
-        SIGNBSL_CACHE[cache_key] = None
-        return None
+    return lookup_signbsl_video(word_or_phrase, SIGNBSL_CACHE)[1]
 
 def create_text_fallback(word_or_phrase):
     """Create a text-based fallback for words/phrases without sign videos"""
@@ -97,14 +200,30 @@ def get_sign_url(word_or_phrase):
     # Fallback: return simple text
     return create_text_fallback(word_or_phrase)
 
+def peek_signbsl_cache(word_or_phrase):
+    return SIGNBSL_CACHE.get(signbsl_cache_key(word_or_phrase))
+
+# Resolves all distinct words of a sentence at once; only cache misses hit the network, in parallel
+SIGN_RESOLVER = SignResolver(
+    fetch_signbsl_video_url,
+    peek=peek_signbsl_cache,
+    max_workers=app.config['SIGNBSL_LOOKUP_WORKERS'],
+)
+
 def map_text_to_signs_greedy(text):
     words = text.lower().split()
+    # Longest lexicon phrase first, then single words
+    return signs_for_segments(segment_words(words, SIGN_LEXICON))
+
+def signs_for_segments(segments):
+    """Sign entries for (key, original_words, matched) segments; every distinct key is resolved in one batch."""
+    if not segments:
+        return []
+    video_urls = SIGN_RESOLVER.resolve(key for key, _, _ in segments)
+
     sign_sequence = []
-    i = 0
-    while i < len(words):
-        # Process each word individually - no phrase matching
-        clean_word = ''.join(char for char in words[i] if char.isalnum())
-        sign_url = get_sign_url(clean_word)
+    for key, original_words, _ in segments:
+        sign_url = video_urls[key] or create_text_fallback(key)
         
         # Determine source based on whether it's a real BSL video or text fallback
         if 'signbsl.com' in sign_url:
@@ -113,12 +232,50 @@ def map_text_to_signs_greedy(text):
             source = 'text_fallback'
         
         sign_sequence.append({
-            'word': clean_word, 
+            'word': key, 
+            'original_words': original_words,
             'image_url': sign_url, 
-            'phrase_length': 1,
+            'phrase_length': len(original_words),
             'source': source
         })
-        i += 1
+    return sign_sequence
+
+class StreamingSignMapper:
+    """map_text_to_signs_greedy() for text that arrives in pieces (e.g. one recognizer utterance at a time).
+
+    feed() returns only the signs that became certain; words that could still be the
+    start of a longer phrase wait for the next piece or finish(). The collected
+    sign_sequence is identical to map_text_to_signs_greedy() of all the text.
+    """
+
+    def __init__(self):
+        self._segmenter = StreamingSegmenter(SIGN_LEXICON)
+        self.sign_sequence = []
+
+    def feed(self, text: str):
+        signs = signs_for_segments(self._segmenter.extend(text.lower().split()))
+        self.sign_sequence.extend(signs)
+        return signs
+
+    def finish(self):
+        signs = signs_for_segments(self._segmenter.finish())
+        self.sign_sequence.extend(signs)
+        return signs
+
+def lookup_failed(word_or_phrase):
+    """True if the SignBSL lookup for this key errored (or its outcome was not cached at all)."""
+    entry = SIGNBSL_CACHE.get_entry(signbsl_cache_key(word_or_phrase))
+    return entry is MISS or entry[1] == ERROR
+
+def translate_text(text):
+    """map_text_to_signs_greedy() through TEXT_MEMO. The returned list may be shared; don't modify it."""
+    key = normalize_text(text)
+    sign_sequence = TEXT_MEMO.get(key)
+    if sign_sequence is None:
+        sign_sequence = map_text_to_signs_greedy(key)
+        # A text fallback caused by a failed lookup is temporary; don't pin it in the memo
+        if not any(sign['source'] == 'text_fallback' and lookup_failed(sign['word']) for sign in sign_sequence):
+            TEXT_MEMO.put(key, sign_sequence)
     return sign_sequence
 # --- End of copied logic ---
 
@@ -126,127 +283,269 @@ def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
 
-# --- Helper: Check if processed result exists in S3 ---
-def processed_result_exists(job_id: str) -> bool:
+# --- Helper: Read a processed result from S3 (one GET, no HEAD) ---
+# S3 checks for Lambda-written results back off exponentially between these bounds
+S3_POLL_INITIAL_SECS = 2
+S3_POLL_MAX_SECS = 15
+
+
+def fetch_processed_result(job_id: str):
+    """Return the parsed result JSON for `job_id`, or None if it doesn't exist (yet) or can't be read.
+
+    Completed results are served from RESULT_CACHE; ones read from S3 are added to it.
+    """
+    cached = RESULT_CACHE.get(job_id)
+    if cached is not None:
+        return json.loads(cached)
     processed_key = f"{job_id}_result.json"
     try:
-        s3_client.head_object(Bucket=app.config['PROCESSED_BUCKET'], Key=processed_key)
-        return True
-    except ClientError as e:
+        obj = get_s3_client().get_object(Bucket=app.config['PROCESSED_BUCKET'], Key=processed_key)
+        body = obj['Body'].read()
+        result = json.loads(body.decode('utf-8'))
+        if not is_error_result(result):
+            RESULT_CACHE.put(job_id, body)
+        return result
+    except get_s3_client().exceptions.NoSuchKey:
+        return None
+    except get_s3_client().exceptions.ClientError as e:
         code = e.response.get('Error', {}).get('Code')
-        if code in ('404', 'NoSuchKey', 'NotFound'):
-            return False
-        # Other errors: log and assume not found
-        print(f"[status-check] Unexpected S3 error for {processed_key}: {e}")
-        return False
+        if code not in ('404', 'NoSuchKey', 'NotFound'):
+            # Other errors: log and assume not found
+            print(f"[status-check] Unexpected S3 error for {processed_key}: {e}")
+        return None
+    except Exception as e:
+        print(f"[status-check] Failed to read {processed_key}: {e}")
+        return None
+
 
+def is_error_result(result) -> bool:
+    return isinstance(result, dict) and str(result.get('status') or '').lower() == 'error'
 
-# --- Fallback: Local transcription with faster-whisper ---
-def transcribe_with_local_engine(audio_bytes: bytes, content_type: str = None):
-    """Local offline fallback using Vosk. Uses ffmpeg to decode (m4a/mp3) to WAV before recognition."""
+
+def store_processed_result(job_id: str, result: dict) -> None:
+    """Write a result to the processed bucket (where /status looks for it) and to the local cache."""
+    body = json.dumps(result)
+    get_s3_client().put_object(
+        Bucket=app.config['PROCESSED_BUCKET'],
+        Key=f"{job_id}_result.json",
+        Body=body,
+        ContentType='application/json'
+    )
+    if not is_error_result(result):
+        RESULT_CACHE.put(job_id, body)
+
+
+def load_dedup_entry(digest: str):
+    """Job id recorded for this audio digest in the processed bucket, if its result is still usable."""
     try:
-        from vosk import Model, KaldiRecognizer
-        import tempfile
-        import subprocess
-        import wave as _wave
-
-        # Write original bytes to temp input file
-        with tempfile.NamedTemporaryFile(suffix='.input', delete=False) as in_f:
-            in_f.write(audio_bytes)
-            in_path = in_f.name
-
-        # Transcode to mono 16kHz WAV using ffmpeg
-        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as out_f:
-            out_path = out_f.name
-
-        ffmpeg_cmd = [
-            'ffmpeg', '-y', '-hide_banner', '-loglevel', 'error',
-            '-i', in_path,
-            '-ac', '1', '-ar', '16000', out_path
-        ]
-        try:
-            subprocess.run(ffmpeg_cmd, check=True)
-        except Exception as e:
-            print(f"[fallback-local] ffmpeg not found or failed to transcode: {e}. If newly installed, restart the server.")
-            return None
+        obj = get_s3_client().get_object(Bucket=app.config['PROCESSED_BUCKET'], Key=f"dedup/{digest}.json")
+        job_id = json.loads(obj['Body'].read().decode('utf-8')).get('job_id')
+    except get_s3_client().exceptions.NoSuchKey:
+        return None
+    except get_s3_client().exceptions.ClientError as e:
+        if e.response.get('Error', {}).get('Code') not in ('404', 'NoSuchKey', 'NotFound'):
+            print(f"[upload-dedup] Unexpected S3 error for dedup/{digest}.json: {e}")
+        return None
+    if not job_id:
+        return None
+    # The result may have been deleted (e.g. by a bucket lifecycle rule) since the entry was written
+    result = fetch_processed_result(job_id)
+    if result is None or is_error_result(result):
+        return None
+    return job_id
 
-        # Read WAV via stdlib
-        try:
-            with _wave.open(out_path, 'rb') as wf:
-                sr = wf.getframerate()
-                nframes = wf.getnframes()
-                sampwidth = wf.getsampwidth()
-                frames = wf.readframes(nframes)
-                if sampwidth != 2:
-                    print(f"[fallback-local] Unexpected sample width: {sampwidth}")
-                    return None
-        except Exception as e:
-            print(f"[fallback-local] Failed to read transcoded WAV: {e}")
-            return None
 
-        # Load Vosk model
-        model_path = os.getenv('VOSK_MODEL_PATH', 'vosk-model-small-en-us-0.15')
-        if not os.path.isdir(model_path):
-            print(f"[fallback-local] Vosk model not found at '{model_path}'. Download and set VOSK_MODEL_PATH.")
+def save_dedup_entry(digest: str, job_id: str) -> None:
+    get_s3_client().put_object(
+        Bucket=app.config['PROCESSED_BUCKET'],
+        Key=f"dedup/{digest}.json",
+        Body=json.dumps({'job_id': job_id}),
+        ContentType='application/json'
+    )
+
+
+# Uploads are hashed as they stream in; identical audio maps to one job
+UPLOAD_DEDUP = UploadDedupIndex(
+    max_entries=app.config['UPLOAD_DEDUP_MAX_ENTRIES'],
+    load=load_dedup_entry,
+    save=save_dedup_entry,
+) if app.config['UPLOAD_DEDUP_ENABLED'] else None
+
+
+def claim_upload(audio, job_id: str):
+    """Look a spooled upload up in the dedup index: (outcome, job_id). Duplicates are released here."""
+    outcome = NEW
+    if UPLOAD_DEDUP is not None:
+        outcome, job_id = UPLOAD_DEDUP.claim(audio.sha256, job_id)
+    if outcome != NEW:
+        audio.release()
+        print(f"[upload-dedup] Upload of {audio.filename} matches {outcome} job_id={job_id}")
+    return outcome, job_id
+
+
+def settle_upload_dedup(audio, job_id: str, succeeded: bool) -> None:
+    """Record a finished job in the dedup index, or drop its claim so the next identical upload retries."""
+    if UPLOAD_DEDUP is None or not audio.sha256:
+        return
+    if succeeded:
+        UPLOAD_DEDUP.complete(audio.sha256, job_id)
+    else:
+        UPLOAD_DEDUP.abandon(audio.sha256, job_id)
+
+
+def wait_for_result(job_id: str, timeout: float):
+    """Block until `job_id` has a result or `timeout` elapses.
+
+    Jobs orchestrated by this process are signalled through the in-process
+    registry (the orchestrator already watches S3 for the Lambda's output), so
+    waiters just block on it. Other jobs are read from S3 with exponential
+    backoff; AWS error results are ignored so the caller keeps waiting for the
+    local overwrite.
+    """
+    if job_registry.is_tracked(job_id):
+        return job_registry.wait(job_id, timeout)
+
+    deadline = time.monotonic() + timeout
+    delay = S3_POLL_INITIAL_SECS
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
             return None
+        if job_registry.is_tracked(job_id):
+            result = job_registry.wait(job_id, min(delay, remaining))
+            if result is not None:
+                return result
+        else:
+            time.sleep(min(delay, remaining))
+        result = fetch_processed_result(job_id)
+        if result is not None and not is_error_result(result):
+            job_registry.complete(job_id, result)
+            return result
+        delay = min(delay * 2, S3_POLL_MAX_SECS)
 
-        model = Model(model_path)
-        rec = KaldiRecognizer(model, sr)
-        rec.SetWords(True)
-
-        # Stream PCM chunks to recognizer (16-bit little-endian)
-        bytes_per_sample = 2  # sampwidth ensured above
-        samples_per_chunk = 4000
-        step_bytes = samples_per_chunk * bytes_per_sample
-        for i in range(0, len(frames), step_bytes):
-            chunk = frames[i:i+step_bytes]
-            rec.AcceptWaveform(chunk)
-
-        final = rec.FinalResult()
-        import json as _json
-        text = _json.loads(final).get('text', '').strip()
-        print(f"[fallback-local] Vosk transcription length={len(text)} chars")
+
+# --- Fallback: Local transcription with Vosk ---
+def transcribe_with_local_engine(audio, content_type: str = None):
+    """Local offline fallback using Vosk on audio bytes or a file path; long recordings are recognized in parallel segments when the worker pool is running."""
+    try:
+        result = vosk_transcriber.transcribe(audio, content_type)
+        if result is None:
+            return None
+        text = result['text']
+        print(f"[fallback-local] Vosk transcription length={len(text)} chars from {result['segments']} segment(s)")
         return text or None
     except Exception as e:
         print(f"[fallback-local] Exception during Vosk transcription: {e}")
         return None
 
 
-# --- Background orchestrator: wait for AWS result, else fallback to HF and write result ---
-def orchestrate_processing(job_id: str, audio_bytes: bytes, content_type: str, original_filename: str) -> None:
+def upload_spooled_audio(audio, key: str) -> None:
+    """Stream a spooled upload to the upload bucket; spool files go up as parallel multipart parts read from disk."""
+    extra_args = {'ContentType': audio.content_type}
+    if audio.in_memory:
+        get_s3_client().upload_fileobj(audio.open(), app.config['UPLOAD_BUCKET'], key, ExtraArgs=extra_args)
+    else:
+        get_s3_client().upload_file(
+            audio.path, app.config['UPLOAD_BUCKET'], key,
+            ExtraArgs=extra_args, Config=get_transfer_config(),
+        )
+
+
+def start_upload_job(audio, key: str, job_id: str, original_filename: str) -> None:
+    """Send a claimed upload to S3 under `key` and start watching for its result."""
     try:
-        # Prefer configured value
-        total_wait_seconds = app.config.get('AWS_RESULT_WAIT_SECS') or int(os.getenv('AWS_RESULT_WAIT_SECS', '60'))
-        interval_secs = 3
-        waited = 0
-        print(f"[orchestrator] Waiting up to {total_wait_seconds}s for AWS result for job_id={job_id}")
-        while waited < total_wait_seconds:
-            if processed_result_exists(job_id):
-                # Inspect the existing result; if it's an error, attempt HF fallback
-                processed_key = f"{job_id}_result.json"
-                try:
-                    obj = s3_client.get_object(Bucket=app.config['PROCESSED_BUCKET'], Key=processed_key)
-                    payload = obj['Body'].read().decode('utf-8')
-                    current = json.loads(payload)
-                except Exception as e:
-                    print(f"[orchestrator] Failed to read existing result for job_id={job_id}: {e}")
-                    current = None
-
-                if isinstance(current, dict) and current.get('status') == 'error':
-                    print(f"[orchestrator] AWS result indicates error for job_id={job_id}; proceeding with local fallback")
-                    break  # exit wait loop to fallback
-
-                print(f"[orchestrator] AWS result detected for job_id={job_id}")
-                return
-            time.sleep(interval_secs)
-            waited += interval_secs
-
-        print(f"[orchestrator] AWS result not found in {total_wait_seconds}s. Falling back to local engine (Vosk) for job_id={job_id}")
-        transcription_text = transcribe_with_local_engine(audio_bytes, content_type)
+        upload_spooled_audio(audio, key)
+    except Exception:
+        audio.release()
+        settle_upload_dedup(audio, job_id, False)
+        raise
+    # Watch for the AWS result and fall back locally if it doesn't arrive in time
+    try:
+        orchestrate_processing(job_id, audio, original_filename)
+    except SchedulerClosedError as e:
+        drop_upload_job(job_id, audio, str(e))
+        raise
+
+
+# --- Background orchestrator: wait for AWS result (timer-driven), else fall back to Vosk and write result ---
+def orchestrate_processing(job_id: str, audio, original_filename: str) -> None:
+    """Start watching for the AWS result. Returns immediately; checks run as scheduler timers.
+
+    `audio` is the upload's SpooledAudio; it is released once AWS answers or the fallback has run.
+    """
+    # Prefer configured value
+    total_wait_seconds = app.config.get('AWS_RESULT_WAIT_SECS') or int(os.getenv('AWS_RESULT_WAIT_SECS', '60'))
+    deadline = time.monotonic() + total_wait_seconds
+    job_registry.register(job_id, 'waiting_aws', 'Audio uploaded. Waiting for AWS Transcribe...')
+    print(f"[orchestrator] Waiting up to {total_wait_seconds}s for AWS result for job_id={job_id}")
+    job_scheduler.call_later(
+        S3_POLL_INITIAL_SECS, check_aws_result,
+        job_id, audio, original_filename, deadline, S3_POLL_INITIAL_SECS,
+        on_drop=partial(drop_upload_job, job_id, audio, SHUTDOWN_MESSAGE),
+    )
+
+
+def check_aws_result(job_id: str, audio, original_filename: str, deadline: float, delay: float) -> None:
+    """Timer callback: stop if AWS produced a result, fall back on error/timeout, otherwise check again later."""
+    current = fetch_processed_result(job_id)
+    if current is not None and not is_error_result(current):
+        print(f"[orchestrator] AWS result detected for job_id={job_id}")
+        audio.release()
+        job_registry.complete(job_id, current)
+        settle_upload_dedup(audio, job_id, True)
+        return
+
+    if current is not None:
+        print(f"[orchestrator] AWS result indicates error for job_id={job_id}; proceeding with local fallback")
+        job_registry.update(job_id, 'aws_error', 'AWS processing error detected. Retrying locally...')
+    else:
+        remaining = deadline - time.monotonic()
+        if remaining > 0:
+            delay = min(delay * 2, S3_POLL_MAX_SECS)
+            try:
+                job_scheduler.call_later(
+                    min(delay, remaining), check_aws_result,
+                    job_id, audio, original_filename, deadline, delay,
+                    on_drop=partial(drop_upload_job, job_id, audio, SHUTDOWN_MESSAGE),
+                )
+            except SchedulerClosedError as e:
+                drop_upload_job(job_id, audio, str(e))
+            return
+        print(f"[orchestrator] AWS result not found in time. Falling back to local engine (Vosk) for job_id={job_id}")
+
+    try:
+        job_registry.update(job_id, 'local_fallback', 'Queued for local transcription...')
+        job_scheduler.submit(run_local_fallback, job_id, audio, original_filename)
+    except (QueueFullError, SchedulerClosedError) as e:
+        print(f"[orchestrator] Dropping local fallback for job_id={job_id}: {e}")
+        drop_upload_job(job_id, audio, str(e))
+
+
+SHUTDOWN_MESSAGE = 'Server shut down before the job finished. Please upload the audio again.'
+
+
+def drop_upload_job(job_id: str, audio, message: str) -> None:
+    """Give up on a job that can't be scheduled: free its audio, fail it and drop its dedup claim."""
+    audio.release()
+    job_registry.fail(job_id, message)
+    settle_upload_dedup(audio, job_id, False)
+
+
+def run_local_fallback(job_id: str, audio, original_filename: str) -> None:
+    """Worker-pool job: transcribe locally with Vosk, map to signs and write the result to S3."""
+    try:
+        job_registry.update(job_id, 'local_fallback', 'Transcribing audio locally...')
+        try:
+            transcription_text = transcribe_with_local_engine(audio.source, audio.content_type)
+        finally:
+            audio.release()
         if not transcription_text:
             print(f"[orchestrator] Local fallback failed or returned empty transcription for job_id={job_id}")
+            job_registry.fail(job_id, 'Local transcription failed or returned no text')
+            settle_upload_dedup(audio, job_id, False)
             return
 
+        job_registry.update(job_id, 'mapping', 'Mapping text to signs...')
         sign_sequence = map_text_to_signs_greedy(transcription_text)
         result = {
             'job_id': job_id,
@@ -256,33 +555,38 @@ def orchestrate_processing(job_id: str, audio_bytes: bytes, content_type: str, o
             'source': 'local_vosk',
             'original_filename': original_filename,
         }
-        processed_key = f"{job_id}_result.json"
-        s3_client.put_object(
-            Bucket=app.config['PROCESSED_BUCKET'],
-            Key=processed_key,
-            Body=json.dumps(result),
-            ContentType='application/json'
-        )
-        print(f"[orchestrator] HF fallback result uploaded to s3://{app.config['PROCESSED_BUCKET']}/{processed_key}")
+        store_processed_result(job_id, result)
+        job_registry.complete(job_id, result)
+        settle_upload_dedup(audio, job_id, True)
+        print(f"[orchestrator] Local fallback result uploaded to s3://{app.config['PROCESSED_BUCKET']}/{job_id}_result.json")
     except Exception as e:
-        print(f"[orchestrator] Exception in fallback orchestrator for job_id={job_id}: {e}")
+        print(f"[orchestrator] Exception in local fallback for job_id={job_id}: {e}")
+        job_registry.fail(job_id, str(e))
+        settle_upload_dedup(audio, job_id, False)
 
 @app.route('/')
 def index():
-    return render_template('index.html')
+    return render_template('index.html', live_enabled=sock is not None)
 
 @app.route('/process_text', methods=['POST'])
 def process_text():
-    """Process text input directly without file upload"""
+    """Process text input directly without file upload
+
+    With `inline` (JSON field or ?inline=1) the result is returned in this response and
+    stored in the background; `persist: false` skips storing it (no job_id is issued).
+    """
     try:
         data = request.get_json()
         text = data.get('text', '').strip()
         
         if not text:
             return jsonify({'success': False, 'message': 'No text provided'})
+
+        inline = bool(data.get('inline')) or (request.args.get('inline') or '').lower() in ('1', 'true', 'yes')
+        persist = data.get('persist', True) is not False
         
         job_id = uuid.uuid4().hex
-        sign_sequence = map_text_to_signs_greedy(text)
+        sign_sequence = translate_text(text)
         
         result = {
             'job_id': job_id,
@@ -290,16 +594,20 @@ def process_text():
             'sign_sequence': sign_sequence,
             'status': 'completed'
         }
+
+        if inline:
+            if not persist:
+                result.pop('job_id')
+                return jsonify({'success': True, 'result': result})
+            # Cached now so /results/<job_id> works on this worker at once; S3 catches up off the request path
+            RESULT_CACHE.put(job_id, json.dumps(result))
+            job_scheduler.call_later(0, persist_text_result, job_id, result)
+            return jsonify({'success': True, 'job_id': job_id, 'result': result})
         
         # Since this is text-based, we can "store" the result directly in a way
         # the frontend can fetch it. For simplicity in the AWS version, we'll
         # upload this small JSON to the processed bucket, just like the Lambda.
-        s3_client.put_object(
-            Bucket=app.config['PROCESSED_BUCKET'],
-            Key=f"{job_id}_result.json",
-            Body=json.dumps(result),
-            ContentType='application/json'
-        )
+        store_processed_result(job_id, result)
         
         return jsonify({
             'success': True,
@@ -312,6 +620,109 @@ def process_text():
             'message': f'Text processing failed: {str(e)}'
         })
 
+# --- Bulk translation: sentences mapped in parallel and streamed back as NDJSON ---
+bulk_pool = ThreadPoolExecutor(max(1, app.config['BULK_TRANSLATE_WORKERS']), thread_name_prefix='bulk-translate')
+BULK_READ_CHUNK = 64 * 1024
+
+def _read_text_chunks(stream):
+    """Decoded text chunks from a request body, read a block at a time."""
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    while True:
+        block = stream.read(BULK_READ_CHUNK)
+        if not block:
+            break
+        yield decoder.decode(block)
+    yield decoder.decode(b'', final=True)
+
+def _ndjson_texts(stream):
+    """(source, text) per line of an NDJSON body; each line is a JSON string or {"text": ...}."""
+    for source, line in enumerate(stream):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            item = json.loads(line)
+            text = item.get('text') if isinstance(item, dict) else item
+        except ValueError:
+            text = None
+        yield source, text if isinstance(text, str) else None
+
+def _bulk_segments(texts, max_chars):
+    """(source, sentence) pairs; a source that is not a string yields one (source, None) marker."""
+    for source, text in texts:
+        if text is None:
+            yield source, None
+            continue
+        for sentence in iter_sentences((text,), max_chars):
+            yield source, sentence
+
+@app.route('/translate/bulk', methods=['POST'])
+def translate_bulk():
+    """Translate many texts, or one very large text, streaming one NDJSON line per sentence
+
+    Accepts JSON {"texts": [...]} (or {"text": ...}), NDJSON with one text per line, or a
+    plain-text body. NDJSON and plain text are read as they arrive, so memory use does
+    not grow with the input.
+    """
+    max_chars = app.config['BULK_SEGMENT_MAX_CHARS']
+    if request.mimetype == 'application/json':
+        data = request.get_json(silent=True)
+        texts = data.get('texts') if isinstance(data, dict) else None
+        if texts is None and isinstance(data, dict) and isinstance(data.get('text'), str):
+            texts = [data['text']]
+        if not isinstance(texts, list) or not texts:
+            return jsonify({'success': False, 'message': 'Provide "texts" (a list of strings) or "text"'}), 400
+        segments = _bulk_segments(
+            ((source, text if isinstance(text, str) else None) for source, text in enumerate(texts)), max_chars)
+    elif request.mimetype == 'application/x-ndjson':
+        segments = _bulk_segments(_ndjson_texts(request.stream), max_chars)
+    else:
+        segments = ((0, sentence) for sentence in iter_sentences(_read_text_chunks(request.stream), max_chars))
+
+    # Enough sentences in flight to keep the pool busy; results go out in input order
+    window = 2 * max(1, app.config['BULK_TRANSLATE_WORKERS'])
+
+    def line(index, source, sentence, future):
+        if sentence is None:
+            return json.dumps({'index': index, 'source': source, 'error': 'Not a text'}) + '\n'
+        try:
+            return json.dumps({'index': index, 'source': source, 'text': sentence,
+                               'sign_sequence': future.result()}) + '\n'
+        except Exception as e:
+            print(f"[bulk] Mapping failed for segment {index}: {e}")
+            return json.dumps({'index': index, 'source': source, 'text': sentence, 'error': str(e)}) + '\n'
+
+    def ready_lines(pending):
+        # The oldest sentence (waiting if needed) plus every one after it that is already mapped,
+        # sent as one chunk so a fast stream isn't one tiny write per sentence
+        lines = [line(*pending.popleft())]
+        while pending and (pending[0][3] is None or pending[0][3].done()):
+            lines.append(line(*pending.popleft()))
+        return ''.join(lines)
+
+    def generate():
+        pending = deque()
+        count = 0
+        for source, sentence in segments:
+            future = bulk_pool.submit(translate_text, sentence) if sentence is not None else None
+            pending.append((count, source, sentence, future))
+            count += 1
+            if len(pending) >= window:
+                yield ready_lines(pending)
+        while pending:
+            yield ready_lines(pending)
+        yield json.dumps({'done': True, 'segments': count}) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson',
+                    headers={'X-Accel-Buffering': 'no'})
+
+def persist_text_result(job_id: str, result: dict) -> None:
+    """Timer callback: write an inline text result to the processed bucket."""
+    try:
+        store_processed_result(job_id, result)
+    except Exception as e:
+        print(f"[process-text] Could not store result for job_id={job_id}: {e}")
+
 @app.route('/upload', methods=['POST'])
 def upload_file():
     if 'audio_file' not in request.files:
@@ -324,65 +735,48 @@ def upload_file():
         return redirect(request.url)
     
     if file and allowed_file(file.filename):
+        if job_scheduler.is_saturated():
+            return jsonify({
+                'success': False,
+                'message': 'Server is busy processing other audio. Please try again shortly.'
+            }), 503
+
         # Generate unique filename
         filename = secure_filename(file.filename)
         unique_filename = f"{uuid.uuid4().hex}_{filename}"
         
         try:
-            # Read bytes once so we can both upload to S3 and keep for potential fallback
-            file.seek(0)
-            audio_bytes = file.read()
+            # The parser already wrote the upload into the spool; keep it there for a potential fallback
             content_type = file.content_type or 'application/octet-stream'
+            audio = UPLOAD_SPOOL.adopt(file.stream, content_type, filename)
 
-            # Upload to S3 (use BytesIO since we already consumed the stream)
-            s3_client.upload_fileobj(
-                io.BytesIO(audio_bytes),
-                app.config['UPLOAD_BUCKET'],
-                unique_filename,
-                ExtraArgs={'ContentType': content_type}
-            )
+            # Identical audio: reuse the finished job's result, or share the job still processing it
+            outcome, job_id = claim_upload(audio, unique_filename.split('.')[0])
+            if outcome == NEW:
+                start_upload_job(audio, unique_filename, job_id, filename)
 
-            # Start background watcher to fallback if AWS doesn't produce a result in time
-            job_id = unique_filename.split('.')[0]
-            thread = threading.Thread(
-                target=orchestrate_processing,
-                args=(job_id, audio_bytes, content_type, filename),
-                daemon=True,
-            )
-            thread.start()
+            if outcome == COMPLETED:
+                return jsonify({
+                    'success': True,
+                    'job_id': job_id,
+                    'ready': True,
+                    'redirect_url': url_for('show_results', job_id=job_id)
+                })
 
             # Optionally wait synchronously until result is available, then return redirect info
             wait_param = (request.args.get('wait') or '').lower() in ('1', 'true', 'yes')
             if wait_param:
                 # Wait long enough for AWS to respond and, if needed, for local fallback to overwrite
                 max_wait = (app.config.get('AWS_RESULT_WAIT_SECS') or 60) + 120
-                waited = 0
-                interval = 2
-                # Update progress message on server logs while we wait
-                while waited < max_wait:
-                    if processed_result_exists(job_id):
-                        # Inspect the file to ensure it is not an AWS error; if error, keep waiting for Vosk overwrite
-                        processed_key = f"{job_id}_result.json"
-                        try:
-                            obj = s3_client.get_object(Bucket=app.config['PROCESSED_BUCKET'], Key=processed_key)
-                            payload = obj['Body'].read().decode('utf-8')
-                            current = json.loads(payload)
-                            status_val = (current or {}).get('status')
-                            # If status is not 'error', we can redirect now (covers AWS success or local_vosk success)
-                            if status_val and status_val.lower() != 'error':
-                                return jsonify({
-                                    'success': True,
-                                    'job_id': job_id,
-                                    'ready': True,
-                                    'redirect_url': url_for('show_results', job_id=job_id)
-                                })
-                            # Else keep waiting for local overwrite
-                        except Exception:
-                            # If we fail to read/parse, keep waiting
-                            pass
-                    time.sleep(interval)
-                    waited += interval
-                # Timed out waiting; fall back to client-side polling
+                result = wait_for_result(job_id, max_wait)
+                if result is not None and not is_error_result(result):
+                    return jsonify({
+                        'success': True,
+                        'job_id': job_id,
+                        'ready': True,
+                        'redirect_url': url_for('show_results', job_id=job_id)
+                    })
+                # Timed out (or local fallback failed); fall back to client-side polling
                 return jsonify({
                     'success': True,
                     'job_id': job_id,
@@ -408,33 +802,231 @@ def upload_file():
         'message': 'Invalid file type. Please upload audio files only.'
     })
 
+# --- Batch upload: many recordings (or archives of them) as one batch of upload jobs ---
+BATCH_REGISTRY = BatchRegistry()
+# S3 uploads of accepted batch items; transcription then goes through job_scheduler like any upload
+batch_pool = ThreadPoolExecutor(max(1, app.config['BATCH_UPLOAD_WORKERS']), thread_name_prefix='batch-upload')
+ARCHIVE_EXTENSIONS = ('.zip', '.tar', '.tar.gz', '.tgz')
+
+
+def is_archive(filename: str) -> bool:
+    return filename.lower().endswith(ARCHIVE_EXTENSIONS)
+
+
+def iter_archive_members(audio):
+    """(name, file object, size) for every regular file in a spooled zip or tar upload."""
+    with audio.open() as f:
+        if audio.filename.lower().endswith('.zip'):
+            with zipfile.ZipFile(f) as archive:
+                for info in archive.infolist():
+                    if not info.is_dir():
+                        with archive.open(info) as member:
+                            yield info.filename, member, info.file_size
+        else:
+            with tarfile.open(fileobj=f, mode='r:*') as archive:
+                for info in archive:
+                    if info.isfile():
+                        yield info.name, archive.extractfile(info), info.size
+
+
+def spool_archive_member(member, size: int, filename: str):
+    """Copy one archive member into the upload spool (hashed on the way in, like a direct upload)."""
+    stream = UPLOAD_SPOOL.create_stream(size)
+    try:
+        shutil.copyfileobj(member, stream, BULK_READ_CHUNK)
+    except Exception:
+        UPLOAD_SPOOL.discard(stream)
+        raise
+    content_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    return UPLOAD_SPOOL.adopt(stream, content_type, filename)
+
+
+def save_batch_manifest(batch_id: str, items: list) -> None:
+    """Write the batch's items to the processed bucket so any worker can report its progress."""
+    try:
+        get_s3_client().put_object(
+            Bucket=app.config['PROCESSED_BUCKET'],
+            Key=f"batches/{batch_id}.json",
+            Body=json.dumps({'batch_id': batch_id, 'items': items}),
+            ContentType='application/json'
+        )
+    except Exception as e:
+        print(f"[batch] Could not store manifest for batch_id={batch_id}: {e}")
+
+
+def load_batch_manifest(batch_id: str):
+    try:
+        obj = get_s3_client().get_object(Bucket=app.config['PROCESSED_BUCKET'], Key=f"batches/{batch_id}.json")
+        items = json.loads(obj['Body'].read().decode('utf-8'))['items']
+    except Exception:
+        return None
+    BATCH_REGISTRY.add(batch_id, items)
+    return items
+
+
+def run_batch_item(audio, key: str, job_id: str, original_filename: str) -> None:
+    """Batch pool job: upload one accepted item to S3 and hand it to the orchestrator."""
+    try:
+        start_upload_job(audio, key, job_id, original_filename)
+    except Exception as e:
+        print(f"[batch] Upload failed for job_id={job_id}: {e}")
+        job_registry.fail(job_id, f'Upload failed: {e}')
+
+
+@app.route('/upload/batch', methods=['POST'])
+def upload_batch():
+    """Accept many recordings at once (audio files and/or zip/tar archives of them)
+
+    Returns a batch id and one job id per recording; progress is at /batch/<batch_id>.
+    """
+    files = [f for f in request.files.getlist('audio_files') + request.files.getlist('audio_file') if f.filename]
+    if not files:
+        return jsonify({'success': False, 'message': 'No files selected'}), 400
+    if job_scheduler.is_saturated():
+        return jsonify({
+            'success': False,
+            'message': 'Server is busy processing other audio. Please try again shortly.'
+        }), 503
+
+    # Every recording may need a local fallback slot, so a batch never holds more than the queue can take
+    max_items = min(app.config['BATCH_MAX_ITEMS'], job_scheduler.max_queue)
+    max_file_bytes = app.config['MAX_CONTENT_LENGTH']
+    items = []
+    accepted = []
+
+    def add(audio, filename):
+        unique_filename = f"{uuid.uuid4().hex}_{secure_filename(filename)}"
+        outcome, job_id = claim_upload(audio, unique_filename.split('.')[0])
+        items.append({'job_id': job_id, 'filename': filename})
+        if outcome == NEW:
+            job_registry.register(job_id, 'queued', 'Waiting to upload...')
+            accepted.append((audio, unique_filename, job_id, secure_filename(filename)))
+
+    def reject(filename, message):
+        items.append({'filename': filename, 'error': message})
+
+    for file in files:
+        content_type = file.content_type or 'application/octet-stream'
+        audio = UPLOAD_SPOOL.adopt(file.stream, content_type, file.filename)
+        if is_archive(file.filename):
+            try:
+                for name, member, size in iter_archive_members(audio):
+                    filename = os.path.basename(name)
+                    if not allowed_file(filename):
+                        continue  # archives carry all sorts of extras (__MACOSX, notes, ...)
+                    if len(items) >= max_items:
+                        reject(filename, f'Batch is limited to {max_items} recordings')
+                    elif size > max_file_bytes:
+                        reject(filename, 'File is too large')
+                    else:
+                        try:
+                            add(spool_archive_member(member, size, filename), filename)
+                        except SpoolFullError as e:
+                            reject(filename, str(e))
+            except (zipfile.BadZipFile, tarfile.TarError, OSError, EOFError) as e:
+                print(f"[batch] Could not read archive {file.filename}: {e}")
+                reject(file.filename, 'Could not read archive')
+            finally:
+                audio.release()
+        elif not allowed_file(file.filename):
+            audio.release()
+            reject(file.filename, 'Invalid file type. Please upload audio files only.')
+        elif len(items) >= max_items:
+            audio.release()
+            reject(file.filename, f'Batch is limited to {max_items} recordings')
+        elif audio.size > max_file_bytes:
+            audio.release()
+            reject(file.filename, 'File is too large')
+        else:
+            add(audio, file.filename)
+
+    batch_id = BATCH_REGISTRY.create(items)
+    save_batch_manifest(batch_id, items)
+    for args in accepted:
+        batch_pool.submit(run_batch_item, *args)
+    print(f"[batch] batch_id={batch_id}: {len(items)} item(s), {len(accepted)} new upload(s)")
+
+    return jsonify({
+        'success': True,
+        'batch_id': batch_id,
+        'items': items,
+        'status_url': url_for('batch_status', batch_id=batch_id),
+    })
+
+
+def batch_item_state(item: dict) -> dict:
+    """One batch item with its current state: rejected, failed, completed or the job's stage."""
+    if 'error' in item:
+        return dict(item, state='rejected')
+    job_id = item['job_id']
+    snapshot = job_registry.snapshot(job_id)
+    if snapshot is not None and not snapshot['finished']:
+        return dict(item, state=snapshot['stage'], message=snapshot['message'])
+    # Finished here, or handled by another worker / before a restart: the stored result decides
+    result = snapshot['result'] if snapshot is not None else fetch_processed_result(job_id)
+    if result is None or (is_error_result(result) and snapshot is None):
+        # An AWS error result may still be replaced by the local fallback
+        return dict(item, state='processing')
+    if is_error_result(result):
+        return dict(item, state='failed', message=result.get('error_message'))
+    return dict(item, state='completed', redirect_url=url_for('show_results', job_id=job_id))
+
+
+@app.route('/batch/<batch_id>')
+def batch_status(batch_id):
+    """Aggregate progress of a batch upload plus the state of each item"""
+    items = BATCH_REGISTRY.get(batch_id) or load_batch_manifest(batch_id)
+    if items is None:
+        return jsonify({'status': 'error', 'message': 'Unknown batch'}), 404
+    states = [batch_item_state(item) for item in items]
+    counts = {'completed': 0, 'failed': 0, 'rejected': 0}
+    for item in states:
+        if item['state'] in counts:
+            counts[item['state']] += 1
+    finished = sum(counts.values())
+    return jsonify({
+        'batch_id': batch_id,
+        'status': 'completed' if finished == len(states) else 'processing',
+        'total': len(states),
+        **counts,
+        'pending': len(states) - finished,
+        'progress': round(finished / len(states), 3) if states else 1.0,
+        'items': states,
+    })
+
 @app.route('/status/<job_id>')
 def check_status(job_id):
     try:
+        # Completed results never change: serve cached ones as-is, without S3 or re-parsing
+        cached = RESULT_CACHE.get(job_id)
+        if cached is not None:
+            return Response(b'{"status":"completed","result":' + cached + b'}', mimetype='application/json')
+
         # Check if processed file exists
         processed_key = f"{job_id}_result.json"
         
         try:
-            response = s3_client.get_object(
+            response = get_s3_client().get_object(
                 Bucket=app.config['PROCESSED_BUCKET'],
                 Key=processed_key
             )
             
             # File exists, processing is complete
-            import json
-            result = json.loads(response['Body'].read().decode('utf-8'))
+            body = response['Body'].read()
+            result = json.loads(body.decode('utf-8'))
             # If AWS wrote an error result, signal 'processing' so client continues waiting for local overwrite
             if isinstance(result, dict) and result.get('status') and str(result.get('status')).lower() == 'error':
                 return jsonify({
                     'status': 'processing',
                     'message': 'AWS processing error detected. Retrying locally...'
                 })
+            RESULT_CACHE.put(job_id, body)
             return jsonify({
                 'status': 'completed',
                 'result': result
             })
         
-        except s3_client.exceptions.NoSuchKey:
+        except get_s3_client().exceptions.NoSuchKey:
             # File doesn't exist yet, still processing
             return jsonify({
                 'status': 'processing',
@@ -447,10 +1039,199 @@ def check_status(job_id):
             'message': f'Error checking status: {str(e)}'
         })
 
+STATUS_STREAM_HEARTBEAT_SECS = 15
+# Every open stream holds a server thread for minutes; past this many, clients poll /status instead
+STATUS_STREAM_SLOTS = threading.BoundedSemaphore(max(1, app.config['STATUS_STREAM_MAX_CLIENTS']))
+
+
+def _sse(event: str, payload: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+
+@app.route('/status/<job_id>/stream')
+def stream_status(job_id):
+    """Server-Sent Events feed of job progress, ending with a 'completed' or 'failed' event"""
+    max_wait = (app.config.get('AWS_RESULT_WAIT_SECS') or 60) + 120
+
+    def events():
+        # Taken here rather than in the view: a generator that never starts never runs its finally
+        if not STATUS_STREAM_SLOTS.acquire(blocking=False):
+            yield _sse('timeout', {'status': 'processing', 'message': 'Still processing...'})
+            return
+        try:
+            yield from watch()
+        finally:
+            STATUS_STREAM_SLOTS.release()
+
+    def watch():
+        deadline = time.monotonic() + max_wait
+        if job_registry.is_tracked(job_id):
+            # Started by this process: push every stage change as it is published
+            version = 0
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                snapshot = job_registry.watch(job_id, version, min(STATUS_STREAM_HEARTBEAT_SECS, remaining))
+                if snapshot is None:
+                    break
+                if snapshot['version'] == version:
+                    yield ': keep-alive\n\n'
+                    continue
+                version = snapshot['version']
+                if snapshot['finished']:
+                    result = snapshot['result']
+                    if is_error_result(result):
+                        yield _sse('failed', {'status': 'error', 'message': result.get('error_message')})
+                    else:
+                        yield _sse('completed', {'status': 'completed', 'result': result})
+                    return
+                yield _sse('progress', {
+                    'status': 'processing',
+                    'stage': snapshot['stage'],
+                    'message': snapshot['message'],
+                })
+        else:
+            # Not started here (Lambda-only job or another worker): watch S3 with backoff
+            yield _sse('progress', {
+                'status': 'processing',
+                'stage': 'waiting_aws',
+                'message': 'Your audio is being processed...',
+            })
+            delay = S3_POLL_INITIAL_SECS
+            reported_error = False
+            while True:
+                result = fetch_processed_result(job_id)
+                if result is not None and not is_error_result(result):
+                    yield _sse('completed', {'status': 'completed', 'result': result})
+                    return
+                if result is not None and not reported_error:
+                    reported_error = True
+                    yield _sse('progress', {
+                        'status': 'processing',
+                        'stage': 'aws_error',
+                        'message': 'AWS processing error detected. Retrying locally...',
+                    })
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                time.sleep(min(delay, remaining))
+                delay = min(delay * 2, S3_POLL_MAX_SECS)
+        # Let the client fall back to polling /status
+        yield _sse('timeout', {'status': 'processing', 'message': 'Still processing...'})
+
+    return Response(
+        stream_with_context(events()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
 @app.route('/results/<job_id>')
 def show_results(job_id):
     return render_template('results.html', job_id=job_id)
 
+# --- Live transcription over a WebSocket (needs flask-sock) ---
+sock = Sock(app) if Sock is not None else None
+live_slots = threading.BoundedSemaphore(max(1, app.config['LIVE_MAX_SESSIONS']))
+
+def save_live_result(text: str, sign_sequence):
+    """Store a finished live session like a text job so the results page can show it. Returns the job id or None."""
+    job_id = uuid.uuid4().hex
+    result = {
+        'job_id': job_id,
+        'transcribed_text': text,
+        'sign_sequence': sign_sequence,
+        'status': 'completed',
+        'source': 'live_vosk',
+    }
+    try:
+        store_processed_result(job_id, result)
+    except Exception as e:
+        print(f"[live] Could not store result for job_id={job_id}: {e}")
+        return None
+    return job_id
+
+def live_transcription(ws):
+    """Binary messages are MediaRecorder chunks; a text message {"type": "stop"} ends the recording.
+
+    Sends partial/final transcripts back as JSON, then one {"type": "done"} message with the
+    whole transcript and the results page URL. Finals carry the signs that became certain with
+    them; words that may still start a longer phrase follow with a later final or with "done".
+    """
+    if not live_slots.acquire(blocking=False):
+        ws.send(json.dumps({'type': 'error', 'message': 'Too many live sessions. Please try again shortly.'}))
+        return
+    session = LiveTranscriber(vosk_registry).start()
+    mapper = StreamingSignMapper()
+    try:
+        deadline = time.monotonic() + app.config['LIVE_MAX_SECS']
+        stopping = False
+        transcript = []
+        ended = False
+        while not ended:
+            for event in session.poll(timeout=0 if not stopping else 0.2):
+                if event['type'] == 'end':
+                    ended = True
+                    continue
+                if event['type'] == 'final':
+                    transcript.append(event['text'])
+                    event['signs'] = mapper.feed(event['text'])
+                ws.send(json.dumps(event))
+            if stopping or ended:
+                continue
+            message = ws.receive(timeout=0.05)
+            if isinstance(message, (bytes, bytearray)):
+                session.push(message)
+            elif message is not None:
+                try:
+                    stopping = json.loads(message).get('type') == 'stop'
+                except (ValueError, AttributeError):
+                    pass
+            if time.monotonic() > deadline:
+                print("[live] Session reached LIVE_MAX_SECS; stopping")
+                stopping = True
+            if stopping:
+                session.finish()
+
+        text = ' '.join(transcript)
+        signs = mapper.finish()
+        job_id = save_live_result(text, mapper.sign_sequence) if text else None
+        ws.send(json.dumps({
+            'type': 'done',
+            'text': text,
+            'signs': signs,
+            'job_id': job_id,
+            'redirect_url': url_for('show_results', job_id=job_id) if job_id else None,
+        }))
+    except Exception as e:
+        # Most often the browser went away mid-session
+        print(f"[live] Session ended: {e}")
+    finally:
+        session.close()
+        live_slots.release()
+
+if sock is not None:
+    sock.route('/ws/live')(live_transcription)
+else:
+    print("[live] flask-sock is not installed; live transcription is disabled")
+
+@app.route('/metrics')
+def metrics():
+    """Runtime counters for the fallback engine, job scheduler and lookup cache"""
+    return jsonify({
+        'vosk': vosk_registry.stats(),
+        'vosk_parallel': vosk_transcriber.stats(),
+        'scheduler': job_scheduler.stats(),
+        'jobs': job_registry.stats(),
+        'signbsl_cache': SIGNBSL_CACHE.stats(),
+        'signbsl_http': http_client.stats(),
+        'upload_spool': UPLOAD_SPOOL.stats(),
+        'result_cache': RESULT_CACHE.stats(),
+        'text_memo': TEXT_MEMO.stats(),
+        'batches': BATCH_REGISTRY.stats(),
+        'upload_dedup': UPLOAD_DEDUP.stats() if UPLOAD_DEDUP is not None else None,
+    })
+
 if __name__ == '__main__':
     port = int(os.getenv('PORT', '5000'))
     app.run(debug=True, host='0.0.0.0', port=port)
@@ -0,0 +1,55 @@
+"""
+Registry of batch uploads.
+
+A batch is a list of items, one per recording received in a single
+/upload/batch request (directly or inside an archive). Each accepted item is an
+ordinary upload job; the batch only remembers which job ids belong together,
+so aggregate progress can be computed from the jobs themselves. Items that
+were rejected at intake (wrong type, too large, spool full) keep their error.
+
+Batches are held in memory for `ttl_secs`; the app also writes each manifest
+to S3 so workers that did not receive the batch can report on it.
+"""
+
+import threading
+import time
+import uuid
+
+
+class BatchRegistry:
+    """batch_id -> list of {'job_id', 'filename'} or {'filename', 'error'} items."""
+
+    def __init__(self, ttl_secs: float = 3600):
+        self.ttl_secs = ttl_secs
+        self._lock = threading.Lock()
+        self._batches = {}  # batch_id -> (created, items)
+
+    def create(self, items: list) -> str:
+        batch_id = uuid.uuid4().hex
+        self.add(batch_id, items)
+        return batch_id
+
+    def add(self, batch_id: str, items: list) -> None:
+        """Remember `items` under `batch_id` (e.g. a manifest loaded from S3)."""
+        with self._lock:
+            self._prune()
+            self._batches[batch_id] = (time.monotonic(), list(items))
+
+    def get(self, batch_id: str):
+        """The batch's items, or None if this process doesn't know the batch."""
+        with self._lock:
+            entry = self._batches.get(batch_id)
+        return entry[1] if entry is not None else None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'batches': len(self._batches),
+                'items': sum(len(items) for _, items in self._batches.values()),
+            }
+
+    def _prune(self):
+        cutoff = time.monotonic() - self.ttl_secs
+        stale = [batch_id for batch_id, (created, _) in self._batches.items() if created < cutoff]
+        for batch_id in stale:
+            del self._batches[batch_id]
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Benchmark: streaming SignPageParser vs the old BeautifulSoup extraction.
+
+For every page in the corpus it runs the previous BeautifulSoup code (the
+app.py rules, and the local_demo.py rules with iframe/link fallbacks) and
+signbsl_lookup.extract_video_url fed in 8 KiB chunks, checks that both return
+the same URL and reports CPU time, peak Python memory (tracemalloc) and how
+much of each page the streaming parser had to read.
+
+The corpus is a directory of saved SignBSL pages (<word>.html). Fill it with
+--save, which fetches the given words once through the shared HTTP client:
+
+    python benchmarks/bench_html_extractor.py --save hello,thank-you,water,please
+    python benchmarks/bench_html_extractor.py [--corpus DIR] [--repeat 20]
+
+With no saved pages it falls back to synthetic pages shaped like SignBSL's
+(navigation, scripts, player, long related-signs list), which is enough to
+compare the two approaches but is not a substitute for the real corpus.
+"""
+
+import argparse
+import glob
+import os
+import random
+import sys
+import time
+import tracemalloc
+from urllib.parse import urljoin
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from signbsl_lookup import STREAM_CHUNK_BYTES, extract_video_url  # noqa: E402
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'corpus', 'signbsl')
+
+
+# --- The extraction code this replaces ---
+def soup_extract_app(html, base_url):
+    soup = BeautifulSoup(html, 'html.parser')
+    video_tag = soup.find('video')
+    if video_tag:
+        source = video_tag.find('source')
+        try:
+            return urljoin(base_url, source['src'] if source else video_tag['src'])
+        except KeyError:
+            # Used to surface as a lookup error; the streaming parser falls back to the
+            # <video src> here instead (the demo rule), so such pages can differ
+            return None
+    return None
+
+
+def soup_extract_demo(html, base_url):
+    soup = BeautifulSoup(html, 'html.parser')
+    video_url = None
+    video_tag = soup.find('video')
+    if video_tag:
+        source = video_tag.find('source')
+        if source and source.get('src'):
+            video_url = urljoin(base_url, source.get('src'))
+        elif video_tag.get('src'):
+            video_url = urljoin(base_url, video_tag.get('src'))
+    if not video_url:
+        iframe = soup.find('iframe')
+        if iframe and iframe.get('src'):
+            iframe_src = iframe.get('src')
+            if any(domain in iframe_src for domain in ['youtube.com', 'vimeo.com', 'player.vimeo.com']):
+                video_url = iframe_src
+    if not video_url:
+        for element in soup.find_all(['a', 'source', 'embed']):
+            href_or_src = element.get('href') or element.get('src')
+            if href_or_src and any(ext in href_or_src.lower() for ext in ['.mp4', '.webm', '.ogv', 'video']):
+                video_url = urljoin(base_url, href_or_src)
+                break
+    return video_url
+
+
+def stream_extract(html, base_url, embeds):
+    chunks = (html[i:i + STREAM_CHUNK_BYTES] for i in range(0, len(html), STREAM_CHUNK_BYTES))
+    return extract_video_url(chunks, base_url, embeds=embeds)
+
+
+# --- Corpus ---
+def save_pages(words, corpus):
+    import http_client
+    os.makedirs(corpus, exist_ok=True)
+    for word in words:
+        url = f"https://www.signbsl.com/sign/{word}"
+        response = http_client.get(url)
+        print(f"  {url} -> {response.status_code} ({len(response.content)} bytes)")
+        if response.status_code == 200:
+            with open(os.path.join(corpus, f"{word}.html"), 'wb') as f:
+                f.write(response.content)
+
+
+def synthetic_pages(count=40, seed=7):
+    rng = random.Random(seed)
+    words = ['hello', 'water', 'family', 'friend', 'morning', 'thank-you', 'please', 'sorry', 'help', 'home']
+    pages = []
+    for n in range(count):
+        word = rng.choice(words) + (str(n) if n >= len(words) else '')
+        head = ['<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"><title>%s - British Sign Language</title>' % word]
+        head += ['<link rel="stylesheet" href="/css/site%d.css">' % i for i in range(6)]
+        head.append('<script>window.dataLayer=[];function gtag(){dataLayer.push(arguments)}; var t="<video src=fake.mp4>";</script>')
+        head.append('</head><body><nav><ul>')
+        head += ['<li><a href="/dictionary/%s">%s</a></li>' % (c, c.upper()) for c in 'abcdefghijklmnopqrstuvwxyz']
+        head.append('</ul></nav><main><h1>%s</h1><p>Meaning: %s &amp; related signs.</p>' % (word, 'lorem ipsum ' * 30))
+        kind = n % 6
+        if kind in (0, 1, 2):
+            player = ('<div class="player"><video id="v" controls preload="none" poster="/img/%s.jpg"%s>'
+                      '<source src="%s" type="video/mp4"><track kind="captions"></video></div>') % (
+                word, ' src="/media/%s-alt.mp4"' % word if kind == 1 else '',
+                'https://media.signbsl.com/videos/bsl/signstation/%s.mp4' % word)
+        elif kind == 3:
+            player = '<div class="player"><video controls src="/media/%s.webm"></video></div>' % word
+        elif kind == 4:
+            player = '<iframe src="https://www.youtube.com/embed/%s" allowfullscreen></iframe>' % word
+        else:
+            player = '<p>No video for this sign yet.</p>'
+        related = ['<ul class="related">']
+        related += ['<li><a href="/sign/%s-%d">%s %d</a> <a href="/video/%s-%d.mp4">clip</a></li>' % (word, i, word, i, word, i)
+                    for i in range(rng.randint(150, 400))]
+        related.append('</ul>')
+        foot = '</main><footer>' + '<p>footer text</p>' * 50 + '<script src="/js/app.js"></script></footer></body></html>'
+        pages.append((word, ''.join(head) + player + ''.join(related) + foot))
+    return [(word, html.encode('utf-8')) for word, html in pages]
+
+
+def load_corpus(corpus):
+    paths = sorted(glob.glob(os.path.join(corpus, '*.html')))
+    pages = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            pages.append((os.path.splitext(os.path.basename(path))[0], f.read()))
+    return pages
+
+
+# --- Measurement ---
+def measure(fn, pages, repeat):
+    started = time.process_time()
+    for _ in range(repeat):
+        for word, html in pages:
+            fn(html, f"https://www.signbsl.com/sign/{word}")
+    cpu = (time.process_time() - started) / (repeat * len(pages))
+
+    tracemalloc.start()
+    peak = 0
+    for word, html in pages:
+        tracemalloc.reset_peak()
+        fn(html, f"https://www.signbsl.com/sign/{word}")
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+    tracemalloc.stop()
+    return cpu, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--corpus', default=DEFAULT_CORPUS)
+    parser.add_argument('--save', help='comma-separated words to fetch into the corpus first')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    if args.save:
+        save_pages([w.strip() for w in args.save.split(',') if w.strip()], args.corpus)
+
+    pages = load_corpus(args.corpus)
+    source = f"{len(pages)} saved pages from {args.corpus}"
+    if not pages:
+        pages = synthetic_pages()
+        source = f"{len(pages)} synthetic pages (no saved corpus in {args.corpus})"
+    total_bytes = sum(len(html) for _, html in pages)
+    print(f"Corpus: {source}, {total_bytes / len(pages) / 1024:.1f} KiB/page on average\n")
+
+    for label, soup_fn, embeds in (('app rules', soup_extract_app, False), ('demo rules (+iframe/link fallbacks)', soup_extract_demo, True)):
+        parsed = 0
+        for word, html in pages:
+            base = f"https://www.signbsl.com/sign/{word}"
+            expected = soup_fn(html, base)
+            got, read = stream_extract(html, base, embeds)
+            parsed += read
+            assert got == expected, f"{word}: streaming {got!r} != BeautifulSoup {expected!r}"
+
+        soup_cpu, soup_peak = measure(soup_fn, pages, args.repeat)
+        stream_cpu, stream_peak = measure(lambda h, b: stream_extract(h, b, embeds), pages, args.repeat)
+        print(f"{label}: identical URLs on all {len(pages)} pages")
+        print(f"  BeautifulSoup : {soup_cpu * 1000:8.2f} ms CPU/page   peak {soup_peak / 1024:8.1f} KiB")
+        print(f"  streaming     : {stream_cpu * 1000:8.2f} ms CPU/page   peak {stream_peak / 1024:8.1f} KiB   "
+              f"({parsed / total_bytes:.0%} of bytes parsed)")
+        print(f"  speedup {soup_cpu / stream_cpu:.1f}x, memory {soup_peak / max(stream_peak, 1):.1f}x lower\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-lookup latency with and without the pooled keep-alive client.
+
+Starts a local stand-in for www.signbsl.com (HTTP/1.1 with keep-alive) that
+serves a small sign page, then times N lookups made with a fresh
+requests.get() per call (the old behaviour) against N lookups through
+http_client's shared pool, both sequentially and from a thread pool.
+
+Usage:
+    python benchmarks/bench_http_pool.py [--lookups 500] [--workers 8]
+
+Localhost has no TLS and ~0 RTT, so the numbers here are a lower bound on the
+saving against the real site, where every new connection also pays a TLS
+handshake.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests  # noqa: E402
+import http_client  # noqa: E402
+
+PAGE = (
+    b'<!DOCTYPE html><html><head><title>Sign</title></head><body>'
+    + b'<p>filler</p>' * 400
+    + b'<video controls><source src="/media/hello.mp4" type="video/mp4"></video>'
+    b'</body></html>'
+)
+
+
+class SignPageHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; without this, Nagle + delayed ACK adds ~40ms per reused connection
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(PAGE)))
+        self.end_headers()
+        self.wfile.write(PAGE)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SignPageHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def unpooled_lookup(url):
+    started = time.perf_counter()
+    response = requests.get(url, headers=http_client.DEFAULT_HEADERS, timeout=10)
+    response.content
+    return time.perf_counter() - started
+
+
+def pooled_lookup(url):
+    started = time.perf_counter()
+    response = http_client.get(url)
+    response.content
+    return time.perf_counter() - started
+
+
+def run(label, lookup, urls, workers):
+    started = time.perf_counter()
+    if workers == 1:
+        timings = [lookup(u) for u in urls]
+    else:
+        with ThreadPoolExecutor(workers) as pool:
+            timings = list(pool.map(lookup, urls))
+    wall = time.perf_counter() - started
+    timings.sort()
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"{label:<28} mean={statistics.mean(timings) * 1000:7.3f}ms  "
+          f"p50={statistics.median(timings) * 1000:7.3f}ms  p95={p95 * 1000:7.3f}ms  "
+          f"total={wall:6.2f}s")
+    return statistics.mean(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--lookups', type=int, default=500)
+    parser.add_argument('--workers', type=int, default=8)
+    args = parser.parse_args()
+
+    server = start_server()
+    base = f"http://127.0.0.1:{server.server_address[1]}/sign/"
+    urls = [f"{base}word-{i}" for i in range(args.lookups)]
+    http_client.configure(pool_size=args.workers)
+
+    print(f"{args.lookups} lookups against local stand-in server ({len(PAGE)} byte page)\n")
+    for workers in (1, args.workers):
+        suffix = 'sequential' if workers == 1 else f'{workers} threads'
+        plain = run(f"requests.get ({suffix})", unpooled_lookup, urls, workers)
+        pooled = run(f"pooled client ({suffix})", pooled_lookup, urls, workers)
+        print(f"{'speedup':<28} {plain / pooled:.2f}x per lookup\n")
+
+    for host, counts in http_client.stats()['hosts'].items():
+        print(f"pooled client: {counts['requests']} requests over {counts['connections']} connection(s) to {host}")
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark: greedy phrase matching with the token trie vs the old lexicon scan.
+
+Builds synthetic lexicons of increasing size (single words plus 2-5 word
+phrases drawn from the same vocabulary), segments the same transcript with
+the original O(words x lexicon) scan and with phrase_trie.segment_words,
+checks that both produce identical segmentations and reports the timings.
+
+Usage:
+    python benchmarks/bench_phrase_matcher.py [--sizes 100,1000,10000,50000] [--words 300]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from phrase_trie import PhraseTrie, clean_word, segment_words  # noqa: E402
+
+
+def scan_segment(words, sorted_keys):
+    """The original matcher from lambda_function.map_text_to_signs / local_demo.map_text_to_signs_greedy."""
+    segments = []
+    i = 0
+    while i < len(words):
+        matched = False
+        for phrase_key in sorted_keys:
+            phrase_words = phrase_key.split()
+            phrase_length = len(phrase_words)
+            if i + phrase_length <= len(words):
+                text_slice = words[i:i + phrase_length]
+                if text_slice == phrase_words:
+                    segments.append((phrase_key, text_slice, True))
+                    i += phrase_length
+                    matched = True
+                    break
+        if not matched:
+            segments.append((clean_word(words[i]), [words[i]], False))
+            i += 1
+    return segments
+
+
+def build_lexicon(size, rng):
+    vocabulary = [f"w{n}" for n in range(max(50, size // 2))]
+    lexicon = dict.fromkeys(vocabulary[:size // 2])
+    while len(lexicon) < size:
+        length = rng.randint(2, 5)
+        lexicon[' '.join(rng.choice(vocabulary[:200]) for _ in range(length))] = None
+    return list(lexicon), vocabulary
+
+
+def best_of(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--sizes', default='100,1000,10000,50000')
+    parser.add_argument('--words', type=int, default=300)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    print(f"{'lexicon':>8} {'build':>10} {'scan':>12} {'trie':>10} {'speedup':>9}")
+    for size in (int(s) for s in args.sizes.split(',')):
+        keys, vocabulary = build_lexicon(size, rng)
+        words = [rng.choice(vocabulary[:200]) for _ in range(args.words)]
+
+        build_secs, trie = best_of(lambda: PhraseTrie(keys), 1)
+        sorted_keys = sorted(keys, key=lambda x: len(x.split()), reverse=True)
+        scan_secs, expected = best_of(lambda: scan_segment(words, sorted_keys), args.repeat)
+        trie_secs, actual = best_of(lambda: segment_words(words, trie), args.repeat)
+        assert actual == expected, f"segmentation mismatch at lexicon size {size}"
+
+        print(f"{size:>8} {build_secs * 1000:>8.1f}ms {scan_secs * 1000:>10.1f}ms "
+              f"{trie_secs * 1000:>8.3f}ms {scan_secs / trie_secs:>8.0f}x")
+    print(f"\n{args.words}-word transcript; scan and trie segmentations identical at every size")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cold-start cost of each entry point.
+
+Every sample runs in a fresh interpreter and measures two things: how long
+importing the entry point takes, and how long its first request takes,
+including anything created lazily on first use.
+
+  app      `import app`, then GET / through the Flask test client
+  api      import api/index.py (the Vercel handler), then GET / through it over a local socket
+  lambda   import lambda_function, then one transcript-stage invocation; the boto3
+           S3 client is really created but its calls are answered by botocore's Stubber
+
+No network or AWS account is needed (dummy credentials, no Vosk preload).
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 5] [--entry app,api,lambda] [--json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENTRY_POINTS = ('app', 'api', 'lambda')
+
+
+# --- Child side: one cold start, printed as JSON ---
+def _child_app():
+    started = time.perf_counter()
+    import app
+    imported = time.perf_counter()
+    with app.app.test_client() as client:
+        status = client.get('/').status_code
+    return started, imported, time.perf_counter(), status
+
+
+def _child_api():
+    import importlib.util
+    import threading
+    import urllib.request
+    from http.server import HTTPServer
+
+    started = time.perf_counter()
+    spec = importlib.util.spec_from_file_location('api_index', os.path.join(ROOT, 'api', 'index.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    imported = time.perf_counter()
+
+    server = HTTPServer(('127.0.0.1', 0), module.handler)
+    threading.Thread(target=server.handle_request, daemon=True).start()
+    request_started = time.perf_counter()
+    with urllib.request.urlopen(f"http://127.0.0.1:{server.server_port}/") as response:
+        response.read()
+        status = response.status
+    finished = time.perf_counter()
+    server.server_close()
+    # The local socket round trip is not part of the entry point's cost
+    return started, imported, imported + (finished - request_started), status
+
+
+def _child_lambda():
+    sys.path.insert(0, os.path.join(ROOT, 'lambda_function'))
+    started = time.perf_counter()
+    import lambda_function
+    imported = time.perf_counter()
+
+    original_get_s3_client = lambda_function.get_s3_client
+
+    def stubbed_s3_client():
+        if lambda_function.s3_client is None:
+            from botocore.response import StreamingBody
+            from botocore.stub import Stubber
+            import io
+            client = original_get_s3_client()
+            body = json.dumps({'results': {'transcripts': [{'transcript': 'hello world thank you very much'}]}}).encode()
+            stubber = Stubber(client)
+            stubber.add_response('get_object', {'Body': StreamingBody(io.BytesIO(body), len(body))})
+            stubber.add_response('put_object', {})
+            stubber.activate()
+        return original_get_s3_client()
+
+    lambda_function.get_s3_client = stubbed_s3_client
+    event = {'Records': [{'s3': {'bucket': {'name': lambda_function.PROCESSED_BUCKET},
+                                 'object': {'key': 'transcripts/bench.json'}}}]}
+    response = lambda_function.lambda_handler(event, None)
+    return started, imported, time.perf_counter(), response['statusCode']
+
+
+def run_child(entry):
+    os.chdir(ROOT)
+    sys.path.insert(0, ROOT)
+    # Entry points print progress; keep stdout for the JSON result
+    real_stdout, sys.stdout = sys.stdout, open(os.devnull, 'w')
+    try:
+        started, imported, finished, status = {'app': _child_app, 'api': _child_api, 'lambda': _child_lambda}[entry]()
+        modules = len(sys.modules)
+    finally:
+        sys.stdout = real_stdout
+    print(json.dumps({
+        'import_ms': (imported - started) * 1000,
+        'first_request_ms': (finished - imported) * 1000,
+        'status': status,
+        'modules': modules,
+    }))
+
+
+# --- Parent side ---
+def sample(entry):
+    env = dict(os.environ)
+    env.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+    env.setdefault('AWS_ACCESS_KEY_ID', 'bench')
+    env.setdefault('AWS_SECRET_ACCESS_KEY', 'bench')
+    env['VOSK_PRELOAD'] = 'false'
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child', entry],
+        capture_output=True, text=True, env=env, check=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Import-time and first-request benchmark per entry point.')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--entry', default=','.join(ENTRY_POINTS))
+    parser.add_argument('--json', action='store_true', help='print machine-readable medians (for tracking regressions)')
+    parser.add_argument('--child', choices=ENTRY_POINTS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child)
+        return
+
+    results = {}
+    for entry in [e.strip() for e in args.entry.split(',') if e.strip()]:
+        samples = [sample(entry) for _ in range(args.runs)]
+        results[entry] = {
+            'import_ms': round(statistics.median(s['import_ms'] for s in samples), 1),
+            'first_request_ms': round(statistics.median(s['first_request_ms'] for s in samples), 1),
+            'status': samples[-1]['status'],
+            'modules': samples[-1]['modules'],
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"Median of {args.runs} cold starts per entry point\n")
+    print(f"{'entry':<8} {'import':>10} {'1st request':>12} {'total':>10} {'modules':>8}  status")
+    for entry, r in results.items():
+        print(f"{entry:<8} {r['import_ms']:>8.1f}ms {r['first_request_ms']:>10.1f}ms "
+              f"{r['import_ms'] + r['first_request_ms']:>8.1f}ms {r['modules']:>8}  {r['status']}")
+
+
+if __name__ == '__main__':
+    main()
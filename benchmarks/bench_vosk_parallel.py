@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark: parallel chunked Vosk transcription vs a single recognizer.
+
+Transcribes the same recording with vosk_parallel.ParallelTranscriber at each
+worker count. One worker is the old behaviour: the whole recording on one
+recognizer in one thread. For every count it reports wall time, the real-time
+factor (seconds of compute per second of audio), the speedup over one worker,
+the number of segments and how closely the stitched text matches the
+single-pass text (segments are recognized without the context of their
+neighbours, so small differences at the cuts are expected).
+
+Needs ffmpeg and a Vosk model (VOSK_MODEL_PATH or --model). Pass a long
+speech recording with --audio; without one a synthetic tone-and-pause
+recording is generated, which exercises the same decode/split/recognize path
+but produces no meaningful text.
+
+Usage:
+    python benchmarks/bench_vosk_parallel.py --audio talk.wav [--workers 1,2,4,8] [--repeat 3]
+"""
+
+import argparse
+import difflib
+import math
+import os
+import statistics
+import struct
+import sys
+import tempfile
+import time
+import wave
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vosk_engine import SAMPLE_RATE, VoskModelRegistry  # noqa: E402
+from vosk_parallel import ParallelTranscriber  # noqa: E402
+
+
+def synthetic_recording(path, seconds=180, seed=3):
+    """Mono 16 kHz WAV of 'words' (short tone bursts) separated by pauses of varying length."""
+    import random
+    rng = random.Random(seed)
+    frames = bytearray()
+    while len(frames) < seconds * SAMPLE_RATE * 2:
+        burst = int(SAMPLE_RATE * rng.uniform(0.2, 0.6))
+        pitch = rng.uniform(150, 400)
+        frames += b''.join(struct.pack('<h', int(6000 * math.sin(2 * math.pi * pitch * i / SAMPLE_RATE)))
+                           for i in range(burst))
+        frames += bytes(2 * int(SAMPLE_RATE * rng.choice((0.08, 0.15, 0.4, 0.9))))
+    with wave.open(path, 'wb') as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(SAMPLE_RATE)
+        w.writeframes(bytes(frames))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--audio', help='recording to transcribe (any format ffmpeg reads)')
+    parser.add_argument('--model', default=os.getenv('VOSK_MODEL_PATH', 'vosk-model-small-en-us-0.15'))
+    parser.add_argument('--workers', default=','.join(str(n) for n in sorted({1, 2, 4, os.cpu_count() or 1})))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--target-secs', type=float, default=20)
+    parser.add_argument('--max-secs', type=float, default=40)
+    args = parser.parse_args()
+
+    registry = VoskModelRegistry(args.model)
+    if registry.get_model() is None:
+        sys.exit(f"No usable Vosk model at {args.model!r}; pass --model or set VOSK_MODEL_PATH")
+
+    audio = args.audio
+    if not audio:
+        audio = os.path.join(tempfile.gettempdir(), 'bench_vosk_parallel.wav')
+        synthetic_recording(audio)
+        print(f"No --audio given; using a synthetic recording at {audio}")
+
+    counts = [int(n) for n in args.workers.split(',') if n.strip()]
+    baseline_time = baseline_text = None
+    print(f"{os.cpu_count()} CPUs, median of {args.repeat} runs\n")
+    print(f"{'workers':>7} {'wall':>9} {'RTF':>7} {'speedup':>8} {'segments':>9} {'text match':>11}")
+    for count in counts:
+        transcriber = ParallelTranscriber(registry, workers=count, min_parallel_secs=0,
+                                          target_segment_secs=args.target_secs, max_segment_secs=args.max_secs)
+        transcriber.start()  # fork outside the timed runs, as the app does at startup
+        timings = []
+        result = None
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            result = transcriber.transcribe(audio)
+            timings.append(time.perf_counter() - started)
+        transcriber.shutdown()
+        if result is None:
+            sys.exit("Transcription failed (is ffmpeg installed?)")
+
+        wall = statistics.median(timings)
+        duration = transcriber.stats()['audio_secs'] / args.repeat
+        if baseline_time is None:
+            baseline_time, baseline_text = wall, result['text']
+        match = difflib.SequenceMatcher(None, baseline_text.split(), result['text'].split()).ratio()
+        print(f"{count:>7} {wall:>8.2f}s {wall / max(duration, 1e-9):>7.3f} {baseline_time / wall:>7.2f}x "
+              f"{result['segments']:>9} {match:>10.1%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-request overhead of the Vercel entry point.
+
+Serves the Flask app on localhost through three paths and times the same
+requests against each:
+
+  direct   app(environ, start_response) called in-process (no HTTP at all)
+  legacy   the old api/index.py handler: app.test_client() per request, the
+           whole body read into memory and the whole response buffered
+  adapter  api/index.py's WSGI handler: body streamed from the socket,
+           response streamed back with the app's status and headers
+
+For every route it reports the median latency of each path, the adapter's and
+legacy handler's overhead over a direct call, the median time to the first
+body byte over HTTP (where streaming responses differ most), and whether the
+path returned the status code and Content-Type the app itself produced.
+
+Sign lookups are stubbed out (every word is a text fallback) so the numbers
+measure request handling rather than SignBSL.
+
+Usage:
+    python benchmarks/bench_wsgi_adapter.py [--requests 300] [--body-kb 512]
+"""
+
+import argparse
+import http.client
+import os
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+from werkzeug.test import EnvironBuilder  # noqa: E402
+import app as app_module  # noqa: E402
+from api.index import handler as AdapterHandler  # noqa: E402
+
+app = app_module.app
+
+
+class LegacyHandler(BaseHTTPRequestHandler):
+    """The handler api/index.py used to export, kept here for comparison."""
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-type', 'text/html')
+        self.end_headers()
+        with app.test_client() as client:
+            response = client.get(self.path)
+            self.wfile.write(response.data)
+
+    def do_POST(self):
+        content_length = int(self.headers['Content-Length'])
+        post_data = self.rfile.read(content_length)
+        with app.test_client() as client:
+            response = client.post(self.path, data=post_data)
+            self.send_response(response.status_code)
+            self.send_header('Content-type', response.content_type)
+            self.end_headers()
+            self.wfile.write(response.data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class QuietAdapterHandler(AdapterHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(handler_class):
+    server = HTTPServer(('127.0.0.1', 0), handler_class)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def call_direct(method, path, body, headers):
+    environ = EnvironBuilder(path=path, method=method, data=body, headers=headers).get_environ()
+    captured = {}
+
+    def start_response(status, response_headers, exc_info=None):
+        captured['status'] = int(status.split(' ', 1)[0])
+        captured['type'] = dict(response_headers).get('Content-Type')
+
+    app_iter = app(environ, start_response)
+    try:
+        size = sum(len(chunk) for chunk in app_iter)
+    finally:
+        if hasattr(app_iter, 'close'):
+            app_iter.close()
+    return captured['status'], captured['type'], size
+
+
+def call_http(port, method, path, body, headers):
+    # A new connection per request, as the legacy handler (HTTP/1.0) can't keep one open
+    started = time.perf_counter()
+    conn = http.client.HTTPConnection('127.0.0.1', port)
+    try:
+        conn.request(method, path, body=body, headers=headers)
+        response = conn.getresponse()
+        size = len(response.read(1))
+        first_byte = time.perf_counter() - started
+        size += len(response.read())
+        return response.status, response.getheader('Content-Type'), size, first_byte
+    finally:
+        conn.close()
+
+
+def timed(fn, count):
+    """Median wall time (ms), median time to first byte (ms, HTTP only) and the last outcome."""
+    timings = []
+    first_bytes = []
+    outcome = None
+    for _ in range(count):
+        started = time.perf_counter()
+        outcome = fn()
+        timings.append(time.perf_counter() - started)
+        if len(outcome) > 3:
+            first_bytes.append(outcome[3])
+    first_byte = statistics.median(first_bytes) * 1000 if first_bytes else None
+    return statistics.median(timings) * 1000, first_byte, outcome
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=300)
+    parser.add_argument('--body-kb', type=int, default=512, help='size of the plain-text body sent to /translate/bulk')
+    args = parser.parse_args()
+
+    app_module.SIGN_RESOLVER.resolve = lambda keys: {key: None for key in keys}
+    large_text = (b'Thank you for coming. ' * (args.body_kb * 1024 // 22 + 1))[:args.body_kb * 1024]
+    routes = [
+        ('GET /', 'GET', '/', None, {}),
+        ('GET /metrics', 'GET', '/metrics', None, {}),
+        ('GET /batch/<unknown> (404)', 'GET', '/batch/unknown', None, {}),
+        ('POST /process_text', 'POST', '/process_text?inline=1',
+         b'{"text": "hello thank you", "persist": false}', {'Content-Type': 'application/json'}),
+        (f'POST /translate/bulk ({args.body_kb}KB)', 'POST', '/translate/bulk', large_text,
+         {'Content-Type': 'text/plain'}),
+    ]
+
+    legacy = start_server(LegacyHandler)
+    adapter = start_server(QuietAdapterHandler)
+    print(f"median of {args.requests} requests per route, in milliseconds\n")
+    print(f"{'route':<32} {'direct':>8} {'legacy':>8} {'adapter':>8} {'legacy +':>9} {'adapter +':>10} "
+          f"{'1st byte L/A':>16}  status/type kept (L, A)")
+    for label, method, path, body, headers in routes:
+        count = args.requests if body is None or len(body) < 64 * 1024 else max(10, args.requests // 10)
+        direct_ms, _, expected = timed(lambda: call_direct(method, path, body, headers), count)
+        legacy_ms, legacy_fb, legacy_out = timed(lambda: call_http(legacy.server_port, method, path, body, headers), count)
+        adapter_ms, adapter_fb, adapter_out = timed(lambda: call_http(adapter.server_port, method, path, body, headers), count)
+        legacy_ok = legacy_out[:2] == expected[:2]
+        adapter_ok = adapter_out[:2] == expected[:2]
+        first_bytes = f"{legacy_fb:.2f}/{adapter_fb:.2f}"
+        print(f"{label:<32} {direct_ms:>8.2f} {legacy_ms:>8.2f} {adapter_ms:>8.2f} "
+              f"{legacy_ms - direct_ms:>+9.2f} {adapter_ms - direct_ms:>+10.2f} {first_bytes:>16}  {legacy_ok}, {adapter_ok}")
+    legacy.shutdown()
+    adapter.shutdown()
+
+
+if __name__ == '__main__':
+    main()
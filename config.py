@@ -26,3 +26,184 @@ class Config:
         AWS_RESULT_WAIT_SECS = int(os.getenv('AWS_RESULT_WAIT_SECS', '60'))
     except ValueError:
         AWS_RESULT_WAIT_SECS = 60
+
+    # Local Vosk fallback: model location and warm recognizer pool size per sample rate
+    VOSK_MODEL_PATH = os.getenv('VOSK_MODEL_PATH', 'vosk-model-small-en-us-0.15')
+    try:
+        VOSK_RECOGNIZER_POOL_SIZE = int(os.getenv('VOSK_RECOGNIZER_POOL_SIZE', '4'))
+    except ValueError:
+        VOSK_RECOGNIZER_POOL_SIZE = 4
+    # Seconds before retrying a model load that failed (missing or broken model)
+    try:
+        VOSK_LOAD_RETRY_SECS = float(os.getenv('VOSK_LOAD_RETRY_SECS', '60'))
+    except ValueError:
+        VOSK_LOAD_RETRY_SECS = 60.0
+    # Load the model at startup instead of on the first fallback job
+    VOSK_PRELOAD = os.getenv('VOSK_PRELOAD', 'false').lower() in ('1', 'true', 'yes')
+    # Parallel chunked transcription: worker processes per app process (1 = off, 0 = one per CPU), minimum
+    # recording length worth splitting, and target/maximum segment length (seconds).
+    # The workers are forked at startup and only when VOSK_PRELOAD is on
+    try:
+        VOSK_PARALLEL_WORKERS = int(os.getenv('VOSK_PARALLEL_WORKERS', '1'))
+    except ValueError:
+        VOSK_PARALLEL_WORKERS = 1
+    try:
+        VOSK_PARALLEL_MIN_SECS = float(os.getenv('VOSK_PARALLEL_MIN_SECS', '45'))
+        VOSK_SEGMENT_TARGET_SECS = float(os.getenv('VOSK_SEGMENT_TARGET_SECS', '20'))
+        VOSK_SEGMENT_MAX_SECS = float(os.getenv('VOSK_SEGMENT_MAX_SECS', '40'))
+    except ValueError:
+        VOSK_PARALLEL_MIN_SECS, VOSK_SEGMENT_TARGET_SECS, VOSK_SEGMENT_MAX_SECS = 45.0, 20.0, 40.0
+
+    # Live transcription over WebSocket: concurrent sessions (one ffmpeg + recognizer each) and max length
+    try:
+        LIVE_MAX_SESSIONS = int(os.getenv('LIVE_MAX_SESSIONS', '4'))
+    except ValueError:
+        LIVE_MAX_SESSIONS = 4
+    try:
+        LIVE_MAX_SECS = int(os.getenv('LIVE_MAX_SECS', '300'))
+    except ValueError:
+        LIVE_MAX_SECS = 300
+
+    # Job scheduler: concurrent local transcriptions, queued jobs allowed, threads for AWS result checks
+    try:
+        TRANSCRIBE_WORKERS = int(os.getenv('TRANSCRIBE_WORKERS', '2'))
+    except ValueError:
+        TRANSCRIBE_WORKERS = 2
+    try:
+        TRANSCRIBE_QUEUE_LIMIT = int(os.getenv('TRANSCRIBE_QUEUE_LIMIT', '50'))
+    except ValueError:
+        TRANSCRIBE_QUEUE_LIMIT = 50
+    try:
+        AWS_WAIT_WORKERS = int(os.getenv('AWS_WAIT_WORKERS', '4'))
+    except ValueError:
+        AWS_WAIT_WORKERS = 4
+    # Open /status/<job_id>/stream connections per process; each one holds a server thread, so keep
+    # this well below gunicorn's --threads (16). Further clients are told to poll /status instead
+    try:
+        STATUS_STREAM_MAX_CLIENTS = int(os.getenv('STATUS_STREAM_MAX_CLIENTS', '8'))
+    except ValueError:
+        STATUS_STREAM_MAX_CLIENTS = 8
+    # Seconds to let in-flight jobs finish on shutdown
+    try:
+        SHUTDOWN_DRAIN_SECS = int(os.getenv('SHUTDOWN_DRAIN_SECS', '30'))
+    except ValueError:
+        SHUTDOWN_DRAIN_SECS = 30
+
+    # Upload spool: uploads up to UPLOAD_IN_MEMORY_MAX_KB stay in RAM while all in-flight audio
+    # fits in AUDIO_MEMORY_BUDGET_MB; the rest goes to UPLOAD_SPOOL_DIR, capped at UPLOAD_SPOOL_MAX_MB
+    UPLOAD_SPOOL_DIR = os.getenv('UPLOAD_SPOOL_DIR')  # default: <tmp>/stt_upload_spool
+    try:
+        UPLOAD_SPOOL_MAX_MB = int(os.getenv('UPLOAD_SPOOL_MAX_MB', '1024'))
+    except ValueError:
+        UPLOAD_SPOOL_MAX_MB = 1024
+    try:
+        AUDIO_MEMORY_BUDGET_MB = int(os.getenv('AUDIO_MEMORY_BUDGET_MB', '64'))
+    except ValueError:
+        AUDIO_MEMORY_BUDGET_MB = 64
+    try:
+        UPLOAD_IN_MEMORY_MAX_KB = int(os.getenv('UPLOAD_IN_MEMORY_MAX_KB', '1024'))
+    except ValueError:
+        UPLOAD_IN_MEMORY_MAX_KB = 1024
+    # S3 multipart uploads of spooled files: part size and parts sent in parallel
+    try:
+        S3_MULTIPART_CHUNK_MB = int(os.getenv('S3_MULTIPART_CHUNK_MB', '8'))
+    except ValueError:
+        S3_MULTIPART_CHUNK_MB = 8
+    try:
+        S3_UPLOAD_CONCURRENCY = int(os.getenv('S3_UPLOAD_CONCURRENCY', '4'))
+    except ValueError:
+        S3_UPLOAD_CONCURRENCY = 4
+
+    # Completed-result cache: in-process LRU size, plus an optional disk tier shared by workers on the host
+    try:
+        RESULT_CACHE_MAX_MB = int(os.getenv('RESULT_CACHE_MAX_MB', '32'))
+    except ValueError:
+        RESULT_CACHE_MAX_MB = 32
+    RESULT_CACHE_DIR = os.getenv('RESULT_CACHE_DIR') or None  # unset: memory only
+    try:
+        RESULT_CACHE_DISK_MAX_MB = int(os.getenv('RESULT_CACHE_DISK_MAX_MB', '256'))
+    except ValueError:
+        RESULT_CACHE_DISK_MAX_MB = 256
+
+    # Memo of text translations by normalized text: entries kept and how long before they are re-mapped
+    try:
+        TEXT_MEMO_MAX_ENTRIES = int(os.getenv('TEXT_MEMO_MAX_ENTRIES', '5000'))
+    except ValueError:
+        TEXT_MEMO_MAX_ENTRIES = 5000
+    try:
+        TEXT_MEMO_TTL_SECS = int(os.getenv('TEXT_MEMO_TTL_SECS', '3600'))
+    except ValueError:
+        TEXT_MEMO_TTL_SECS = 3600
+
+    # Bulk translation (/translate/bulk): sentences mapped concurrently and longest segment without a boundary
+    try:
+        BULK_TRANSLATE_WORKERS = int(os.getenv('BULK_TRANSLATE_WORKERS', '4'))
+    except ValueError:
+        BULK_TRANSLATE_WORKERS = 4
+    try:
+        BULK_SEGMENT_MAX_CHARS = int(os.getenv('BULK_SEGMENT_MAX_CHARS', '2000'))
+    except ValueError:
+        BULK_SEGMENT_MAX_CHARS = 2000
+
+    # Batch uploads (/upload/batch): recordings per batch (never more than TRANSCRIBE_QUEUE_LIMIT),
+    # request size limit and concurrent S3 uploads
+    try:
+        BATCH_MAX_ITEMS = int(os.getenv('BATCH_MAX_ITEMS', '50'))
+    except ValueError:
+        BATCH_MAX_ITEMS = 50
+    try:
+        BATCH_MAX_CONTENT_MB = int(os.getenv('BATCH_MAX_CONTENT_MB', '512'))
+    except ValueError:
+        BATCH_MAX_CONTENT_MB = 512
+    try:
+        BATCH_UPLOAD_WORKERS = int(os.getenv('BATCH_UPLOAD_WORKERS', '4'))
+    except ValueError:
+        BATCH_UPLOAD_WORKERS = 4
+
+    # Upload de-duplication by content hash: repeats reuse the earlier job's result, concurrent copies share one job
+    UPLOAD_DEDUP_ENABLED = os.getenv('UPLOAD_DEDUP_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    try:
+        UPLOAD_DEDUP_MAX_ENTRIES = int(os.getenv('UPLOAD_DEDUP_MAX_ENTRIES', '10000'))
+    except ValueError:
+        UPLOAD_DEDUP_MAX_ENTRIES = 10000
+
+    # SignBSL lookup cache (SQLite in WAL mode, shared by all workers on the host)
+    SIGNBSL_CACHE_PATH = os.getenv('SIGNBSL_CACHE_PATH') or None  # default: <tmpdir>/signbsl_cache.sqlite3
+    # Manifest written by signbsl_crawler.py; loaded into the lookup cache at startup if present
+    SIGNBSL_MANIFEST_PATH = os.getenv('SIGNBSL_MANIFEST_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'lexicon', 'signbsl_manifest.json'))
+    try:
+        SIGNBSL_CACHE_MAX_ENTRIES = int(os.getenv('SIGNBSL_CACHE_MAX_ENTRIES', '50000'))
+    except ValueError:
+        SIGNBSL_CACHE_MAX_ENTRIES = 50000
+    try:
+        SIGNBSL_CACHE_LRU_SIZE = int(os.getenv('SIGNBSL_CACHE_LRU_SIZE', '2048'))
+    except ValueError:
+        SIGNBSL_CACHE_LRU_SIZE = 2048
+    # TTLs (seconds) for found videos, real 404s / pages without video, and transient failures
+    try:
+        SIGNBSL_TTL_FOUND_SECS = int(os.getenv('SIGNBSL_TTL_FOUND_SECS', str(30 * 24 * 3600)))
+    except ValueError:
+        SIGNBSL_TTL_FOUND_SECS = 30 * 24 * 3600
+    try:
+        SIGNBSL_TTL_NOT_FOUND_SECS = int(os.getenv('SIGNBSL_TTL_NOT_FOUND_SECS', str(24 * 3600)))
+    except ValueError:
+        SIGNBSL_TTL_NOT_FOUND_SECS = 24 * 3600
+    try:
+        SIGNBSL_TTL_ERROR_SECS = int(os.getenv('SIGNBSL_TTL_ERROR_SECS', '60'))
+    except ValueError:
+        SIGNBSL_TTL_ERROR_SECS = 60
+    # Concurrent SignBSL lookups per process when resolving a sentence
+    try:
+        SIGNBSL_LOOKUP_WORKERS = int(os.getenv('SIGNBSL_LOOKUP_WORKERS', '8'))
+    except ValueError:
+        SIGNBSL_LOOKUP_WORKERS = 8
+    # Keep-alive connection pool and timeouts (seconds) for SignBSL requests
+    try:
+        SIGNBSL_HTTP_POOL_SIZE = int(os.getenv('SIGNBSL_HTTP_POOL_SIZE', '8'))
+    except ValueError:
+        SIGNBSL_HTTP_POOL_SIZE = 8
+    try:
+        SIGNBSL_CONNECT_TIMEOUT = float(os.getenv('SIGNBSL_CONNECT_TIMEOUT', '3.05'))
+        SIGNBSL_READ_TIMEOUT = float(os.getenv('SIGNBSL_READ_TIMEOUT', '10'))
+    except ValueError:
+        SIGNBSL_CONNECT_TIMEOUT, SIGNBSL_READ_TIMEOUT = 3.05, 10.0
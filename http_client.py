@@ -0,0 +1,112 @@
+"""
+Shared keep-alive HTTP client for outbound SignBSL requests.
+
+One requests.Session per process, mounted with a connection pool sized for the
+lookup workers, so consecutive lookups reuse the TCP/TLS connection to
+www.signbsl.com instead of handshaking every time. Cookies are disabled so the
+session holds no per-request state and can be shared between threads.
+"""
+
+import os
+import threading
+import time
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlsplit
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate',
+    'Connection': 'keep-alive',
+}
+
+try:
+    _pool_size = int(os.getenv('SIGNBSL_HTTP_POOL_SIZE', '8'))
+except ValueError:
+    _pool_size = 8
+try:
+    _timeout = (float(os.getenv('SIGNBSL_CONNECT_TIMEOUT', '3.05')), float(os.getenv('SIGNBSL_READ_TIMEOUT', '10')))
+except ValueError:
+    _timeout = (3.05, 10.0)
+
+_session = None
+_adapter = None
+_lock = threading.Lock()
+
+# Optional per-host pacing (used by the offline crawler; off for the request path)
+_min_interval = 0.0
+_next_slot = {}  # host -> monotonic time the next request to it may start
+
+
+def configure(pool_size: int = None, connect_timeout: float = None, read_timeout: float = None) -> None:
+    """Override pool size / timeouts. Must be called before the first request to affect the pool size."""
+    global _pool_size, _timeout
+    if pool_size is not None:
+        _pool_size = max(1, pool_size)
+    _timeout = (
+        connect_timeout if connect_timeout is not None else _timeout[0],
+        read_timeout if read_timeout is not None else _timeout[1],
+    )
+
+
+def get_session() -> 'requests.Session':
+    """Return the process-wide pooled session, creating it on first use."""
+    global _session, _adapter
+    if _session is None:
+        with _lock:
+            if _session is None:
+                # requests is imported here so processes that never call SignBSL don't pay for it
+                import requests
+                from requests.adapters import HTTPAdapter
+                session = requests.Session()
+                session.headers.update(DEFAULT_HEADERS)
+                session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+                _adapter = HTTPAdapter(pool_connections=4, pool_maxsize=_pool_size, pool_block=False)
+                session.mount('https://', _adapter)
+                session.mount('http://', _adapter)
+                _session = session
+    return _session
+
+
+def set_rate_limit(requests_per_second: float = None) -> None:
+    """Space requests to each host at least 1/requests_per_second apart (None or 0 disables)."""
+    global _min_interval
+    with _lock:
+        _min_interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        _next_slot.clear()
+
+
+def _throttle(url: str) -> None:
+    if not _min_interval:
+        return
+    host = urlsplit(url).netloc
+    with _lock:
+        now = time.monotonic()
+        slot = max(now, _next_slot.get(host, 0.0))
+        _next_slot[host] = slot + _min_interval
+    if slot > now:
+        time.sleep(slot - now)
+
+
+def get(url: str, headers: dict = None, timeout=None, **kwargs) -> 'requests.Response':
+    """GET through the shared pool with separate connect/read timeouts."""
+    _throttle(url)
+    return get_session().get(url, headers=headers, timeout=timeout or _timeout, **kwargs)
+
+
+def stats() -> dict:
+    """Requests served and connections opened per host (reuse = requests - connections)."""
+    result = {'pool_size': _pool_size, 'connect_timeout': _timeout[0], 'read_timeout': _timeout[1], 'hosts': {}}
+    if _adapter is None:
+        return result
+    pools = _adapter.poolmanager.pools
+    for key in list(pools.keys()):
+        pool = pools.get(key)
+        if pool is None:
+            continue
+        result['hosts'][f"{pool.scheme}://{pool.host}:{pool.port}"] = {
+            'requests': pool.num_requests,
+            'connections': pool.num_connections,
+        }
+    return result
@@ -0,0 +1,129 @@
+"""
+In-process job completion registry.
+
+Jobs started by this process are registered here; whoever produces the final
+result (the local fallback or the orchestrator when it sees the Lambda's
+output) calls complete() or fail(), and every waiter blocked in wait() is woken
+immediately instead of polling S3. Intermediate stages are published with
+update() and can be followed with watch(), which backs the status stream.
+"""
+
+import threading
+import time
+
+
+class _JobEntry:
+    __slots__ = ('event', 'result', 'created', 'stage', 'message', 'version')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.created = time.monotonic()
+        self.stage = 'queued'
+        self.message = None
+        self.version = 0
+
+
+class JobRegistry:
+    """Per-job completion events for jobs known to this process."""
+
+    def __init__(self, ttl_secs: float = 3600):
+        self.ttl_secs = ttl_secs
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._jobs = {}
+
+    def register(self, job_id: str, stage: str = 'queued', message: str = None) -> None:
+        with self._lock:
+            self._prune()
+            entry = self._jobs.setdefault(job_id, _JobEntry())
+            self._set_stage(entry, stage, message)
+
+    def update(self, job_id: str, stage: str, message: str = None) -> None:
+        """Publish a progress stage for `job_id` to anyone watching it."""
+        with self._lock:
+            entry = self._jobs.get(job_id)
+            if entry is not None and not entry.event.is_set():
+                self._set_stage(entry, stage, message)
+
+    def _set_stage(self, entry, stage, message):
+        entry.stage = stage
+        entry.message = message
+        entry.version += 1
+        self._changed.notify_all()
+
+    def is_tracked(self, job_id: str) -> bool:
+        with self._lock:
+            return job_id in self._jobs
+
+    def complete(self, job_id: str, result: dict) -> None:
+        """Record the final result for `job_id` and wake all waiters."""
+        with self._lock:
+            entry = self._jobs.setdefault(job_id, _JobEntry())
+            entry.result = result
+            entry.event.set()
+            self._set_stage(entry, 'error' if result.get('status') == 'error' else 'completed', None)
+
+    def fail(self, job_id: str, message: str) -> None:
+        """Mark `job_id` as failed so waiters stop waiting."""
+        self.complete(job_id, {'job_id': job_id, 'status': 'error', 'error_message': message})
+
+    def get(self, job_id: str):
+        """Return the recorded result for `job_id`, or None if it is not finished (or unknown)."""
+        with self._lock:
+            entry = self._jobs.get(job_id)
+        return entry.result if entry is not None and entry.event.is_set() else None
+
+    def wait(self, job_id: str, timeout: float = None):
+        """Block until `job_id` finishes or `timeout` elapses; returns the result or None.
+
+        Unknown jobs return None at once: nothing in this process would ever finish them.
+        """
+        with self._lock:
+            entry = self._jobs.get(job_id)
+        if entry is None:
+            return None
+        if entry.event.wait(timeout):
+            return entry.result
+        return None
+
+    def watch(self, job_id: str, last_version: int = 0, timeout: float = None):
+        """Block until `job_id` moves past `last_version` or `timeout` elapses.
+
+        Returns a snapshot dict (version, stage, message, finished, result), or
+        None if the job is not tracked by this process.
+        """
+        with self._lock:
+            entry = self._jobs.get(job_id)
+            if entry is None:
+                return None
+            if entry.version <= last_version:
+                self._changed.wait_for(lambda: entry.version > last_version, timeout)
+            return self._snapshot(entry)
+
+    def snapshot(self, job_id: str):
+        """Current state of `job_id` in the shape watch() returns, without waiting; None if not tracked."""
+        with self._lock:
+            entry = self._jobs.get(job_id)
+            return self._snapshot(entry) if entry is not None else None
+
+    @staticmethod
+    def _snapshot(entry):
+        return {
+            'version': entry.version,
+            'stage': entry.stage,
+            'message': entry.message,
+            'finished': entry.event.is_set(),
+            'result': entry.result,
+        }
+
+    def stats(self) -> dict:
+        with self._lock:
+            done = sum(1 for e in self._jobs.values() if e.event.is_set())
+            return {'tracked': len(self._jobs), 'finished': done, 'pending': len(self._jobs) - done}
+
+    def _prune(self):
+        cutoff = time.monotonic() - self.ttl_secs
+        stale = [job_id for job_id, e in self._jobs.items() if e.created < cutoff]
+        for job_id in stale:
+            del self._jobs[job_id]
@@ -0,0 +1,199 @@
+"""
+Bounded job scheduler for upload processing.
+
+CPU-heavy work (local Vosk transcription) runs on a fixed-size worker pool
+with a bounded queue. Waiting for AWS results does not hold a thread: waits
+are expressed as timers on a single timer thread, and each due timer runs a
+short callback (an S3 check) on a small I/O pool.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class QueueFullError(RuntimeError):
+    """Raised when the transcription queue is at its configured limit."""
+
+
+class SchedulerClosedError(RuntimeError):
+    """Raised when work is submitted after shutdown() has begun."""
+
+
+class TimerHandle:
+    """Handle returned by JobScheduler.call_later; cancel() prevents the callback from running."""
+
+    __slots__ = ('when', 'cancelled', 'on_drop')
+
+    def __init__(self, when: float, on_drop=None):
+        self.when = when
+        self.cancelled = False
+        self.on_drop = on_drop
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class JobScheduler:
+    """Fixed worker pool plus a timer heap for cheap, thread-free waiting."""
+
+    def __init__(self, max_workers: int = 2, max_queue: int = 50, io_workers: int = 4):
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(1, max_queue)
+        self._workers = ThreadPoolExecutor(self.max_workers, thread_name_prefix='transcribe')
+        self._io = ThreadPoolExecutor(max(1, io_workers), thread_name_prefix='aws-wait')
+
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._closed = False
+
+        self._timers = []
+        self._timers_closed = False
+        self._timer_seq = itertools.count()
+        self._timer_cond = threading.Condition()
+        self._timer_thread = threading.Thread(target=self._timer_loop, name='job-timers', daemon=True)
+        self._timer_thread.start()
+
+    # --- Worker pool ---
+    def submit(self, fn, *args, **kwargs):
+        """Queue `fn` on the transcription pool. Raises QueueFullError when the queue is full."""
+        with self._lock:
+            if self._closed:
+                raise SchedulerClosedError('scheduler is shut down')
+            if self._queued >= self.max_queue:
+                self._rejected += 1
+                raise QueueFullError(f'transcription queue is full ({self.max_queue} jobs waiting)')
+            self._queued += 1
+        try:
+            return self._workers.submit(self._run, fn, args, kwargs)
+        except RuntimeError as e:
+            # The pool shut down between the check above and this submit
+            with self._lock:
+                self._queued -= 1
+                if self._queued == 0 and self._running == 0:
+                    self._idle.notify_all()
+            raise SchedulerClosedError('scheduler is shut down') from e
+
+    def is_saturated(self) -> bool:
+        with self._lock:
+            return self._queued >= self.max_queue
+
+    def _run(self, fn, args, kwargs):
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+        ok = False
+        try:
+            result = fn(*args, **kwargs)
+            ok = True
+            return result
+        finally:
+            with self._lock:
+                self._running -= 1
+                if ok:
+                    self._completed += 1
+                else:
+                    self._failed += 1
+                if self._queued == 0 and self._running == 0:
+                    self._idle.notify_all()
+
+    # --- Timers ---
+    def call_later(self, delay: float, fn, *args, on_drop=None) -> TimerHandle:
+        """Run `fn(*args)` on the I/O pool after `delay` seconds. Callbacks should be short.
+
+        If shutdown() drops the timer before it is due, `on_drop()` runs instead, so the
+        caller can clean up whatever the callback would have taken care of.
+        """
+        handle = TimerHandle(time.monotonic() + max(0.0, delay), on_drop)
+        with self._timer_cond:
+            if self._timers_closed:
+                raise SchedulerClosedError('scheduler is shut down')
+            heapq.heappush(self._timers, (handle.when, next(self._timer_seq), handle, fn, args))
+            self._timer_cond.notify()
+        return handle
+
+    def _timer_loop(self):
+        while True:
+            with self._timer_cond:
+                while True:
+                    if self._timers_closed:
+                        return
+                    if self._timers:
+                        delay = self._timers[0][0] - time.monotonic()
+                        if delay <= 0:
+                            _, _, handle, fn, args = heapq.heappop(self._timers)
+                            break
+                        self._timer_cond.wait(delay)
+                    else:
+                        self._timer_cond.wait()
+            if not handle.cancelled:
+                self._io.submit(self._run_timer, fn, args)
+
+    @staticmethod
+    def _run_timer(fn, args):
+        try:
+            fn(*args)
+        except Exception as e:
+            print(f"[scheduler] Timer callback {getattr(fn, '__name__', fn)} failed: {e}")
+
+    # --- Introspection / lifecycle ---
+    def stats(self) -> dict:
+        with self._timer_cond:
+            pending_timers = sum(1 for t in self._timers if not t[2].cancelled)
+        with self._lock:
+            return {
+                'max_workers': self.max_workers,
+                'max_queue': self.max_queue,
+                'queue_depth': self._queued,
+                'running': self._running,
+                'completed': self._completed,
+                'failed': self._failed,
+                'rejected': self._rejected,
+                'pending_timers': pending_timers,
+            }
+
+    def shutdown(self, timeout: float = None) -> bool:
+        """Stop accepting work, drop pending timers (running their on_drop) and drain queued/running jobs.
+
+        Returns True if every in-flight job finished within `timeout`.
+        """
+        with self._timer_cond:
+            if self._timers_closed:
+                return True
+            self._timers_closed = True
+            dropped = [t[2] for t in self._timers if not t[2].cancelled]
+            self._timers.clear()
+            self._timer_cond.notify_all()
+        self._timer_thread.join()
+        if dropped:
+            print(f"[scheduler] Dropped {len(dropped)} pending timer(s) on shutdown")
+        for handle in dropped:
+            if handle.on_drop is not None:
+                try:
+                    handle.on_drop()
+                except Exception as e:
+                    print(f"[scheduler] Cleanup for a dropped timer failed: {e}")
+
+        # Timer callbacks already dispatched may still submit work, so drain the I/O pool first
+        self._io.shutdown(wait=True)
+        with self._lock:
+            self._closed = True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._idle:
+            while self._queued or self._running:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                self._idle.wait(remaining)
+            drained = not (self._queued or self._running)
+        self._workers.shutdown(wait=drained)
+        if not drained:
+            print(f"[scheduler] Shutdown timed out with {self._queued} queued and {self._running} running job(s)")
+        return drained
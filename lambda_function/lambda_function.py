@@ -1,229 +1,248 @@
 import json
-import boto3
 import urllib.parse
 import os
+import sys
+import threading
 from typing import List, Dict
-import time # Added for polling
+from concurrent.futures import ThreadPoolExecutor
 
-# Initialize AWS clients
-s3_client = boto3.client('s3')
-transcribe_client = boto3.client('transcribe')
+try:
+    from phrase_trie import segment_words
+    from sign_lexicon import load_lexicon
+except ImportError:
+    # Running from the repo checkout rather than the deployment zip (which ships these modules alongside)
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from phrase_trie import segment_words
+    from sign_lexicon import load_lexicon
+
+# AWS clients are created on first use and reused by later invocations of a warm container;
+# the transcript stage never needs Transcribe, so it doesn't pay to build that client
+s3_client = None
+transcribe_client = None
+_client_lock = threading.Lock()
+
+def get_s3_client():
+    global s3_client
+    if s3_client is None:
+        with _client_lock:
+            if s3_client is None:
+                import boto3
+                s3_client = boto3.client('s3')
+    return s3_client
+
+def get_transcribe_client():
+    global transcribe_client
+    if transcribe_client is None:
+        with _client_lock:
+            if transcribe_client is None:
+                import boto3
+                transcribe_client = boto3.client('transcribe')
+    return transcribe_client
 
 # Configuration
 PROCESSED_BUCKET = os.environ.get('PROCESSED_BUCKET', 'stt-processed-bucket')
 TRANSCRIBE_BUCKET = os.environ.get('UPLOAD_BUCKET', 'stt-upload-bucket')
+try:
+    # Records of one event processed at the same time (1 = one after another)
+    RECORD_CONCURRENCY = max(1, int(os.environ.get('RECORD_CONCURRENCY', '4')))
+except ValueError:
+    RECORD_CONCURRENCY = 4
 
-# Enhanced sign language mapping with phrases and individual words
-# Inspired by signbsl.com structure - phrases take priority over individual words
-SIGN_MAPPING = {
-    # Multi-word phrases (these will be matched first due to greedy algorithm)
-    'thank you very much': 'https://via.placeholder.com/200x200/4CAF50/white?text=THANK+YOU+VERY+MUCH',
-    'how are you': 'https://via.placeholder.com/200x200/2196F3/white?text=HOW+ARE+YOU',
-    'nice to meet you': 'https://via.placeholder.com/200x200/9C27B0/white?text=NICE+TO+MEET+YOU',
-    'good morning': 'https://via.placeholder.com/200x200/FF9800/white?text=GOOD+MORNING',
-    'good afternoon': 'https://via.placeholder.com/200x200/FFC107/black?text=GOOD+AFTERNOON',
-    'good evening': 'https://via.placeholder.com/200x200/673AB7/white?text=GOOD+EVENING',
-    'good night': 'https://via.placeholder.com/200x200/424242/white?text=GOOD+NIGHT',
-    'thank you': 'https://via.placeholder.com/200x200/4CAF50/white?text=THANK+YOU',
-    'excuse me': 'https://via.placeholder.com/200x200/FF5722/white?text=EXCUSE+ME',
-    'see you later': 'https://via.placeholder.com/200x200/FF9800/white?text=SEE+YOU+LATER',
-    'have a nice day': 'https://via.placeholder.com/200x200/4CAF50/white?text=HAVE+NICE+DAY',
-    'my name': 'https://via.placeholder.com/200x200/009688/white?text=MY+NAME',
-    'what is': 'https://via.placeholder.com/200x200/3F51B5/white?text=WHAT+IS',
-    'where is': 'https://via.placeholder.com/200x200/8BC34A/white?text=WHERE+IS',
-    
-    # Two-word combinations
-    'very much': 'https://via.placeholder.com/200x200/9E9E9E/white?text=VERY+MUCH',
-    'hello world': 'https://via.placeholder.com/200x200/2196F3/white?text=HELLO+WORLD',
-    'please help': 'https://via.placeholder.com/200x200/FF5722/white?text=PLEASE+HELP',
-    
-    # Individual words (fallback when no phrases match)
-    'hello': 'https://via.placeholder.com/200x200/4CAF50/white?text=HELLO',
-    'world': 'https://via.placeholder.com/200x200/2196F3/white?text=WORLD',
-    'thank': 'https://via.placeholder.com/200x200/FF9800/white?text=THANK',
-    'you': 'https://via.placeholder.com/200x200/9C27B0/white?text=YOU',
-    'please': 'https://via.placeholder.com/200x200/607D8B/white?text=PLEASE',
-    'sorry': 'https://via.placeholder.com/200x200/F44336/white?text=SORRY',
-    'yes': 'https://via.placeholder.com/200x200/4CAF50/white?text=YES',
-    'no': 'https://via.placeholder.com/200x200/F44336/white?text=NO',
-    'good': 'https://via.placeholder.com/200x200/4CAF50/white?text=GOOD',
-    'morning': 'https://via.placeholder.com/200x200/FF9800/white?text=MORNING',
-    'afternoon': 'https://via.placeholder.com/200x200/FFC107/black?text=AFTERNOON',
-    'evening': 'https://via.placeholder.com/200x200/673AB7/white?text=EVENING',
-    'night': 'https://via.placeholder.com/200x200/424242/white?text=NIGHT',
-    'help': 'https://via.placeholder.com/200x200/FF5722/white?text=HELP',
-    'water': 'https://via.placeholder.com/200x200/2196F3/white?text=WATER',
-    'food': 'https://via.placeholder.com/200x200/FF9800/white?text=FOOD',
-    'home': 'https://via.placeholder.com/200x200/795548/white?text=HOME',
-    'work': 'https://via.placeholder.com/200x200/607D8B/white?text=WORK',
-    'family': 'https://via.placeholder.com/200x200/E91E63/white?text=FAMILY',
-    'friend': 'https://via.placeholder.com/200x200/9C27B0/white?text=FRIEND',
-    'love': 'https://via.placeholder.com/200x200/E91E63/white?text=LOVE',
-    'happy': 'https://via.placeholder.com/200x200/FFEB3B/black?text=HAPPY',
-    'sad': 'https://via.placeholder.com/200x200/3F51B5/white?text=SAD',
-    'name': 'https://via.placeholder.com/200x200/009688/white?text=NAME',
-    'time': 'https://via.placeholder.com/200x200/795548/white?text=TIME',
-    'today': 'https://via.placeholder.com/200x200/4CAF50/white?text=TODAY',
-    'tomorrow': 'https://via.placeholder.com/200x200/2196F3/white?text=TOMORROW',
-    'yesterday': 'https://via.placeholder.com/200x200/9E9E9E/white?text=YESTERDAY',
-    'very': 'https://via.placeholder.com/200x200/795548/white?text=VERY',
-    'much': 'https://via.placeholder.com/200x200/607D8B/white?text=MUCH',
-    'how': 'https://via.placeholder.com/200x200/FF9800/white?text=HOW',
-    'what': 'https://via.placeholder.com/200x200/9C27B0/white?text=WHAT',
-    'where': 'https://via.placeholder.com/200x200/4CAF50/white?text=WHERE',
-    'nice': 'https://via.placeholder.com/200x200/4CAF50/white?text=NICE',
-    'meet': 'https://via.placeholder.com/200x200/FF9800/white?text=MEET',
-    'see': 'https://via.placeholder.com/200x200/2196F3/white?text=SEE',
-    'later': 'https://via.placeholder.com/200x200/607D8B/white?text=LATER',
-    'day': 'https://via.placeholder.com/200x200/FFEB3B/black?text=DAY',
-    'have': 'https://via.placeholder.com/200x200/9C27B0/white?text=HAVE',
-    'is': 'https://via.placeholder.com/200x200/795548/white?text=IS',
-    'my': 'https://via.placeholder.com/200x200/FF5722/white?text=MY',
-    'me': 'https://via.placeholder.com/200x200/673AB7/white?text=ME',
-    'excuse': 'https://via.placeholder.com/200x200/FF5722/white?text=EXCUSE'
-}
+# Phrase lexicon compiled from lexicon/signs.json (mmap-loaded, so cold starts don't rebuild it)
+SIGN_LEXICON = load_lexicon()
 
-# Pre-sorted keys for efficient phrase-first matching
-SORTED_SIGN_KEYS = sorted(SIGN_MAPPING.keys(), key=lambda x: len(x.split()), reverse=True)
+# Transcribe writes its JSON here in PROCESSED_BUCKET; objects landing under this prefix trigger the second stage
+TRANSCRIPT_PREFIX = 'transcripts/'
 
 def lambda_handler(event, context):
     """
-    AWS Lambda handler for processing audio files uploaded to S3
+    AWS Lambda handler for the two-stage pipeline:
+      1. audio uploaded to the upload bucket -> start an AWS Transcribe job and return
+      2. transcript JSON written under transcripts/ -> map text to signs and save the result
+    Transcribe job failures arrive as EventBridge "Transcribe Job State Change" events.
+    
+    The records of one event are processed concurrently (up to RECORD_CONCURRENCY at a time),
+    each in isolation: a failing record is reported in batchItemFailures without affecting the
+    others. S3 notifications delivered through SQS are unwrapped and reported by messageId.
     """
     try:
-        # Parse S3 event
-        for record in event['Records']:
-            bucket = record['s3']['bucket']['name']
-            key = urllib.parse.unquote_plus(record['s3']['object']['key'], encoding='utf-8')
-            
-            print(f"Processing file: {key} from bucket: {bucket}")
-            
-            # Start transcription job
-            job_name = key.split('.')[0]  # Remove file extension
-            transcription_text = start_transcription_job(bucket, key, job_name)
-            
-            if transcription_text:
-                # Map text to sign language
-                sign_sequence = map_text_to_signs(transcription_text)
-                
-                # Save results to processed bucket
-                save_results(job_name, transcription_text, sign_sequence)
-                
-                print(f"Successfully processed {key}")
-            else:
-                print(f"Failed to transcribe {key}")
-                save_error_result(job_name, "Failed to transcribe audio")
-        
-        return {
-            'statusCode': 200,
-            'body': json.dumps('Processing completed successfully')
-        }
+        if event.get('source') == 'aws.transcribe':
+            handle_transcription_state_change(event.get('detail', {}))
+            return {
+                'statusCode': 200,
+                'body': json.dumps('Processing completed successfully')
+            }
         
+        records = list(iter_s3_records(event))
     except Exception as e:
         print(f"Error processing event: {str(e)}")
         return {
             'statusCode': 500,
             'body': json.dumps(f'Error: {str(e)}')
         }
+    
+    if len(records) <= 1 or RECORD_CONCURRENCY <= 1:
+        outcomes = [process_record(record) for _, record in records]
+    else:
+        with ThreadPoolExecutor(max_workers=min(RECORD_CONCURRENCY, len(records))) as pool:
+            outcomes = list(pool.map(process_record, [record for _, record in records]))
+    
+    # A message counts as failed if any S3 record it carried failed
+    failed_ids = list(dict.fromkeys(item_id for (item_id, _), ok in zip(records, outcomes) if not ok))
+    if failed_ids:
+        print(f"{len(failed_ids)} of {len(records)} records failed: {failed_ids}")
+    
+    return {
+        'statusCode': 500 if failed_ids else 200,
+        'body': json.dumps(f'{len(failed_ids)} of {len(records)} records failed' if failed_ids else 'Processing completed successfully'),
+        'batchItemFailures': [{'itemIdentifier': item_id} for item_id in failed_ids]
+    }
+
+def iter_s3_records(event: Dict):
+    """
+    Yield (item_identifier, s3_record) for a direct S3 notification or an SQS batch of them.
+    Malformed entries are yielded too (as an empty record) so they fail on their own.
+    """
+    for record in event.get('Records', []):
+        if record.get('eventSource') == 'aws:sqs':
+            try:
+                inner_records = json.loads(record['body']).get('Records', [])  # s3:TestEvent has none
+            except (KeyError, ValueError, AttributeError):
+                inner_records = [{}]
+            for inner in inner_records:
+                yield record.get('messageId'), inner
+        else:
+            yield record.get('s3', {}).get('object', {}).get('key'), record
+
+def process_record(record: Dict) -> bool:
+    """
+    Run one S3 record through its pipeline stage; never raises, returns whether it succeeded
+    """
+    try:
+        bucket = record['s3']['bucket']['name']
+        key = urllib.parse.unquote_plus(record['s3']['object']['key'], encoding='utf-8')
+        
+        if key.startswith(TRANSCRIPT_PREFIX):
+            return handle_transcript(bucket, key)
+        return handle_upload(bucket, key)
+    except Exception as e:
+        print(f"Error processing record: {str(e)}")
+        return False
+
+def handle_upload(bucket: str, key: str) -> bool:
+    """
+    Stage 1: start transcription for an uploaded audio file. Returns as soon as the job is queued.
+    """
+    print(f"Processing file: {key} from bucket: {bucket}")
+    
+    job_name = key.split('.')[0]  # Remove file extension
+    if not start_transcription_job(bucket, key, job_name):
+        print(f"Failed to transcribe {key}")
+        save_error_result(job_name, "Failed to transcribe audio")
+        return False
+    return True
 
-def start_transcription_job(bucket: str, key: str, job_name: str) -> str:
+def handle_transcript(bucket: str, key: str) -> bool:
     """
-    Start AWS Transcribe job and wait for completion
+    Stage 2: a finished transcript landed under transcripts/ - map it to signs and save the result.
+    """
+    if not key.endswith('.json'):
+        # e.g. the write-access check file Transcribe drops in the output location
+        print(f"Ignoring non-transcript object: {key}")
+        return True
+    
+    job_name = key[len(TRANSCRIPT_PREFIX):-len('.json')]
+    transcription_text = read_transcript(bucket, key)
+    
+    if transcription_text:
+        # Map text to sign language
+        sign_sequence = map_text_to_signs(transcription_text)
+        
+        # Save results to processed bucket
+        if not save_results(job_name, transcription_text, sign_sequence):
+            return False
+        
+        print(f"Successfully processed {job_name}")
+        return True
+    
+    print(f"Failed to transcribe {job_name}")
+    save_error_result(job_name, "Failed to transcribe audio")
+    return False
+
+def handle_transcription_state_change(detail: Dict):
+    """
+    A failed Transcribe job writes no transcript, so record the error from its state-change event.
+    """
+    job_name = detail.get('TranscriptionJobName')
+    if job_name and detail.get('TranscriptionJobStatus') == 'FAILED':
+        print(f"Transcription job {job_name} failed.")
+        save_error_result(job_name, detail.get('FailureReason') or "Failed to transcribe audio")
+
+def start_transcription_job(bucket: str, key: str, job_name: str) -> bool:
+    """
+    Start AWS Transcribe job. Its output goes to transcripts/<job_name>.json in the processed
+    bucket, which triggers handle_transcript - nothing waits for the job here.
     """
     try:
         # Generate S3 URI for the audio file
         s3_uri = f"s3://{bucket}/{key}"
         
         # Start the transcription job
-        transcribe_client.start_transcription_job(
+        get_transcribe_client().start_transcription_job(
             TranscriptionJobName=job_name,
             Media={'MediaFileUri': s3_uri},
             MediaFormat=key.split('.')[-1],  # Infer format from file extension
             LanguageCode='en-US',
             OutputBucketName=PROCESSED_BUCKET, # Store transcribe output in processed bucket
-            OutputKey=f"transcripts/{job_name}.json"
+            OutputKey=f"{TRANSCRIPT_PREFIX}{job_name}.json"
         )
 
         print(f"Started transcription job: {job_name}")
-
-        # Poll for job completion
-        while True:
-            status = transcribe_client.get_transcription_job(TranscriptionJobName=job_name)
-            job_status = status['TranscriptionJob']['TranscriptionJobStatus']
-            
-            if job_status in ['COMPLETED', 'FAILED']:
-                print(f"Transcription job {job_name} finished with status: {job_status}")
-                break
-            
-            print(f"Job {job_name} is still {job_status}... waiting.")
-            time.sleep(5) # Wait for 5 seconds before checking again
-
-        if job_status == 'COMPLETED':
-            # Get the transcript content
-            transcript_key = f"transcripts/{job_name}.json"
-            transcript_object = s3_client.get_object(Bucket=PROCESSED_BUCKET, Key=transcript_key)
-            transcript_content = json.loads(transcript_object['Body'].read().decode('utf-8'))
-            
-            # Extract the transcribed text
-            transcription_text = transcript_content['results']['transcripts'][0]['transcript']
-            return transcription_text
-        else:
-            print(f"Transcription job {job_name} failed.")
-            return None
+        return True
         
+    except get_transcribe_client().exceptions.ConflictException:
+        # S3 redelivered the upload event; the job from the first delivery is already running
+        print(f"Transcription job {job_name} already exists")
+        return True
     except Exception as e:
         print(f"Error in transcription: {str(e)}")
+        return False
+
+def read_transcript(bucket: str, key: str) -> str:
+    """
+    Read the transcribed text out of a Transcribe output JSON
+    """
+    try:
+        transcript_object = get_s3_client().get_object(Bucket=bucket, Key=key)
+        transcript_content = json.loads(transcript_object['Body'].read().decode('utf-8'))
+        
+        # Extract the transcribed text
+        return transcript_content['results']['transcripts'][0]['transcript']
+        
+    except Exception as e:
+        print(f"Error reading transcript {key}: {str(e)}")
         return None
 
 def map_text_to_signs(text: str) -> List[Dict]:
     """
     Advanced greedy phrase-first mapping algorithm
-    Matches the longest possible phrases first, then falls back to individual words
+    Matches the longest possible phrases first (via the token trie), then falls back to individual words
     """
     words = text.lower().split()
     sign_sequence = []
-    i = 0
     
-    while i < len(words):
-        matched = False
-        
-        # Try to match phrases starting from current position
-        # SORTED_SIGN_KEYS is already sorted by length (longest first)
-        for phrase_key in SORTED_SIGN_KEYS:
-            phrase_words = phrase_key.split()
-            phrase_length = len(phrase_words)
-            
-            # Check if we have enough words left to match this phrase
-            if i + phrase_length <= len(words):
-                # Check if the words match the phrase
-                text_slice = words[i:i + phrase_length]
-                if text_slice == phrase_words:
-                    # Found a match!
-                    sign_sequence.append({
-                        'word': phrase_key,
-                        'original_words': text_slice,
-                        'image_url': SIGN_MAPPING[phrase_key],
-                        'phrase_length': phrase_length
-                    })
-                    i += phrase_length  # Skip ahead by the length of the matched phrase
-                    matched = True
-                    break
-        
-        if not matched:
-            # No phrase matched, treat as unknown word
-            unknown_word = words[i]
-            clean_word = ''.join(char for char in unknown_word if char.isalnum())
-            sign_sequence.append({
-                'word': clean_word,
-                'original_words': [unknown_word],
-                'image_url': 'https://via.placeholder.com/200x200/9E9E9E/white?text=?',
-                'phrase_length': 1
-            })
-            i += 1  # Move to next word
+    for key, original_words, matched in segment_words(words, SIGN_LEXICON):
+        sign_sequence.append({
+            'word': key,
+            'original_words': original_words,
+            # Unknown words get the generic placeholder
+            'image_url': SIGN_LEXICON[key] if matched else 'https://via.placeholder.com/200x200/9E9E9E/white?text=?',
+            'phrase_length': len(original_words)
+        })
     
     return sign_sequence
 
-def save_results(job_name: str, transcribed_text: str, sign_sequence: List[Dict]):
+def save_results(job_name: str, transcribed_text: str, sign_sequence: List[Dict]) -> bool:
     """
     Save processing results to S3
     """
@@ -237,7 +256,7 @@ def save_results(job_name: str, transcribed_text: str, sign_sequence: List[Dict]
         }
         
         # Upload result to processed bucket
-        s3_client.put_object(
+        get_s3_client().put_object(
             Bucket=PROCESSED_BUCKET,
             Key=f"{job_name}_result.json",
             Body=json.dumps(result),
@@ -245,10 +264,12 @@ def save_results(job_name: str, transcribed_text: str, sign_sequence: List[Dict]
         )
         
         print(f"Results saved for job: {job_name}")
+        return True
         
     except Exception as e:
         print(f"Error saving results: {str(e)}")
         save_error_result(job_name, str(e))
+        return False
 
 def save_error_result(job_name: str, error_message: str):
     """
@@ -262,7 +283,7 @@ def save_error_result(job_name: str, error_message: str):
             'timestamp': context.aws_request_id if 'context' in globals() else 'test'
         }
         
-        s3_client.put_object(
+        get_s3_client().put_object(
             Bucket=PROCESSED_BUCKET,
             Key=f"{job_name}_result.json",
             Body=json.dumps(result),
@@ -274,15 +295,18 @@ def save_error_result(job_name: str, error_message: str):
 
 # For local testing
 if __name__ == "__main__":
-    # Test the function locally
-    test_event = {
-        'Records': [{
-            's3': {
-                'bucket': {'name': 'test-bucket'},
-                'object': {'key': 'test_hello.wav'}
-            }
-        }]
-    }
+    # Run both stages against in-memory stand-ins for S3 and Transcribe
+    from local_aws import LocalS3, LocalTranscribe
+    
+    s3_client = LocalS3()
+    transcribe_client = LocalTranscribe(s3_client, transcript="hello world thank you very much")
+    s3_client.put_object(Bucket='test-bucket', Key='test_hello.wav', Body=b'RIFF')
+    
+    # Stage 1: the upload event only starts the job
+    print(lambda_handler(s3_client.event('test-bucket', 'test_hello.wav'), None))
+    
+    # Stage 2: the stand-in "finishes" the job, which writes transcripts/test_hello.json
+    for transcript_event in transcribe_client.complete_jobs():
+        print(lambda_handler(transcript_event, None))
     
-    result = lambda_handler(test_event, None)
-    print(result)
+    print(json.loads(s3_client.get_object(Bucket=PROCESSED_BUCKET, Key='test_hello_result.json')['Body'].read()))
@@ -0,0 +1,138 @@
+"""
+In-memory stand-ins for the S3 and Transcribe clients used by lambda_function.py.
+
+They implement just the calls the Lambda makes and produce the events AWS
+would deliver, so both pipeline stages can be exercised locally:
+
+    s3 = LocalS3()
+    transcribe = LocalTranscribe(s3, transcript="hello world")
+    lambda_function.s3_client, lambda_function.transcribe_client = s3, transcribe
+    lambda_function.lambda_handler(s3.event('upload-bucket', 'job.wav'), None)   # starts the job
+    for event in transcribe.complete_jobs():                                      # transcript lands
+        lambda_function.lambda_handler(event, None)
+"""
+
+import io
+import json
+import urllib.parse
+
+
+class _Exceptions:
+    class ClientError(Exception):
+        pass
+
+    class NoSuchKey(ClientError):
+        pass
+
+    class ConflictException(ClientError):
+        pass
+
+
+class LocalS3:
+    """Dict-backed S3 client: put_object / get_object / head_object / upload_file(obj)."""
+
+    exceptions = _Exceptions
+
+    def __init__(self):
+        self.objects = {}  # (bucket, key) -> bytes
+
+    def put_object(self, Bucket, Key, Body=b'', **kwargs):
+        if isinstance(Body, str):
+            Body = Body.encode('utf-8')
+        elif not isinstance(Body, (bytes, bytearray)):
+            Body = Body.read()
+        self.objects[(Bucket, Key)] = bytes(Body)
+        return {}
+
+    def upload_fileobj(self, Fileobj, Bucket, Key, ExtraArgs=None, Config=None, **kwargs):
+        self.put_object(Bucket=Bucket, Key=Key, Body=Fileobj.read())
+
+    def upload_file(self, Filename, Bucket, Key, ExtraArgs=None, Config=None, **kwargs):
+        with open(Filename, 'rb') as f:
+            self.put_object(Bucket=Bucket, Key=Key, Body=f.read())
+
+    def get_object(self, Bucket, Key, **kwargs):
+        if (Bucket, Key) not in self.objects:
+            raise self.exceptions.NoSuchKey(f"s3://{Bucket}/{Key}")
+        data = self.objects[(Bucket, Key)]
+        return {'Body': io.BytesIO(data), 'ContentLength': len(data)}
+
+    def head_object(self, Bucket, Key, **kwargs):
+        if (Bucket, Key) not in self.objects:
+            raise self.exceptions.NoSuchKey(f"s3://{Bucket}/{Key}")
+        return {'ContentLength': len(self.objects[(Bucket, Key)])}
+
+    @staticmethod
+    def event(bucket, *keys):
+        """The ObjectCreated notification S3 would send for `keys`."""
+        return {'Records': [
+            {
+                'eventSource': 'aws:s3',
+                'eventName': 'ObjectCreated:Put',
+                's3': {'bucket': {'name': bucket}, 'object': {'key': urllib.parse.quote_plus(key)}},
+            }
+            for key in keys
+        ]}
+
+
+class LocalTranscribe:
+    """Transcribe client whose jobs finish when complete_jobs() is called.
+
+    `transcript` is the text every job produces, or a callable taking the
+    media URI and returning the text (None makes that job fail).
+    """
+
+    exceptions = _Exceptions
+
+    def __init__(self, s3: LocalS3, transcript="hello world"):
+        self.s3 = s3
+        self.transcript = transcript
+        self.jobs = {}
+
+    def start_transcription_job(self, TranscriptionJobName, Media, MediaFormat, LanguageCode,
+                                OutputBucketName, OutputKey=None, **kwargs):
+        if TranscriptionJobName in self.jobs:
+            raise self.exceptions.ConflictException(f"job {TranscriptionJobName} already exists")
+        self.jobs[TranscriptionJobName] = {
+            'TranscriptionJobName': TranscriptionJobName,
+            'TranscriptionJobStatus': 'IN_PROGRESS',
+            'Media': Media,
+            'MediaFormat': MediaFormat,
+            'LanguageCode': LanguageCode,
+            'OutputBucketName': OutputBucketName,
+            'OutputKey': OutputKey or f"{TranscriptionJobName}.json",
+        }
+        return {'TranscriptionJob': dict(self.jobs[TranscriptionJobName])}
+
+    def get_transcription_job(self, TranscriptionJobName):
+        return {'TranscriptionJob': dict(self.jobs[TranscriptionJobName])}
+
+    def complete_jobs(self):
+        """Finish every running job; returns the S3 / EventBridge events AWS would emit."""
+        events = []
+        for job in self.jobs.values():
+            if job['TranscriptionJobStatus'] != 'IN_PROGRESS':
+                continue
+            text = self.transcript(job['Media']['MediaFileUri']) if callable(self.transcript) else self.transcript
+            if text is None:
+                job['TranscriptionJobStatus'] = 'FAILED'
+                job['FailureReason'] = 'Stand-in transcription failure'
+                events.append({
+                    'source': 'aws.transcribe',
+                    'detail-type': 'Transcribe Job State Change',
+                    'detail': {
+                        'TranscriptionJobName': job['TranscriptionJobName'],
+                        'TranscriptionJobStatus': 'FAILED',
+                        'FailureReason': job['FailureReason'],
+                    },
+                })
+                continue
+            output = {
+                'jobName': job['TranscriptionJobName'],
+                'status': 'COMPLETED',
+                'results': {'transcripts': [{'transcript': text}], 'items': []},
+            }
+            self.s3.put_object(Bucket=job['OutputBucketName'], Key=job['OutputKey'], Body=json.dumps(output))
+            job['TranscriptionJobStatus'] = 'COMPLETED'
+            events.append(LocalS3.event(job['OutputBucketName'], job['OutputKey']))
+        return events
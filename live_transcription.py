@@ -0,0 +1,150 @@
+"""
+Live transcription of audio streamed from the browser.
+
+The browser's MediaRecorder emits small encoded chunks (WebM/Opus, Ogg or
+fragmented MP4) while the user is still speaking. A LiveTranscriber pipes
+those chunks into one long-running ffmpeg process and feeds the PCM it
+produces to a single KaldiRecognizer held for the whole session, so
+recognition keeps pace with the speaker instead of starting once the
+recording ends.
+
+Recognizer output is turned into events for the caller to forward:
+
+    {'type': 'partial', 'text': ...}              hypothesis for the current utterance
+    {'type': 'final', 'text': ..., 'words': [...]}  an utterance ended (the speaker paused)
+    {'type': 'error', 'message': ...}
+    {'type': 'end'}                               no more events will follow
+"""
+
+import json
+import queue
+import threading
+
+from vosk_engine import SAMPLE_RATE, decode_pcm
+
+_CLOSED = object()
+
+
+class ChunkStream:
+    """Read-only file object over chunks pushed from another thread.
+
+    read() blocks until a chunk arrives and returns b'' once the stream is closed.
+    At most `max_chunks` chunks are buffered; push() waits for room, so a slow
+    decoder holds back the sender instead of growing memory.
+    """
+
+    def __init__(self, max_chunks: int = 64):
+        self._queue = queue.Queue(maxsize=max_chunks)
+        self._closed = False
+
+    def push(self, chunk: bytes, timeout: float = None) -> bool:
+        """Queue a chunk; False if the stream is closed or no room freed up within `timeout`."""
+        if self._closed:
+            return False
+        try:
+            self._queue.put(bytes(chunk), timeout=timeout)
+            return True
+        except queue.Full:
+            return False
+
+    def close(self):
+        self._closed = True
+        try:
+            self._queue.put_nowait(_CLOSED)  # wake a blocked reader; if the queue is full it polls
+        except queue.Full:
+            pass
+
+    def read(self, size: int = -1) -> bytes:
+        while True:
+            try:
+                chunk = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                if self._closed:
+                    return b''
+                continue
+            if chunk is _CLOSED:
+                return b''
+            return chunk
+
+
+class LiveTranscriber:
+    """One live session: push() encoded chunks in, poll() recognizer events out."""
+
+    def __init__(self, registry, max_buffered_chunks: int = 64):
+        self.registry = registry
+        self._stream = ChunkStream(max_buffered_chunks)
+        self._events = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='live-transcriber', daemon=True)
+        self.finished = False
+
+    def start(self) -> 'LiveTranscriber':
+        self._thread.start()
+        return self
+
+    def push(self, chunk: bytes) -> bool:
+        """Feed one encoded chunk; False once recognition has stopped (the chunk is dropped)."""
+        while self._thread.is_alive():
+            if self._stream.push(chunk, timeout=0.5):
+                return True
+        return False
+
+    def finish(self):
+        """No more audio: the recognizer drains what it has and emits the last final event."""
+        self._stream.close()
+
+    def poll(self, timeout: float = 0) -> list:
+        """Events produced so far; waits up to `timeout` seconds for the first one."""
+        events = []
+        try:
+            events.append(self._events.get(timeout=timeout) if timeout else self._events.get_nowait())
+            while True:
+                events.append(self._events.get_nowait())
+        except queue.Empty:
+            pass
+        return events
+
+    def close(self, timeout: float = 5):
+        """End the session and wait for the recognizer thread to exit."""
+        self._stream.close()
+        self._thread.join(timeout)
+
+    def _emit_final(self, result: dict):
+        text = result.get('text', '').strip()
+        if text:
+            self._events.put({'type': 'final', 'text': text, 'words': result.get('result', [])})
+
+    def _run(self):
+        try:
+            with self.registry.recognizer(SAMPLE_RATE) as rec:
+                if rec is None:
+                    self._events.put({'type': 'error', 'message': 'Speech model is not available on this server.'})
+                    return
+                # No content type: always pipe, since every MediaRecorder format can be decoded as a stream
+                with decode_pcm(self._stream) as chunks:
+                    try:
+                        last_partial = ''
+                        for chunk in chunks:
+                            if rec.AcceptWaveform(chunk):
+                                self._emit_final(json.loads(rec.Result()))
+                                last_partial = ''
+                            else:
+                                partial = json.loads(rec.PartialResult()).get('partial', '').strip()
+                                if partial != last_partial:
+                                    self._events.put({'type': 'partial', 'text': partial})
+                                    last_partial = partial
+                    finally:
+                        self._stream.close()  # let the ffmpeg feeder thread finish if we stopped early
+                self._emit_final(json.loads(rec.FinalResult()))
+        except FileNotFoundError as e:
+            print(f"[live] ffmpeg not found: {e}")
+            self._events.put({'type': 'error', 'message': 'Audio decoder (ffmpeg) is not available on this server.'})
+        except RuntimeError as e:
+            print(f"[live] ffmpeg failed to decode the stream: {e}")
+            self._events.put({'type': 'error', 'message': 'Could not decode the audio stream.'})
+        except Exception as e:
+            print(f"[live] Recognition failed: {e}")
+            self._events.put({'type': 'error', 'message': 'Live transcription failed.'})
+        finally:
+            self._stream.close()
+            self.finished = True
+            self._events.put({'type': 'end'})
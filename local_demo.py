@@ -10,9 +10,13 @@ import uuid
 import time
 import json
 import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin
 from werkzeug.utils import secure_filename
+from signbsl_cache import SignLookupCache, MISS as CACHE_MISS
+from signbsl_resolver import SignResolver
+import http_client
+from signbsl_lookup import read_video_url
+from phrase_trie import segment_words
+from sign_lexicon import load_lexicon
 
 app = Flask(__name__)
 app.secret_key = 'demo-secret-key'
@@ -25,92 +29,12 @@ ALLOWED_EXTENSIONS = {'wav', 'mp3', 'mp4', 'm4a', 'flac'}
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 os.makedirs(RESULTS_FOLDER, exist_ok=True)
 
-# Enhanced sign language mapping with phrases and individual words
-# Inspired by signbsl.com structure - phrases take priority over individual words
-SIGN_MAPPING = {
-    # Multi-word phrases (these will be matched first due to greedy algorithm)
-    'thank you very much': 'https://via.placeholder.com/200x200/4CAF50/white?text=THANK+YOU+VERY+MUCH',
-    'how are you': 'https://via.placeholder.com/200x200/2196F3/white?text=HOW+ARE+YOU',
-    'nice to meet you': 'https://via.placeholder.com/200x200/9C27B0/white?text=NICE+TO+MEET+YOU',
-    'good morning': 'https://via.placeholder.com/200x200/FF9800/white?text=GOOD+MORNING',
-    'good afternoon': 'https://via.placeholder.com/200x200/FFC107/black?text=GOOD+AFTERNOON',
-    'good evening': 'https://via.placeholder.com/200x200/673AB7/white?text=GOOD+EVENING',
-    'good night': 'https://via.placeholder.com/200x200/424242/white?text=GOOD+NIGHT',
-    'thank you': 'https://via.placeholder.com/200x200/4CAF50/white?text=THANK+YOU',
-    'excuse me': 'https://via.placeholder.com/200x200/FF5722/white?text=EXCUSE+ME',
-    'i am': 'https://via.placeholder.com/200x200/607D8B/white?text=I+AM',
-    'you are': 'https://via.placeholder.com/200x200/795548/white?text=YOU+ARE',
-    'my name': 'https://via.placeholder.com/200x200/009688/white?text=MY+NAME',
-    'what is': 'https://via.placeholder.com/200x200/3F51B5/white?text=WHAT+IS',
-    'how much': 'https://via.placeholder.com/200x200/E91E63/white?text=HOW+MUCH',
-    'where is': 'https://via.placeholder.com/200x200/8BC34A/white?text=WHERE+IS',
-    'see you later': 'https://via.placeholder.com/200x200/FF9800/white?text=SEE+YOU+LATER',
-    'have a nice day': 'https://via.placeholder.com/200x200/4CAF50/white?text=HAVE+NICE+DAY',
-    
-    # Two-word combinations
-    'very much': 'https://via.placeholder.com/200x200/9E9E9E/white?text=VERY+MUCH',
-    'very good': 'https://via.placeholder.com/200x200/4CAF50/white?text=VERY+GOOD',
-    'please help': 'https://via.placeholder.com/200x200/FF5722/white?text=PLEASE+HELP',
-    'hello world': 'https://via.placeholder.com/200x200/2196F3/white?text=HELLO+WORLD',
-    
-    # Individual words (fallback when no phrases match)
-    'hello': 'https://via.placeholder.com/200x200/4CAF50/white?text=HELLO',
-    'world': 'https://via.placeholder.com/200x200/2196F3/white?text=WORLD',
-    'thank': 'https://via.placeholder.com/200x200/FF9800/white?text=THANK',
-    'you': 'https://via.placeholder.com/200x200/9C27B0/white?text=YOU',
-    'please': 'https://via.placeholder.com/200x200/607D8B/white?text=PLEASE',
-    'sorry': 'https://via.placeholder.com/200x200/F44336/white?text=SORRY',
-    'yes': 'https://via.placeholder.com/200x200/4CAF50/white?text=YES',
-    'no': 'https://via.placeholder.com/200x200/F44336/white?text=NO',
-    'good': 'https://via.placeholder.com/200x200/4CAF50/white?text=GOOD',
-    'morning': 'https://via.placeholder.com/200x200/FF9800/white?text=MORNING',
-    'afternoon': 'https://via.placeholder.com/200x200/FFC107/black?text=AFTERNOON',
-    'evening': 'https://via.placeholder.com/200x200/673AB7/white?text=EVENING',
-    'night': 'https://via.placeholder.com/200x200/424242/white?text=NIGHT',
-    'help': 'https://via.placeholder.com/200x200/FF5722/white?text=HELP',
-    'water': 'https://via.placeholder.com/200x200/2196F3/white?text=WATER',
-    'food': 'https://via.placeholder.com/200x200/FF9800/white?text=FOOD',
-    'home': 'https://via.placeholder.com/200x200/795548/white?text=HOME',
-    'work': 'https://via.placeholder.com/200x200/607D8B/white?text=WORK',
-    'family': 'https://via.placeholder.com/200x200/E91E63/white?text=FAMILY',
-    'friend': 'https://via.placeholder.com/200x200/9C27B0/white?text=FRIEND',
-    'love': 'https://via.placeholder.com/200x200/E91E63/white?text=LOVE',
-    'happy': 'https://via.placeholder.com/200x200/FFEB3B/black?text=HAPPY',
-    'sad': 'https://via.placeholder.com/200x200/3F51B5/white?text=SAD',
-    'name': 'https://via.placeholder.com/200x200/009688/white?text=NAME',
-    'time': 'https://via.placeholder.com/200x200/795548/white?text=TIME',
-    'today': 'https://via.placeholder.com/200x200/4CAF50/white?text=TODAY',
-    'tomorrow': 'https://via.placeholder.com/200x200/2196F3/white?text=TOMORROW',
-    'yesterday': 'https://via.placeholder.com/200x200/9E9E9E/white?text=YESTERDAY',
-    'very': 'https://via.placeholder.com/200x200/795548/white?text=VERY',
-    'much': 'https://via.placeholder.com/200x200/607D8B/white?text=MUCH',
-    'how': 'https://via.placeholder.com/200x200/FF9800/white?text=HOW',
-    'what': 'https://via.placeholder.com/200x200/9C27B0/white?text=WHAT',
-    'where': 'https://via.placeholder.com/200x200/4CAF50/white?text=WHERE',
-    'when': 'https://via.placeholder.com/200x200/2196F3/white?text=WHEN',
-    'why': 'https://via.placeholder.com/200x200/F44336/white?text=WHY',
-    'nice': 'https://via.placeholder.com/200x200/4CAF50/white?text=NICE',
-    'meet': 'https://via.placeholder.com/200x200/FF9800/white?text=MEET',
-    'see': 'https://via.placeholder.com/200x200/2196F3/white?text=SEE',
-    'later': 'https://via.placeholder.com/200x200/607D8B/white?text=LATER',
-    'day': 'https://via.placeholder.com/200x200/FFEB3B/black?text=DAY',
-    'have': 'https://via.placeholder.com/200x200/9C27B0/white?text=HAVE',
-    'is': 'https://via.placeholder.com/200x200/795548/white?text=IS',
-    'am': 'https://via.placeholder.com/200x200/4CAF50/white?text=AM',
-    'are': 'https://via.placeholder.com/200x200/2196F3/white?text=ARE',
-    'my': 'https://via.placeholder.com/200x200/FF5722/white?text=MY',
-    'your': 'https://via.placeholder.com/200x200/9E9E9E/white?text=YOUR',
-    'i': 'https://via.placeholder.com/200x200/E91E63/white?text=I',
-    'me': 'https://via.placeholder.com/200x200/673AB7/white?text=ME',
-    'we': 'https://via.placeholder.com/200x200/3F51B5/white?text=WE',
-    'they': 'https://via.placeholder.com/200x200/009688/white?text=THEY'
-}
-
-# Pre-sorted keys for efficient phrase-first matching
-SORTED_SIGN_KEYS = sorted(SIGN_MAPPING.keys(), key=lambda x: len(x.split()), reverse=True)
+# Phrase lexicon (placeholder image per word/phrase), compiled from lexicon/signs.json and
+# shared with app.py and the Lambda - phrases take priority over individual words
+SIGN_LEXICON = load_lexicon()
 
-# Cache for SignBSL.com video URLs to avoid repeated requests
-SIGNBSL_CACHE = {}
+# Cache for SignBSL.com video URLs to avoid repeated requests (shared on-disk store + in-process LRU)
+SIGNBSL_CACHE = SignLookupCache(os.getenv('SIGNBSL_CACHE_PATH') or None)
 
 def fetch_signbsl_video_url(word_or_phrase):
     """
@@ -118,8 +42,9 @@ def fetch_signbsl_video_url(word_or_phrase):
     """
     # Check cache first
     cache_key = word_or_phrase.lower().replace(' ', '-')
-    if cache_key in SIGNBSL_CACHE:
-        return SIGNBSL_CACHE[cache_key]
+    cached = SIGNBSL_CACHE.get(cache_key)
+    if cached is not CACHE_MISS:
+        return cached
     
     try:
         # Construct URL for SignBSL.com
@@ -127,73 +52,41 @@ def fetch_signbsl_video_url(word_or_phrase):
         formatted_word = word_or_phrase.lower().replace(' ', '-')
         signbsl_url = f"https://www.signbsl.com/sign/{formatted_word}"
         
-        # Set headers to mimic a browser request
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
-        }
-        
-        # Make request with timeout
-        response = requests.get(signbsl_url, headers=headers, timeout=10)
+        # Make request through the shared keep-alive pool (browser-like headers, connect/read timeouts)
+        response = http_client.get(signbsl_url, stream=True)
         
         if response.status_code == 200:
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Look for video elements in various formats
-            video_url = None
-            
-            # Try to find video tags
-            video_tag = soup.find('video')
-            if video_tag:
-                source = video_tag.find('source')
-                if source and source.get('src'):
-                    video_url = urljoin(signbsl_url, source.get('src'))
-                elif video_tag.get('src'):
-                    video_url = urljoin(signbsl_url, video_tag.get('src'))
-            
-            # Try to find iframe embeds (YouTube, Vimeo, etc.)
-            if not video_url:
-                iframe = soup.find('iframe')
-                if iframe and iframe.get('src'):
-                    iframe_src = iframe.get('src')
-                    # Check if it's a video embed
-                    if any(domain in iframe_src for domain in ['youtube.com', 'vimeo.com', 'player.vimeo.com']):
-                        video_url = iframe_src
-            
-            # Try to find any media elements with video-related URLs
-            if not video_url:
-                # Look for any links or sources that might contain video URLs
-                for element in soup.find_all(['a', 'source', 'embed']):
-                    href_or_src = element.get('href') or element.get('src')
-                    if href_or_src and any(ext in href_or_src.lower() for ext in ['.mp4', '.webm', '.ogv', 'video']):
-                        video_url = urljoin(signbsl_url, href_or_src)
-                        break
+            # Stream the page through the incremental extractor: <video>/<source> first, then
+            # YouTube/Vimeo iframes, then any link that looks like a video; stops at the first hit
+            video_url = read_video_url(response, signbsl_url, embeds=True)
             
             # If we found a video URL, cache and return it
             if video_url:
-                SIGNBSL_CACHE[cache_key] = video_url
+                SIGNBSL_CACHE.put_found(cache_key, video_url)
                 print(f"✅ Found SignBSL video for '{word_or_phrase}': {video_url}")
                 return video_url
             else:
                 # No video found, cache the failure
                 print(f"⚠️ No video found for '{word_or_phrase}' on SignBSL.com")
-                SIGNBSL_CACHE[cache_key] = None
+                SIGNBSL_CACHE.put_not_found(cache_key)
                 return None
         else:
+            response.close()
             print(f"⚠️ SignBSL.com returned status {response.status_code} for '{word_or_phrase}'")
-            SIGNBSL_CACHE[cache_key] = None
+            if response.status_code in (404, 410):
+                SIGNBSL_CACHE.put_not_found(cache_key)
+            else:
+                # 429 / 5xx: transient, only cached briefly
+                SIGNBSL_CACHE.put_error(cache_key)
             return None
             
     except requests.exceptions.RequestException as e:
         print(f"❌ Error fetching from SignBSL.com for '{word_or_phrase}': {str(e)}")
-        SIGNBSL_CACHE[cache_key] = None
+        SIGNBSL_CACHE.put_error(cache_key)
         return None
     except Exception as e:
         print(f"❌ Unexpected error for '{word_or_phrase}': {str(e)}")
-        SIGNBSL_CACHE[cache_key] = None
+        SIGNBSL_CACHE.put_error(cache_key)
         return None
 
 def get_sign_url(word_or_phrase):
@@ -206,8 +99,9 @@ def get_sign_url(word_or_phrase):
         return signbsl_url
     
     # Fall back to our placeholder mapping
-    if word_or_phrase in SIGN_MAPPING:
-        return SIGN_MAPPING[word_or_phrase]
+    placeholder = SIGN_LEXICON.get(word_or_phrase)
+    if placeholder:
+        return placeholder
     
     # Default fallback
     return 'https://via.placeholder.com/200x200/9E9E9E/white?text=?'
@@ -235,56 +129,39 @@ def mock_transcription(filename):
     else:
         return "hello world good morning thank you very much how are you"
 
+def peek_signbsl_cache(word_or_phrase):
+    return SIGNBSL_CACHE.get(word_or_phrase.lower().replace(' ', '-'))
+
+# Resolves every distinct word/phrase of a sentence at once; cache misses are fetched in parallel
+SIGN_RESOLVER = SignResolver(
+    fetch_signbsl_video_url,
+    peek=peek_signbsl_cache,
+    max_workers=int(os.getenv('SIGNBSL_LOOKUP_WORKERS', '8')),
+)
+
 def map_text_to_signs_greedy(text):
     """
     Advanced greedy phrase-first mapping algorithm
-    Matches the longest possible phrases first, then falls back to individual words
+    Matches the longest possible phrases first, then falls back to individual words.
+    The whole sentence is segmented first, then every distinct phrase/word is
+    resolved in one concurrent batch before the sequence is assembled.
     """
     words = text.lower().split()
-    sign_sequence = []
-    i = 0
+    segments = segment_words(words, SIGN_LEXICON)
     
-    while i < len(words):
-        matched = False
-        
-        # Try to match phrases starting from current position
-        # SORTED_SIGN_KEYS is already sorted by length (longest first)
-        for phrase_key in SORTED_SIGN_KEYS:
-            phrase_words = phrase_key.split()
-            phrase_length = len(phrase_words)
-            
-            # Check if we have enough words left to match this phrase
-            if i + phrase_length <= len(words):
-                # Check if the words match the phrase
-                text_slice = words[i:i + phrase_length]
-                if text_slice == phrase_words:
-                    # Found a match!
-                    sign_url = get_sign_url(phrase_key)
-                    sign_sequence.append({
-                        'word': phrase_key,
-                        'original_words': text_slice,
-                        'image_url': sign_url,
-                        'phrase_length': phrase_length,
-                        'source': 'signbsl' if 'signbsl.com' in sign_url else 'placeholder'
-                    })
-                    i += phrase_length  # Skip ahead by the length of the matched phrase
-                    matched = True
-                    break
-        
-        if not matched:
-            # No phrase matched, try individual word
-            unknown_word = words[i]
-            clean_word = ''.join(char for char in unknown_word if char.isalnum())
-            sign_url = get_sign_url(clean_word)
-            
-            sign_sequence.append({
-                'word': clean_word,
-                'original_words': [unknown_word],
-                'image_url': sign_url,
-                'phrase_length': 1,
-                'source': 'signbsl' if 'signbsl.com' in sign_url else 'placeholder'
-            })
-            i += 1  # Move to next word
+    video_urls = SIGN_RESOLVER.resolve(key for key, _, _ in segments)
+    
+    sign_sequence = []
+    for key, original_words, _ in segments:
+        # Same precedence as get_sign_url: SignBSL video, then placeholder mapping, then default
+        sign_url = video_urls[key] or SIGN_LEXICON.get(key) or 'https://via.placeholder.com/200x200/9E9E9E/white?text=?'
+        sign_sequence.append({
+            'word': key,
+            'original_words': original_words,
+            'image_url': sign_url,
+            'phrase_length': len(original_words),
+            'source': 'signbsl' if 'signbsl.com' in sign_url else 'placeholder'
+        })
     
     return sign_sequence
 
@@ -0,0 +1,122 @@
+"""
+Token trie for greedy phrase-first sign matching.
+
+The original matcher tried every lexicon key at every word position, so its
+cost grew with the size of the vocabulary. The trie walks forward from each
+position only as far as the lexicon has phrases sharing that prefix and keeps
+the longest complete phrase seen, which gives exactly the same segmentation
+(longest match first, left to right) in one pass over the text.
+
+StreamingSegmenter produces the same segmentation incrementally, for words
+that arrive one at a time.
+"""
+
+_END = object()  # node key under which a complete phrase's lexicon key is stored
+
+
+class PhraseTrie:
+    """Maps token sequences (lexicon keys split on whitespace) to their lexicon key."""
+
+    def __init__(self, phrases=()):
+        self._root = {}
+        self.max_phrase_length = 0
+        for phrase in phrases:
+            self.add(phrase)
+
+    def add(self, phrase_key: str) -> None:
+        tokens = phrase_key.split()
+        if not tokens:
+            return
+        node = self._root
+        for token in tokens:
+            node = node.setdefault(token, {})
+        # Keys that split to the same tokens: the first one added wins, as with the old sorted scan
+        node.setdefault(_END, phrase_key)
+        self.max_phrase_length = max(self.max_phrase_length, len(tokens))
+
+    def longest_match(self, words, start: int = 0):
+        """Return (phrase_key, length) of the longest phrase starting at words[start], or (None, 0)."""
+        node = self._root
+        best_key, best_length = None, 0
+        for i in range(start, len(words)):
+            node = node.get(words[i])
+            if node is None:
+                break
+            key = node.get(_END)
+            if key is not None:
+                best_key, best_length = key, i - start + 1
+        return best_key, best_length
+
+    def can_extend(self, words, start: int = 0) -> bool:
+        """True if words[start:] is a proper prefix of a lexicon phrase, i.e. more words could give a longer match."""
+        node = self._root
+        for i in range(start, len(words)):
+            node = node.get(words[i])
+            if node is None:
+                return False
+        return any(token is not _END for token in node)
+
+
+def clean_word(word: str) -> str:
+    return ''.join(char for char in word if char.isalnum())
+
+
+def segment_words(words, trie: PhraseTrie):
+    """Greedy longest-match segmentation of already-lowercased `words`.
+
+    Returns a list of (key, original_words, matched): `key` is the lexicon key
+    for matched phrases/words, or the alphanumeric-cleaned word otherwise.
+    """
+    segments = []
+    i = 0
+    while i < len(words):
+        key, length = trie.longest_match(words, i)
+        if key is not None:
+            segments.append((key, words[i:i + length], True))
+            i += length
+        else:
+            segments.append((clean_word(words[i]), [words[i]], False))
+            i += 1
+    return segments
+
+
+class StreamingSegmenter:
+    """segment_words() for words that arrive one at a time (from a recognizer or a text stream).
+
+    A segment is emitted as soon as no longer phrase can still match at its start,
+    so at most max_phrase_length words are ever held back. Concatenating everything
+    push()/extend() and finish() return gives exactly segment_words(all_words, trie).
+    Works with a PhraseTrie or a compiled SignLexicon.
+    """
+
+    def __init__(self, trie):
+        self.trie = trie
+        self.pending = []  # words received but not yet segmented
+
+    def push(self, word: str):
+        """Add one already-lowercased word; returns the segments it completed (possibly none)."""
+        self.pending.append(word)
+        return self._drain(final=False)
+
+    def extend(self, words):
+        segments = []
+        for word in words:
+            segments.extend(self.push(word))
+        return segments
+
+    def finish(self):
+        """End of stream: segment whatever is still held back and reset for the next stream."""
+        return self._drain(final=True)
+
+    def _drain(self, final: bool):
+        segments = []
+        while self.pending and (final or not self.trie.can_extend(self.pending)):
+            # The match at pending[0] cannot grow any more, so it is the one segment_words would pick
+            key, length = self.trie.longest_match(self.pending)
+            if key is not None:
+                segments.append((key, self.pending[:length], True))
+            else:
+                length = 1
+                segments.append((clean_word(self.pending[0]), self.pending[:1], False))
+            del self.pending[:length]
+        return segments
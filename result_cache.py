@@ -0,0 +1,155 @@
+"""
+Local cache of completed job results.
+
+A completed result in the processed bucket never changes, yet every
+/status/<job_id> poll and results-page load used to fetch and parse it from
+S3 again. ResultCache keeps the serialized JSON of completed results:
+
+  - in a byte-bounded in-process LRU, and
+  - optionally in a byte-bounded directory on local disk, shared by every
+    worker on the host and kept across restarts.
+
+Results this process writes go in as they are stored in S3 (write-through);
+results read from S3 go in on the first read (read-through). Error results
+are never cached, because the local fallback may still replace them.
+Entries are the raw JSON bytes, so a hit can be sent to the client without
+parsing it again.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+
+class ResultCache:
+    """Byte-bounded LRU of result JSON, with an optional on-disk second tier."""
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024, disk_dir: str = None, disk_max_bytes: int = 256 * 1024 * 1024):
+        self.max_bytes = max(0, max_bytes)
+        self.disk_dir = disk_dir or None
+        self.disk_max_bytes = max(0, disk_max_bytes)
+        self._lru = OrderedDict()  # job_id -> bytes
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._disk_bytes = 0
+        self._counters = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0, 'disk_evictions': 0}
+        if self.disk_dir:
+            try:
+                os.makedirs(self.disk_dir, exist_ok=True)
+                self._disk_bytes = sum(entry.stat().st_size for entry in os.scandir(self.disk_dir)
+                                       if entry.name.endswith('.json'))
+            except OSError as e:
+                print(f"[result-cache] Disk tier disabled ({self.disk_dir}): {e}")
+                self.disk_dir = None
+
+    def _disk_path(self, job_id: str) -> str:
+        # Job ids come from URLs; hash them so they can never name a path outside the cache directory
+        return os.path.join(self.disk_dir, hashlib.sha1(job_id.encode('utf-8')).hexdigest() + '.json')
+
+    # --- Reads ---
+    def get(self, job_id: str):
+        """Result JSON bytes for `job_id`, or None if it is not cached."""
+        with self._lock:
+            body = self._lru.get(job_id)
+            if body is not None:
+                self._lru.move_to_end(job_id)
+                self._counters['memory_hits'] += 1
+                return body
+        if self.disk_dir:
+            try:
+                with open(self._disk_path(job_id), 'rb') as f:
+                    body = f.read()
+            except OSError:
+                body = None
+            if body:
+                with self._lock:
+                    self._counters['disk_hits'] += 1
+                    self._remember(job_id, body)
+                return body
+        with self._lock:
+            self._counters['misses'] += 1
+        return None
+
+    # --- Writes ---
+    def put(self, job_id: str, body) -> None:
+        """Cache the JSON (str or bytes) of a completed result."""
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        with self._lock:
+            self._counters['stores'] += 1
+            self._remember(job_id, body)
+        if self.disk_dir:
+            self._write_disk(job_id, body)
+
+    def _remember(self, job_id: str, body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+        old = self._lru.pop(job_id, None)
+        if old is not None:
+            self._bytes -= len(old)
+        self._lru[job_id] = body
+        self._bytes += len(body)
+        while self._bytes > self.max_bytes:
+            _, evicted = self._lru.popitem(last=False)
+            self._bytes -= len(evicted)
+            self._counters['evictions'] += 1
+
+    def _write_disk(self, job_id: str, body: bytes) -> None:
+        path = self._disk_path(job_id)
+        try:
+            replaced = os.path.getsize(path) if os.path.exists(path) else 0
+            with tempfile.NamedTemporaryFile('wb', dir=self.disk_dir, suffix='.tmp', delete=False) as tmp:
+                tmp.write(body)
+            os.replace(tmp.name, path)
+        except OSError as e:
+            print(f"[result-cache] Could not write {path}: {e}")
+            return
+        with self._lock:
+            self._disk_bytes += len(body) - replaced
+            over = self._disk_bytes > self.disk_max_bytes
+        if over:
+            self._prune_disk()
+
+    def _prune_disk(self) -> None:
+        """Delete the oldest files until the directory is back under 90% of its budget."""
+        try:
+            entries = sorted(
+                (entry.stat().st_mtime, entry.stat().st_size, entry.path)
+                for entry in os.scandir(self.disk_dir) if entry.name.endswith('.json')
+            )
+        except OSError as e:
+            print(f"[result-cache] Could not scan {self.disk_dir}: {e}")
+            return
+        # Other workers share the directory, so recount instead of trusting our own tally
+        total = sum(size for _, size, _ in entries)
+        target = int(self.disk_max_bytes * 0.9)
+        removed = 0
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                removed += 1
+            except OSError:
+                pass
+        with self._lock:
+            self._disk_bytes = total
+            self._counters['disk_evictions'] += removed
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._counters)
+            stats.update({
+                'memory_entries': len(self._lru),
+                'memory_bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'disk_enabled': bool(self.disk_dir),
+            })
+            if self.disk_dir:
+                stats['disk_bytes'] = self._disk_bytes
+            lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_ratio'] = round((stats['memory_hits'] + stats['disk_hits']) / lookups, 3) if lookups else None
+        return stats
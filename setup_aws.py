@@ -10,6 +10,7 @@ import zipfile
 import os
 import time
 from config import Config
+from sign_lexicon import compile_lexicon, is_stale
 
 def create_s3_buckets():
     """Create S3 buckets for upload and processed files"""
@@ -96,10 +97,11 @@ def create_lambda_function():
                     Environment={
                         'Variables': {
                             'UPLOAD_BUCKET': Config.UPLOAD_BUCKET,
-                            'PROCESSED_BUCKET': Config.PROCESSED_BUCKET
+                            'PROCESSED_BUCKET': Config.PROCESSED_BUCKET,
+                            'RECORD_CONCURRENCY': '4'
                         }
                     },
-                    Timeout=300,
+                    Timeout=60,  # only starts the Transcribe job or maps a finished transcript
                     MemorySize=512
                 )
             print(f"✓ Created Lambda function: {function_name}")
@@ -118,9 +120,18 @@ def create_lambda_zip():
     """Create a ZIP file for Lambda deployment"""
     zip_path = 'lambda_deployment.zip'
     
+    # Ship a lexicon artifact that matches lexicon/signs.json
+    if is_stale():
+        compile_lexicon()
+        print("✓ Rebuilt lexicon/signs.lex")
+    
     with zipfile.ZipFile(zip_path, 'w') as zip_file:
         # Add Lambda function
         zip_file.write('lambda_function/lambda_function.py', 'lambda_function.py')
+        # Shared phrase matcher and compiled lexicon used by map_text_to_signs
+        zip_file.write('phrase_trie.py', 'phrase_trie.py')
+        zip_file.write('sign_lexicon.py', 'sign_lexicon.py')
+        zip_file.write('lexicon/signs.lex', 'lexicon/signs.lex')
         
         # Note: boto3 is already available in Lambda runtime
     
@@ -142,34 +153,96 @@ def add_s3_trigger(function_name):
         region_name=Config.AWS_REGION
     )
     
+    function_arn = f'arn:aws:lambda:{Config.AWS_REGION}:{get_account_id()}:function:{function_name}'
+    
+    # Stage 1 runs on audio uploads, stage 2 when Transcribe writes transcripts/<job>.json
+    triggers = [
+        (Config.UPLOAD_BUCKET, 's3-trigger', {
+            'Id': 'speech-to-sign-trigger',
+            'LambdaFunctionArn': function_arn,
+            'Events': ['s3:ObjectCreated:*']
+        }),
+        (Config.PROCESSED_BUCKET, 's3-transcript-trigger', {
+            'Id': 'speech-to-sign-transcript-trigger',
+            'LambdaFunctionArn': function_arn,
+            'Events': ['s3:ObjectCreated:*'],
+            'Filter': {'Key': {'FilterRules': [
+                {'Name': 'prefix', 'Value': 'transcripts/'},
+                {'Name': 'suffix', 'Value': '.json'}
+            ]}}
+        }),
+    ]
+    
+    for bucket, statement_id, lambda_configuration in triggers:
+        try:
+            # Add permission for S3 to invoke Lambda
+            lambda_client.add_permission(
+                FunctionName=function_name,
+                StatementId=statement_id,
+                Action='lambda:InvokeFunction',
+                Principal='s3.amazonaws.com',
+                SourceArn=f'arn:aws:s3:::{bucket}'
+            )
+            
+            # Configure S3 notification
+            notification_config = {
+                'LambdaFunctionConfigurations': [lambda_configuration]
+            }
+            
+            s3_client.put_bucket_notification_configuration(
+                Bucket=bucket,
+                NotificationConfiguration=notification_config
+            )
+            
+            print(f"✓ Added S3 trigger for bucket: {bucket}")
+            
+        except Exception as e:
+            print(f"✗ Failed to add S3 trigger for {bucket}: {str(e)}")
+    
+    add_transcribe_failure_rule(function_name, function_arn)
+
+def add_transcribe_failure_rule(function_name, function_arn):
+    """Route failed Transcribe jobs to the Lambda (they never write a transcript to trigger stage 2)"""
+    events_client = boto3.client(
+        'events',
+        aws_access_key_id=Config.AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=Config.AWS_SECRET_ACCESS_KEY,
+        region_name=Config.AWS_REGION
+    )
+    
+    lambda_client = boto3.client(
+        'lambda',
+        aws_access_key_id=Config.AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=Config.AWS_SECRET_ACCESS_KEY,
+        region_name=Config.AWS_REGION
+    )
+    
+    rule_name = 'speech-to-sign-transcribe-failed'
+    
     try:
-        # Add permission for S3 to invoke Lambda
+        rule = events_client.put_rule(
+            Name=rule_name,
+            EventPattern=json.dumps({
+                'source': ['aws.transcribe'],
+                'detail-type': ['Transcribe Job State Change'],
+                'detail': {'TranscriptionJobStatus': ['FAILED']}
+            })
+        )
+        
         lambda_client.add_permission(
             FunctionName=function_name,
-            StatementId='s3-trigger',
+            StatementId='transcribe-failed-rule',
             Action='lambda:InvokeFunction',
-            Principal='s3.amazonaws.com',
-            SourceArn=f'arn:aws:s3:::{Config.UPLOAD_BUCKET}'
+            Principal='events.amazonaws.com',
+            SourceArn=rule['RuleArn']
         )
         
-        # Configure S3 notification
-        notification_config = {
-            'LambdaFunctionConfigurations': [{
-                'Id': 'speech-to-sign-trigger',
-                'LambdaFunctionArn': f'arn:aws:lambda:{Config.AWS_REGION}:{get_account_id()}:function:{function_name}',
-                'Events': ['s3:ObjectCreated:*']
-            }]
-        }
-        
-        s3_client.put_bucket_notification_configuration(
-            Bucket=Config.UPLOAD_BUCKET,
-            NotificationConfiguration=notification_config
-        )
+        events_client.put_targets(Rule=rule_name, Targets=[{'Id': 'speech-to-sign-processor', 'Arn': function_arn}])
         
-        print(f"✓ Added S3 trigger for bucket: {Config.UPLOAD_BUCKET}")
+        print(f"✓ Added Transcribe failure rule: {rule_name}")
         
     except Exception as e:
-        print(f"✗ Failed to add S3 trigger: {str(e)}")
+        print(f"✗ Failed to add Transcribe failure rule: {str(e)}")
 
 def get_account_id():
     """Get AWS account ID"""
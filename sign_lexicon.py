@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Compiled sign lexicon shared by the web app, the local demo and the Lambda.
+
+The editable source is lexicon/signs.json. `python sign_lexicon.py` compiles
+it into lexicon/signs.lex, a versioned binary artifact holding the token trie,
+an interned string table (tokens, keys and URLs) and build metadata. The
+artifact is opened with mmap and read in place, so loading costs a header
+parse regardless of vocabulary size, and every entry point segments text
+identically because they all read the same file.
+
+Layout (little-endian):
+    header      MAGIC, format version, section counts and offsets
+    strings     (offset, length) index + UTF-8 blob; every string stored once
+    tokens      string ids of all trie tokens, sorted by their UTF-8 bytes
+    nodes       (first_edge, edge_count, key_sid, url_sid) per trie node; node 0 is the root
+    edges       (token_id, child_node) per edge, sorted by token_id within a node
+    metadata    JSON (lexicon name/version, entry count, source checksum)
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from collections import OrderedDict
+
+MAGIC = b'SGNLEX\x00\x00'
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct('<8sIIIIIIIIIIIIII')
+_STR_INDEX = struct.Struct('<II')
+_U32 = struct.Struct('<I')
+_NODE = struct.Struct('<IIii')
+_EDGE = struct.Struct('<II')
+
+LEXICON_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'lexicon')
+DEFAULT_SOURCE_PATH = os.path.join(LEXICON_DIR, 'signs.json')
+DEFAULT_LEXICON_PATH = os.path.join(LEXICON_DIR, 'signs.lex')
+
+
+class LexiconFormatError(ValueError):
+    """Raised when a lexicon artifact is missing, truncated or from an unsupported format version."""
+
+
+# --- Compiler ---
+def compile_lexicon(source_path: str = DEFAULT_SOURCE_PATH, out_path: str = DEFAULT_LEXICON_PATH) -> dict:
+    """Compile the JSON lexicon at `source_path` into the binary artifact at `out_path`; returns its metadata."""
+    with open(source_path, 'rb') as f:
+        raw = f.read()
+    source = json.loads(raw.decode('utf-8'))
+    signs = source['signs']
+
+    # Build the trie; keys that split to the same tokens keep the first one (matches the old sorted scan)
+    root = {'children': {}, 'key': None, 'url': None}
+    max_phrase_length = 0
+    for key, url in signs.items():
+        tokens = key.split()
+        if not tokens:
+            continue
+        node = root
+        for token in tokens:
+            node = node['children'].setdefault(token, {'children': {}, 'key': None, 'url': None})
+        if node['key'] is None:
+            node['key'], node['url'] = key, url
+        max_phrase_length = max(max_phrase_length, len(tokens))
+
+    strings = OrderedDict()
+
+    def intern(value):
+        if value not in strings:
+            strings[value] = len(strings)
+        return strings[value]
+
+    # Flatten breadth-first so the root is node 0 and each node's edges are contiguous
+    all_tokens = set()
+    order = [root]
+    for node in order:
+        all_tokens.update(node['children'])
+        order.extend(node['children'][t] for t in node['children'])
+    sorted_tokens = sorted(all_tokens, key=lambda t: t.encode('utf-8'))
+    token_ids = {token: i for i, token in enumerate(sorted_tokens)}
+    token_sids = [intern(token) for token in sorted_tokens]
+    node_ids = {id(node): i for i, node in enumerate(order)}
+
+    nodes, edges = [], []
+    for node in order:
+        children = sorted(node['children'].items(), key=lambda item: token_ids[item[0]])
+        nodes.append((
+            len(edges), len(children),
+            intern(node['key']) if node['key'] is not None else -1,
+            intern(node['url']) if node['url'] is not None else -1,
+        ))
+        edges.extend((token_ids[token], node_ids[id(child)]) for token, child in children)
+
+    metadata = {
+        'name': source.get('name'),
+        'lexicon_version': source.get('version'),
+        'format_version': FORMAT_VERSION,
+        'entries': len(signs),
+        'max_phrase_length': max_phrase_length,
+        'source_sha256': hashlib.sha256(raw).hexdigest(),
+    }
+
+    blob = bytearray()
+    index = bytearray()
+    for value in strings:
+        encoded = value.encode('utf-8')
+        index += _STR_INDEX.pack(len(blob), len(encoded))
+        blob += encoded
+    tokens_bytes = b''.join(_U32.pack(sid) for sid in token_sids)
+    nodes_bytes = b''.join(_NODE.pack(*n) for n in nodes)
+    edges_bytes = b''.join(_EDGE.pack(*e) for e in edges)
+    meta_bytes = json.dumps(metadata, sort_keys=True).encode('utf-8')
+
+    offset = _HEADER.size
+    sections = []
+    for section in (index, blob, tokens_bytes, nodes_bytes, edges_bytes, meta_bytes):
+        sections.append(offset)
+        offset += len(section)
+    header = _HEADER.pack(
+        MAGIC, FORMAT_VERSION, len(strings), len(sorted_tokens), len(nodes), len(edges), max_phrase_length,
+        sections[0], sections[1], sections[2], sections[3], sections[4], sections[5], len(meta_bytes), 0,
+    )
+
+    tmp_path = out_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        for section in (index, blob, tokens_bytes, nodes_bytes, edges_bytes, meta_bytes):
+            f.write(section)
+    os.replace(tmp_path, out_path)
+    return metadata
+
+
+# --- Loader ---
+class SignLexicon:
+    """Read-only view of a compiled lexicon, backed by mmap.
+
+    Provides longest_match() (the interface phrase_trie.segment_words expects)
+    and dict-style lookup of a key's sign URL.
+    """
+
+    def __init__(self, buffer, path: str = None):
+        self.path = path
+        self._buf = buffer
+        if len(buffer) < _HEADER.size:
+            raise LexiconFormatError(f"lexicon '{path}' is truncated")
+        (magic, version, self._string_count, self._token_count, self._node_count, self._edge_count,
+         self.max_phrase_length, self._str_index_off, self._str_data_off, self._tokens_off,
+         self._nodes_off, self._edges_off, meta_off, meta_len, _reserved) = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise LexiconFormatError(f"'{path}' is not a compiled sign lexicon")
+        if version != FORMAT_VERSION:
+            raise LexiconFormatError(
+                f"lexicon '{path}' has format version {version}, expected {FORMAT_VERSION}; rebuild it with sign_lexicon.py"
+            )
+        self.metadata = json.loads(bytes(buffer[meta_off:meta_off + meta_len]).decode('utf-8'))
+        self._token_cache = {}
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_LEXICON_PATH) -> 'SignLexicon':
+        try:
+            with open(path, 'rb') as f:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise LexiconFormatError(f"cannot open lexicon '{path}': {e}") from e
+        return cls(buffer, path)
+
+    def __len__(self):
+        return self.metadata.get('entries', 0)
+
+    # --- Raw section access ---
+    def _string(self, sid: int) -> str:
+        offset, length = _STR_INDEX.unpack_from(self._buf, self._str_index_off + sid * _STR_INDEX.size)
+        start = self._str_data_off + offset
+        return self._buf[start:start + length].decode('utf-8')
+
+    def _token_id(self, token: str) -> int:
+        """Binary search the sorted token table; -1 if the token never appears in the lexicon."""
+        cached = self._token_cache.get(token)
+        if cached is not None:
+            return cached
+        target = token.encode('utf-8')
+        lo, hi = 0, self._token_count - 1
+        found = -1
+        while lo <= hi:
+            mid = (lo + hi) // 2
+            sid = _U32.unpack_from(self._buf, self._tokens_off + mid * 4)[0]
+            offset, length = _STR_INDEX.unpack_from(self._buf, self._str_index_off + sid * _STR_INDEX.size)
+            start = self._str_data_off + offset
+            probe = self._buf[start:start + length]
+            if probe == target:
+                found = mid
+                break
+            if probe < target:
+                lo = mid + 1
+            else:
+                hi = mid - 1
+        if len(self._token_cache) < 65536:
+            self._token_cache[token] = found
+        return found
+
+    def _child(self, node: int, token_id: int) -> int:
+        first, count, _, _ = _NODE.unpack_from(self._buf, self._nodes_off + node * _NODE.size)
+        lo, hi = first, first + count - 1
+        while lo <= hi:
+            mid = (lo + hi) // 2
+            tid, child = _EDGE.unpack_from(self._buf, self._edges_off + mid * _EDGE.size)
+            if tid == token_id:
+                return child
+            if tid < token_id:
+                lo = mid + 1
+            else:
+                hi = mid - 1
+        return -1
+
+    def _node_entry(self, node: int):
+        _, _, key_sid, url_sid = _NODE.unpack_from(self._buf, self._nodes_off + node * _NODE.size)
+        return key_sid, url_sid
+
+    def _walk(self, tokens) -> int:
+        node = 0
+        for token in tokens:
+            token_id = self._token_id(token)
+            if token_id < 0:
+                return -1
+            node = self._child(node, token_id)
+            if node < 0:
+                return -1
+        return node
+
+    # --- Public API ---
+    def longest_match(self, words, start: int = 0):
+        """Return (phrase_key, length) of the longest lexicon phrase starting at words[start], or (None, 0)."""
+        node = 0
+        best_sid, best_length = -1, 0
+        for i in range(start, len(words)):
+            token_id = self._token_id(words[i])
+            if token_id < 0:
+                break
+            node = self._child(node, token_id)
+            if node < 0:
+                break
+            key_sid, _ = self._node_entry(node)
+            if key_sid >= 0:
+                best_sid, best_length = key_sid, i - start + 1
+        if best_sid < 0:
+            return None, 0
+        return self._string(best_sid), best_length
+
+    def can_extend(self, words, start: int = 0) -> bool:
+        """True if words[start:] is a proper prefix of a lexicon phrase, i.e. more words could give a longer match."""
+        node = self._walk(words[start:])
+        if node < 0:
+            return False
+        _, edge_count, _, _ = _NODE.unpack_from(self._buf, self._nodes_off + node * _NODE.size)
+        return edge_count > 0
+
+    def get(self, key: str, default=None):
+        """Sign URL for a lexicon key (exact key match), or `default`."""
+        tokens = key.split()
+        node = self._walk(tokens) if tokens else -1
+        if node <= 0:
+            return default
+        key_sid, url_sid = self._node_entry(node)
+        if key_sid < 0 or self._string(key_sid) != key:
+            return default
+        return self._string(url_sid)
+
+    def __getitem__(self, key: str) -> str:
+        url = self.get(key)
+        if url is None:
+            raise KeyError(key)
+        return url
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def keys(self):
+        """All lexicon keys (depth-first order). Walks the whole trie; meant for tooling, not the request path."""
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            first, count, key_sid, _ = _NODE.unpack_from(self._buf, self._nodes_off + node * _NODE.size)
+            if key_sid >= 0:
+                yield self._string(key_sid)
+            for e in range(first + count - 1, first - 1, -1):
+                stack.append(_EDGE.unpack_from(self._buf, self._edges_off + e * _EDGE.size)[1])
+
+
+def load_lexicon(path: str = None) -> SignLexicon:
+    """Load the shared lexicon from `path`, $SIGN_LEXICON_PATH or lexicon/signs.lex."""
+    return SignLexicon.load(path or os.getenv('SIGN_LEXICON_PATH') or DEFAULT_LEXICON_PATH)
+
+
+def is_stale(source_path: str = DEFAULT_SOURCE_PATH, lexicon_path: str = DEFAULT_LEXICON_PATH) -> bool:
+    """True if the artifact is missing or was built from a different version of the source file."""
+    try:
+        lexicon = SignLexicon.load(lexicon_path)
+    except LexiconFormatError:
+        return True
+    with open(source_path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest() != lexicon.metadata.get('source_sha256')
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Compile lexicon/signs.json into the binary lexicon artifact.')
+    parser.add_argument('--source', default=DEFAULT_SOURCE_PATH)
+    parser.add_argument('--out', default=DEFAULT_LEXICON_PATH)
+    parser.add_argument('--check', action='store_true', help='exit 1 if the artifact is out of date instead of building')
+    args = parser.parse_args()
+
+    if args.check:
+        stale = is_stale(args.source, args.out)
+        print(f"{args.out} is {'OUT OF DATE' if stale else 'up to date'}")
+        sys.exit(1 if stale else 0)
+
+    meta = compile_lexicon(args.source, args.out)
+    print(f"✓ Compiled {meta['entries']} entries (lexicon v{meta['lexicon_version']}, "
+          f"longest phrase {meta['max_phrase_length']} words) -> {args.out} ({os.path.getsize(args.out)} bytes)")
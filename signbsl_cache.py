@@ -0,0 +1,226 @@
+"""
+Persistent SignBSL lookup cache.
+
+Lookups are stored in a SQLite database in WAL mode so every gunicorn worker on
+a host shares the same results and they survive restarts. A small in-process
+LRU sits in front of it so hot words never touch the database.
+
+Each entry records what kind of outcome it is, and each kind has its own TTL:
+  - found:     a video URL was scraped (long TTL)
+  - not_found: SignBSL has no page/video for the word (medium TTL)
+  - error:     timeout, connection error or 5xx (short TTL, so one blip
+               doesn't hide a word for long)
+
+Entries from an offline crawl (signbsl_crawler.py) are pinned in memory with
+preload() and take precedence over everything else.
+"""
+
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+MISS = object()  # returned by get() when the key is not cached (or expired)
+
+FOUND = 'found'
+NOT_FOUND = 'not_found'
+ERROR = 'error'
+
+
+def default_cache_path() -> str:
+    return os.path.join(tempfile.gettempdir(), 'signbsl_cache.sqlite3')
+
+
+def load_manifest(path: str) -> dict:
+    """Read the {key: url_or_None} entries of a signbsl_crawler.py manifest; {} if there is none."""
+    if not path or not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f).get('entries', {})
+    except (OSError, ValueError, AttributeError) as e:
+        print(f"[signbsl-cache] Ignoring unreadable manifest '{path}': {e}")
+        return {}
+
+
+class SignLookupCache:
+    """In-process LRU in front of a size-bounded, TTL-aware SQLite store."""
+
+    def __init__(self, path: str = None, lru_size: int = 2048, max_entries: int = 50000,
+                 found_ttl: float = 30 * 24 * 3600, not_found_ttl: float = 24 * 3600,
+                 error_ttl: float = 60):
+        self.path = path if path is not None else default_cache_path()
+        self.lru_size = max(1, lru_size)
+        self.max_entries = max(1, max_entries)
+        self.ttls = {FOUND: found_ttl, NOT_FOUND: not_found_ttl, ERROR: error_ttl}
+
+        self._lru = OrderedDict()  # key -> (url, kind, expires_at)
+        self._seeded = {}  # key -> (url, kind), pinned by preload()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._disk_ok = bool(self.path)
+        self._writes_since_evict = 0
+        self._counters = {
+            'seeded_hits': 0, 'lru_hits': 0, 'disk_hits': 0, 'misses': 0, 'expired': 0,
+            'stores': 0, 'evictions': 0,
+        }
+        if self._disk_ok:
+            self._connect()
+
+    # --- SQLite connection (one per thread, re-opened after fork) ---
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        try:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS lookups ('
+                ' key TEXT PRIMARY KEY,'
+                ' url TEXT,'
+                ' kind TEXT NOT NULL,'
+                ' expires_at REAL NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS lookups_expires ON lookups (expires_at)')
+        except sqlite3.Error as e:
+            print(f"[signbsl-cache] Disk cache unavailable at '{self.path}', using in-memory LRU only: {e}")
+            self._disk_ok = False
+            return None
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    # --- Public API ---
+    def get(self, key: str):
+        """Return the cached URL (or None for a cached miss), or MISS if nothing usable is cached."""
+        entry = self.get_entry(key)
+        return entry if entry is MISS else entry[0]
+
+    def get_entry(self, key: str):
+        """Like get(), but returns (url, kind) so callers can tell a cached not_found from a cached error."""
+        seeded = self._seeded.get(key)
+        if seeded is not None:
+            with self._lock:
+                self._counters['seeded_hits'] += 1
+            return seeded
+
+        now = time.time()
+        expired = False
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is not None:
+                if entry[2] > now:
+                    self._lru.move_to_end(key)
+                    self._counters['lru_hits'] += 1
+                    return entry[0], entry[1]
+                del self._lru[key]
+                expired = True
+
+        row = None
+        if self._disk_ok:
+            try:
+                conn = self._connect()
+                if conn is not None:
+                    row = conn.execute(
+                        'SELECT url, kind, expires_at FROM lookups WHERE key = ?', (key,)
+                    ).fetchone()
+            except sqlite3.Error as e:
+                print(f"[signbsl-cache] Read failed for '{key}': {e}")
+
+        with self._lock:
+            if row is not None and row[2] > now:
+                self._remember(key, row)
+                self._counters['disk_hits'] += 1
+                return row[0], row[1]
+            if expired or row is not None:
+                self._counters['expired'] += 1
+            self._counters['misses'] += 1
+        return MISS
+
+    def put_found(self, key: str, url: str) -> None:
+        self._store(key, url, FOUND)
+
+    def put_not_found(self, key: str) -> None:
+        self._store(key, None, NOT_FOUND)
+
+    def put_error(self, key: str) -> None:
+        self._store(key, None, ERROR)
+
+    def preload(self, entries: dict) -> int:
+        """Pin {key: url_or_None} pairs (e.g. from a crawler manifest) in memory.
+
+        Pinned entries are answered before the LRU and never expire or get
+        evicted, so crawled words never fall through to a live lookup.
+        """
+        seeded = dict(self._seeded)
+        for key, url in entries.items():
+            seeded[key] = (url, FOUND if url else NOT_FOUND)
+        self._seeded = seeded  # swapped whole so readers never see a half-built dict
+        return len(entries)
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._counters)
+            stats['lru_entries'] = len(self._lru)
+        stats['seeded_entries'] = len(self._seeded)
+        stats['disk_enabled'] = self._disk_ok
+        if self._disk_ok:
+            try:
+                conn = self._connect()
+                if conn is not None:
+                    stats['disk_entries'] = conn.execute('SELECT COUNT(*) FROM lookups').fetchone()[0]
+            except sqlite3.Error:
+                pass
+        hits = stats['seeded_hits'] + stats['lru_hits'] + stats['disk_hits']
+        lookups = hits + stats['misses']
+        stats['hit_ratio'] = round(hits / lookups, 4) if lookups else None
+        return stats
+
+    # --- Internals ---
+    def _remember(self, key, row):
+        self._lru[key] = row
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+    def _store(self, key, url, kind):
+        row = (url, kind, time.time() + self.ttls[kind])
+        with self._lock:
+            self._remember(key, row)
+            self._counters['stores'] += 1
+            self._writes_since_evict += 1
+            evict = self._writes_since_evict >= 256
+            if evict:
+                self._writes_since_evict = 0
+        if not self._disk_ok:
+            return
+        try:
+            conn = self._connect()
+            if conn is None:
+                return
+            conn.execute(
+                'INSERT OR REPLACE INTO lookups (key, url, kind, expires_at) VALUES (?, ?, ?, ?)',
+                (key, row[0], row[1], row[2]),
+            )
+            if evict:
+                self._evict(conn)
+        except sqlite3.Error as e:
+            print(f"[signbsl-cache] Write failed for '{key}': {e}")
+
+    def _evict(self, conn):
+        """Drop expired rows, then the soonest-to-expire rows beyond max_entries."""
+        deleted = conn.execute('DELETE FROM lookups WHERE expires_at <= ?', (time.time(),)).rowcount
+        excess = conn.execute('SELECT COUNT(*) FROM lookups').fetchone()[0] - self.max_entries
+        if excess > 0:
+            deleted += conn.execute(
+                'DELETE FROM lookups WHERE key IN '
+                '(SELECT key FROM lookups ORDER BY expires_at LIMIT ?)', (excess,)
+            ).rowcount
+        if deleted:
+            with self._lock:
+                self._counters['evictions'] += deleted
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Offline SignBSL crawler - resolve a vocabulary ahead of time.
+
+Looks every word/phrase up with the same code the web app uses
+(signbsl_lookup.lookup_signbsl_video), several at a time but paced per host,
+and records the outcomes in a JSON manifest. The app preloads the manifest at
+startup (SIGNBSL_MANIFEST_PATH), so crawled words never need a live lookup in
+the request path. Results also land in the shared on-disk lookup cache.
+
+The manifest is checkpointed as the crawl goes; re-running the same command
+after an interruption skips everything already resolved. Words that only
+produced errors (timeouts, 429/5xx) are left out and retried next run.
+
+Usage:
+    python signbsl_crawler.py vocabulary.txt            # one word/phrase per line, '#' comments
+    python signbsl_crawler.py --lexicon --workers 4 --rate 2
+    python signbsl_crawler.py words.txt --refresh       # re-check entries already in the manifest
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+
+import http_client
+from config import Config
+from signbsl_cache import SignLookupCache, FOUND, ERROR
+from signbsl_lookup import lookup_signbsl_video, signbsl_cache_key
+
+MANIFEST_VERSION = 1
+RETRY_BACKOFF_SECS = 2.0
+
+
+def read_vocabulary(paths, include_lexicon: bool = False) -> list:
+    """Distinct, normalised words/phrases from vocabulary files (and optionally the sign lexicon)."""
+    words = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.split('#', 1)[0].strip()
+                if line:
+                    words.append(' '.join(line.lower().split()))
+    if include_lexicon:
+        from sign_lexicon import load_lexicon
+        words.extend(sorted(load_lexicon().keys()))
+    # One lookup per cache key ("thank you" and "thank-you" are the same page)
+    distinct = {}
+    for word in words:
+        distinct.setdefault(signbsl_cache_key(word), word)
+    return list(distinct.values())
+
+
+def load_manifest_file(path: str) -> dict:
+    if not os.path.exists(path):
+        return {'entries': {}}
+    with open(path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('version') != MANIFEST_VERSION:
+        raise SystemExit(f"❌ {path} has manifest version {manifest.get('version')}, expected {MANIFEST_VERSION}")
+    return manifest
+
+
+def write_manifest(path: str, entries: dict, errors: list) -> None:
+    """Atomically replace the manifest so an interrupted write never leaves a truncated file."""
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'source': 'https://www.signbsl.com/sign/',
+        'updated_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'found': sum(1 for url in entries.values() if url),
+        'entries': dict(sorted(entries.items())),
+        'errors': sorted(errors),
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def crawl(words, manifest_path: str, workers: int = 4, rate: float = 2.0, retries: int = 2,
+          refresh: bool = False, checkpoint_every: int = 25) -> int:
+    """Resolve `words` into the manifest at `manifest_path`; returns a process exit code."""
+    entries = load_manifest_file(manifest_path).get('entries', {})
+    pending = [w for w in words if refresh or signbsl_cache_key(w) not in entries]
+    print(f"[crawler] {len(words)} words, {len(words) - len(pending)} already in {manifest_path}, {len(pending)} to resolve")
+    if not pending:
+        return 0
+
+    http_client.configure(pool_size=workers)
+    http_client.set_rate_limit(rate)
+    # Errors are not cached for the crawl, and cached errors (also ones the app wrote to the shared
+    # disk cache) are skipped, so every attempt really goes back to SignBSL; --refresh also skips
+    # the shared disk cache entirely
+    cache = SignLookupCache('' if refresh else Config.SIGNBSL_CACHE_PATH, error_ttl=0)
+
+    def resolve(word):
+        for attempt in range(retries + 1):
+            kind, url = lookup_signbsl_video(word, cache, refresh_errors=True)
+            if kind != ERROR:
+                return kind, url
+            if attempt < retries:
+                time.sleep(RETRY_BACKOFF_SECS * 2 ** attempt)
+        return ERROR, None
+
+    errors = set()
+    counts = {'found': 0, 'not_found': 0, 'error': 0}
+    started = time.time()
+    executor = ThreadPoolExecutor(max(1, workers), thread_name_prefix='crawler')
+    try:
+        futures = {executor.submit(resolve, word): word for word in pending}
+        for done, future in enumerate(as_completed(futures), 1):
+            key = signbsl_cache_key(futures[future])
+            kind, url = future.result()
+            if kind == ERROR:
+                errors.add(key)
+                counts['error'] += 1
+            else:
+                entries[key] = url if kind == FOUND else None
+                errors.discard(key)
+                counts['found' if kind == FOUND else 'not_found'] += 1
+            if done % checkpoint_every == 0 or done == len(pending):
+                write_manifest(manifest_path, entries, errors)
+                print(f"[crawler] {done}/{len(pending)} resolved "
+                      f"(found {counts['found']}, not found {counts['not_found']}, errors {counts['error']})")
+    except KeyboardInterrupt:
+        executor.shutdown(wait=False, cancel_futures=True)
+        write_manifest(manifest_path, entries, errors)
+        print(f"\n[crawler] Interrupted - progress saved to {manifest_path}; run the same command to resume")
+        return 130
+    executor.shutdown()
+
+    print(f"✓ Crawled {len(pending)} words in {time.time() - started:.1f}s -> {manifest_path}")
+    if errors:
+        print(f"⚠️ {len(errors)} words failed after {retries + 1} attempts; re-run to retry them")
+    return 1 if errors else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Pre-resolve SignBSL videos for a vocabulary into a manifest.')
+    parser.add_argument('vocabulary', nargs='*', help='text files with one word or phrase per line')
+    parser.add_argument('--lexicon', action='store_true', help='also crawl every key of the sign lexicon')
+    parser.add_argument('--manifest', default=Config.SIGNBSL_MANIFEST_PATH, help='manifest to write/resume (default: %(default)s)')
+    parser.add_argument('--workers', type=int, default=4, help='concurrent lookups (default: %(default)s)')
+    parser.add_argument('--rate', type=float, default=2.0, help='max requests per second per host (default: %(default)s)')
+    parser.add_argument('--retries', type=int, default=2, help='retries for timeouts/429/5xx (default: %(default)s)')
+    parser.add_argument('--refresh', action='store_true', help='look up words even if the manifest already has them')
+    args = parser.parse_args(argv)
+
+    if not args.vocabulary and not args.lexicon:
+        parser.error('give at least one vocabulary file or --lexicon')
+    words = read_vocabulary(args.vocabulary, include_lexicon=args.lexicon)
+    return crawl(words, args.manifest, workers=args.workers, rate=args.rate,
+                 retries=args.retries, refresh=args.refresh)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,203 @@
+"""
+SignBSL page lookup shared by the web app and the offline crawler.
+
+lookup_signbsl_video() fetches https://www.signbsl.com/sign/<word> through the
+pooled HTTP client, pulls out the video URL and records the outcome in a
+SignLookupCache. It returns the outcome kind together with the URL so callers
+that need to can tell "no sign exists" from "try again later".
+
+Pages are not parsed into a tree. SignPageParser is fed the body chunk by
+chunk as it streams in and stops as soon as the answer is known (normally at
+the first <video>'s first <source>), so a lookup neither buffers the page nor
+tokenises the markup after the player.
+"""
+
+import codecs
+import re
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+import http_client
+from signbsl_cache import MISS, FOUND, NOT_FOUND, ERROR
+
+STREAM_CHUNK_BYTES = 8192
+# After an early exit the rest of the body is read (not parsed) so the keep-alive
+# connection can go back to the pool; bigger leftovers just drop the connection
+DRAIN_LIMIT_BYTES = 256 * 1024
+
+EMBED_DOMAINS = ('youtube.com', 'vimeo.com', 'player.vimeo.com')
+VIDEO_LINK_HINTS = ('.mp4', '.webm', '.ogv', 'video')
+
+# Elements BeautifulSoup never treats as containers
+VOID_ELEMENTS = frozenset((
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'keygen', 'link', 'menuitem', 'meta',
+    'param', 'source', 'track', 'wbr', 'basefont', 'bgsound', 'command', 'frame', 'image', 'isindex',
+    'nextid', 'spacer',
+))
+
+_CHARSET_RE = re.compile(r'charset=["\']?([\w.:-]+)', re.I)
+
+
+class _Done(Exception):
+    """Raised from a handler to stop parsing once the result is decided."""
+
+
+class SignPageParser(HTMLParser):
+    """Incremental extractor for the sign video URL of a SignBSL page.
+
+    Candidates, in priority order (the same rules the BeautifulSoup versions used):
+      1. the first <video>: its first <source src>, else its own src
+      2. with embeds=True: the first <iframe>, if it is a YouTube/Vimeo embed
+      3. with embeds=True: the first <a>/<source>/<embed> whose href/src looks like a video
+    Parsing stops once every higher-priority candidate has been decided.
+    """
+
+    def __init__(self, base_url: str, embeds: bool = False):
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.embeds = embeds
+        self.finished = False
+        # Open non-void elements, kept until the <video> is decided: BeautifulSoup closes every
+        # element above the most recent open tag matching an end tag, which can close the video early
+        self._open = []
+        self._video_at = None  # index of the first <video> in self._open
+        self._video_src = ''
+        self._slots = {'video': MISS, 'iframe': MISS if embeds else None, 'link': MISS if embeds else None}
+
+    # --- Candidate bookkeeping ---
+    def _decide(self, slot, url):
+        if self._slots[slot] is MISS:
+            self._slots[slot] = url
+            if self.result() is not MISS:
+                self.finished = True
+                raise _Done
+
+    def result(self):
+        """The video URL (or None) once decided, MISS while a better candidate could still appear."""
+        for slot in ('video', 'iframe', 'link'):
+            value = self._slots[slot]
+            if value is MISS:
+                return MISS
+            if value:
+                return value
+        return None
+
+    def finish(self):
+        """Resolve whatever is still open at end of document."""
+        if self._slots['video'] is MISS:
+            self._slots['video'] = urljoin(self.base_url, self._video_src) if self._video_src else None
+        self._open = []
+        for slot in ('iframe', 'link'):
+            if self._slots[slot] is MISS:
+                self._slots[slot] = None
+        self.finished = True
+        return self.result()
+
+    # --- HTMLParser callbacks ---
+    def handle_starttag(self, tag, attrs):
+        tracking = self._slots['video'] is MISS
+        if tracking and tag not in VOID_ELEMENTS:
+            self._open.append(tag)
+        if tag not in ('video', 'source', 'iframe', 'a', 'embed'):
+            return
+        attrs = {name: value or '' for name, value in attrs}
+
+        if tag == 'video':
+            if tracking and self._video_at is None:
+                self._video_at = len(self._open) - 1
+                self._video_src = attrs.get('src', '')
+        elif tag == 'source' and tracking and self._video_at is not None:
+            # Only the first <source> inside the first <video> counts
+            src = attrs.get('src') or self._video_src
+            self._decide('video', urljoin(self.base_url, src) if src else None)
+        elif tag == 'iframe' and self.embeds and self._slots['iframe'] is MISS:
+            src = attrs.get('src', '')
+            self._decide('iframe', src if src and any(d in src for d in EMBED_DOMAINS) else None)
+
+        if self.embeds and tag in ('a', 'source', 'embed') and self._slots['link'] is MISS:
+            href_or_src = attrs.get('href') or attrs.get('src')
+            if href_or_src and any(hint in href_or_src.lower() for hint in VIDEO_LINK_HINTS):
+                self._decide('link', urljoin(self.base_url, href_or_src))
+
+    def handle_endtag(self, tag):
+        if self._slots['video'] is not MISS or tag not in self._open:
+            return
+        index = len(self._open) - 1 - self._open[::-1].index(tag)
+        del self._open[index:]
+        if self._video_at is not None and index <= self._video_at:
+            self._decide('video', urljoin(self.base_url, self._video_src) if self._video_src else None)
+
+
+def extract_video_url(chunks, base_url: str, embeds: bool = False, encoding: str = 'utf-8'):
+    """Feed `chunks` (bytes or an iterable of bytes) to a SignPageParser; returns (url_or_None, bytes_parsed)."""
+    if isinstance(chunks, (bytes, bytearray)):
+        chunks = (chunks,)
+    parser = SignPageParser(base_url, embeds=embeds)
+    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+    parsed = 0
+    try:
+        for chunk in chunks:
+            parsed += len(chunk)
+            parser.feed(decoder.decode(chunk))
+        parser.feed(decoder.decode(b'', final=True))
+        parser.close()
+    except _Done:
+        return parser.result(), parsed
+    return parser.finish(), parsed
+
+
+def read_video_url(response, base_url: str, embeds: bool = False):
+    """Extract the video URL from a `stream=True` response, parsing only as far as needed."""
+    match = _CHARSET_RE.search(response.headers.get('Content-Type', ''))
+    encoding = match.group(1) if match else 'utf-8'
+    try:
+        codecs.lookup(encoding)
+    except LookupError:
+        encoding = 'utf-8'
+    chunks = response.iter_content(STREAM_CHUNK_BYTES)
+    try:
+        video_url, _ = extract_video_url(chunks, base_url, embeds=embeds, encoding=encoding)
+        drained = 0
+        for chunk in chunks:
+            drained += len(chunk)
+            if drained > DRAIN_LIMIT_BYTES:
+                break
+    finally:
+        response.close()
+    return video_url
+
+
+def signbsl_cache_key(word_or_phrase: str) -> str:
+    """Cache/manifest key for a word or phrase (also its SignBSL URL slug)."""
+    return word_or_phrase.lower().replace(' ', '-')
+
+
+def lookup_signbsl_video(word_or_phrase: str, cache, refresh_errors: bool = False):
+    """Return (kind, video_url) for a word/phrase; video_url is None unless kind is FOUND.
+
+    With `refresh_errors`, a cached ERROR outcome is ignored and SignBSL is asked again.
+    """
+    cache_key = signbsl_cache_key(word_or_phrase)
+    cached = cache.get_entry(cache_key)
+    if cached is not MISS and not (refresh_errors and cached[1] == ERROR):
+        return cached[1], cached[0]
+    try:
+        signbsl_url = f"https://www.signbsl.com/sign/{cache_key}"
+        response = http_client.get(signbsl_url, stream=True)
+        if response.status_code == 200:
+            video_url = read_video_url(response, signbsl_url)
+            if video_url:
+                cache.put_found(cache_key, video_url)
+                return FOUND, video_url
+            cache.put_not_found(cache_key)
+            return NOT_FOUND, None
+        response.close()
+        if response.status_code in (404, 410):
+            cache.put_not_found(cache_key)
+            return NOT_FOUND, None
+        # 429 / 5xx: transient, only cached briefly
+        cache.put_error(cache_key)
+        return ERROR, None
+    except Exception:
+        cache.put_error(cache_key)
+        return ERROR, None
@@ -0,0 +1,52 @@
+"""
+Concurrent, de-duplicated SignBSL resolution.
+
+Mapping a sentence needs one lookup per distinct word or phrase. Instead of
+resolving them one after another, the resolver collects the unique keys,
+answers cache hits inline and fetches only the misses in parallel on a shared,
+bounded thread pool, so a sentence costs roughly one lookup's latency.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from signbsl_cache import MISS
+
+
+class SignResolver:
+    """Resolves many words/phrases at once through a bounded, process-wide pool."""
+
+    def __init__(self, fetch, peek=None, max_workers: int = 8):
+        """`fetch(key)` does the (cached) lookup; `peek(key)` returns a cached value or MISS without network I/O (it may read the local cache)."""
+        self.fetch = fetch
+        self.peek = peek
+        self.max_workers = max(1, max_workers)
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    def _get_pool(self):
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(self.max_workers, thread_name_prefix='signbsl')
+        return self._pool
+
+    def resolve(self, keys) -> dict:
+        """Return {key: fetch(key)} for every distinct key, fetching cache misses concurrently."""
+        results = {}
+        misses = []
+        for key in dict.fromkeys(keys):
+            cached = self.peek(key) if self.peek is not None else MISS
+            if cached is MISS:
+                misses.append(key)
+            else:
+                results[key] = cached
+
+        if len(misses) == 1:
+            results[misses[0]] = self.fetch(misses[0])
+        elif misses:
+            pool = self._get_pool()
+            futures = [(key, pool.submit(self.fetch, key)) for key in misses]
+            for key, future in futures:
+                results[key] = future.result()
+        return results
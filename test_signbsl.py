@@ -7,6 +7,7 @@ This script tests fetching real sign language videos from SignBSL.com
 import sys
 sys.path.append('.')
 from local_demo import fetch_signbsl_video_url, get_sign_url, map_text_to_signs_greedy
+import http_client
 
 def test_signbsl_integration():
     """Test the SignBSL.com integration with various words and phrases"""
@@ -69,6 +70,11 @@ def test_signbsl_integration():
             phrase_info = f" ({sign['phrase_length']} words)" if sign['phrase_length'] > 1 else ""
             print(f"  • '{sign['word']}'{phrase_info} → {source}")
     
+    print()
+    print("🔌 Connection reuse (shared keep-alive pool):")
+    for host, counts in http_client.stats()['hosts'].items():
+        print(f"  • {host}: {counts['requests']} requests over {counts['connections']} connection(s)")
+    
     print()
     print("🎉 SignBSL.com integration test complete!")
     print("Your system now fetches real sign language videos when available.")
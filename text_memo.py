@@ -0,0 +1,65 @@
+"""
+Memo of text-to-sign translations.
+
+Text input is mapped to signs in the request, and people send the same short
+phrases over and over ("hello", "thank you", ...). TranslationMemo keeps the
+sign sequence for each normalized text (lowercased, whitespace collapsed --
+exactly what the mapper itself looks at), so a repeat skips segmentation and
+sign resolution entirely.
+
+Entries expire after `ttl_secs` so a word that gains a SignBSL video is picked
+up eventually, and only texts up to `max_text_chars` are kept: long documents
+rarely repeat and would crowd out the phrases that do.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+def normalize_text(text: str) -> str:
+    return ' '.join(text.lower().split())
+
+
+class TranslationMemo:
+    """Bounded LRU of normalized text -> sign sequence, with a TTL per entry."""
+
+    def __init__(self, max_entries: int = 5000, ttl_secs: float = 3600, max_text_chars: int = 1000):
+        self.max_entries = max(0, max_entries)
+        self.ttl_secs = ttl_secs
+        self.max_text_chars = max_text_chars
+        self._entries = OrderedDict()  # normalized text -> (sign_sequence, expires_at)
+        self._lock = threading.Lock()
+        self._counters = {'hits': 0, 'misses': 0, 'stores': 0, 'expired': 0}
+
+    def get(self, key: str):
+        """Sign sequence memoized for normalized text `key`, or None. Callers must not modify it."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[1] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self._counters['hits'] += 1
+                    return entry[0]
+                del self._entries[key]
+                self._counters['expired'] += 1
+            self._counters['misses'] += 1
+        return None
+
+    def put(self, key: str, sign_sequence: list) -> None:
+        if not self.max_entries or len(key) > self.max_text_chars:
+            return
+        with self._lock:
+            self._entries[key] = (sign_sequence, time.monotonic() + self.ttl_secs)
+            self._entries.move_to_end(key)
+            self._counters['stores'] += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._counters)
+            stats['entries'] = len(self._entries)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = round(stats['hits'] / lookups, 3) if lookups else None
+        return stats
@@ -0,0 +1,45 @@
+"""
+Incremental sentence splitting for bulk translation.
+
+iter_sentences() turns a stream of text chunks into sentence-sized segments
+without ever holding more than one unfinished sentence (at most `max_chars`)
+in memory, so a transcript or subtitle file can be translated while it is
+still being received.
+"""
+
+import re
+
+# End of a sentence: terminal punctuation (plus closing quotes/brackets) followed by whitespace,
+# or a blank line (paragraphs, subtitle cues)
+_BOUNDARY = re.compile(r'(?:(?<=[.!?])|(?<=[.!?]["\')\]]))\s+|\n\s*\n')
+
+
+def _cut_long(buffer: str, max_chars: int):
+    """Split an over-long run without a sentence boundary at the last whitespace before `max_chars`."""
+    cut = buffer.rfind(' ', 0, max_chars)
+    if cut <= 0:
+        cut = max_chars
+    return buffer[:cut], buffer[cut:]
+
+
+def iter_sentences(chunks, max_chars: int = 2000):
+    """Yield stripped, non-empty sentences from an iterable of text chunks."""
+    buffer = ''
+    for chunk in chunks:
+        if not chunk:
+            continue
+        buffer += chunk
+        start = 0
+        for match in _BOUNDARY.finditer(buffer):
+            sentence = buffer[start:match.start()].strip()
+            start = match.end()
+            if sentence:
+                yield sentence
+        buffer = buffer[start:]
+        while len(buffer) > max_chars:
+            head, buffer = _cut_long(buffer, max_chars)
+            if head.strip():
+                yield head.strip()
+    # A sentence that runs into the end of the input has no boundary after it
+    if buffer.strip():
+        yield buffer.strip()
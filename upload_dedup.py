@@ -0,0 +1,105 @@
+"""
+Content-addressed de-duplication of uploaded audio.
+
+Uploads are hashed (SHA-256) while they stream into the spool. Before a new
+upload is sent to S3 and Transcribe, its digest is looked up here:
+
+  - another upload with the same content is still being processed by this
+    process: the new request shares that job instead of starting its own
+  - the content was transcribed before: the earlier job's result is reused
+  - otherwise the upload claims the digest and is processed normally; the
+    claim becomes a completed entry when its job succeeds, or is dropped if
+    it fails so the next copy tries again
+
+Completed entries are kept in a bounded in-process LRU and, through the
+optional load/save callables, in a store shared across processes and restarts.
+"""
+
+import threading
+from collections import OrderedDict
+
+NEW = 'new'
+IN_FLIGHT = 'in_flight'
+COMPLETED = 'completed'
+
+
+class UploadDedupIndex:
+    """Maps audio digests to the job that transcribed (or is transcribing) that audio."""
+
+    def __init__(self, max_entries: int = 10000, load=None, save=None):
+        """`load(digest)` returns a job id with a usable result or None; `save(digest, job_id)` persists one."""
+        self.max_entries = max(1, max_entries)
+        self._load = load
+        self._save = save
+        self._lock = threading.Lock()
+        self._in_flight = {}          # digest -> job_id
+        self._completed = OrderedDict()  # digest -> job_id
+        self._counters = {'new': 0, 'in_flight_hits': 0, 'completed_hits': 0, 'store_hits': 0, 'abandoned': 0}
+
+    def claim(self, digest: str, job_id: str):
+        """Return (NEW, job_id) if the caller should process the upload, else (IN_FLIGHT | COMPLETED, existing_job_id)."""
+        with self._lock:
+            found = self._lookup(digest)
+            if found is not None:
+                return found
+        stored = None
+        if self._load is not None:
+            try:
+                stored = self._load(digest)
+            except Exception as e:
+                print(f"[upload-dedup] Index lookup failed for {digest[:12]}: {e}")
+        with self._lock:
+            # Another request may have claimed the digest while the store was being read
+            found = self._lookup(digest)
+            if found is not None:
+                return found
+            if stored is not None:
+                self._remember(digest, stored)
+                self._counters['store_hits'] += 1
+                return COMPLETED, stored
+            self._in_flight[digest] = job_id
+            self._counters['new'] += 1
+            return NEW, job_id
+
+    def _lookup(self, digest):
+        job_id = self._in_flight.get(digest)
+        if job_id is not None:
+            self._counters['in_flight_hits'] += 1
+            return IN_FLIGHT, job_id
+        job_id = self._completed.get(digest)
+        if job_id is not None:
+            self._completed.move_to_end(digest)
+            self._counters['completed_hits'] += 1
+            return COMPLETED, job_id
+        return None
+
+    def _remember(self, digest, job_id):
+        self._completed[digest] = job_id
+        self._completed.move_to_end(digest)
+        while len(self._completed) > self.max_entries:
+            self._completed.popitem(last=False)
+
+    def complete(self, digest: str, job_id: str) -> None:
+        """The claiming job succeeded: later copies reuse its result."""
+        with self._lock:
+            if self._in_flight.get(digest) == job_id:
+                del self._in_flight[digest]
+            self._remember(digest, job_id)
+        if self._save is not None:
+            try:
+                self._save(digest, job_id)
+            except Exception as e:
+                print(f"[upload-dedup] Could not persist index entry for {digest[:12]}: {e}")
+
+    def abandon(self, digest: str, job_id: str) -> None:
+        """The claiming job failed: forget the claim so the next copy is processed again."""
+        with self._lock:
+            if self._in_flight.get(digest) == job_id:
+                del self._in_flight[digest]
+                self._counters['abandoned'] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._counters)
+            stats.update({'in_flight': len(self._in_flight), 'completed_entries': len(self._completed)})
+        return stats
@@ -0,0 +1,214 @@
+"""
+Bounded spooling of uploaded audio.
+
+Uploads are written straight from the request parser into a spool: small
+uploads stay in memory as long as the process-wide memory budget allows, and
+everything else goes to files in a size-capped spool directory. What the
+request handler gets back is a SpooledAudio reference (bytes or a path) that
+can be streamed to S3 and handed to the local fallback, so no upload is
+copied into a Python bytes object and held for the whole AWS wait window.
+"""
+
+import hashlib
+import io
+import os
+import tempfile
+import threading
+
+
+class SpoolFullError(RuntimeError):
+    """Raised when an upload would exceed the spool directory's size cap."""
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True  # exists, but owned by another user
+    return True
+
+
+class _HashingStream:
+    """Spool stream wrapper that hashes everything written to it on the way in."""
+
+    def __init__(self, stream):
+        self._stream = stream
+        self.hasher = hashlib.sha256()
+        self.spool_reserved = None
+
+    def write(self, data):
+        self.hasher.update(data)
+        return self._stream.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+class SpooledAudio:
+    """One uploaded audio file, in memory or on disk. Call release() when no longer needed.
+
+    `sha256` is the hex digest of the content, computed while it was received.
+    """
+
+    def __init__(self, spool, size: int, content_type: str, filename: str, data: bytes = None, path: str = None,
+                 sha256: str = None):
+        self._spool = spool
+        self.size = size
+        self.content_type = content_type
+        self.filename = filename
+        self.data = data
+        self.path = path
+        self.sha256 = sha256
+        self._released = False
+        self._lock = threading.Lock()
+
+    @property
+    def in_memory(self) -> bool:
+        return self.path is None
+
+    @property
+    def source(self):
+        """What vosk_engine.decode_pcm accepts: the bytes, or the spool file's path."""
+        return self.data if self.in_memory else self.path
+
+    def open(self):
+        """A fresh binary file object positioned at the start."""
+        return io.BytesIO(self.data) if self.in_memory else open(self.path, 'rb')
+
+    def release(self) -> None:
+        with self._lock:
+            if self._released:
+                return
+            self._released = True
+        self._spool._release(self)
+        self.data = None
+
+
+class UploadSpool:
+    """Creates upload streams within a memory budget and a disk cap, and tracks what is in flight."""
+
+    def __init__(self, directory: str = None, max_disk_bytes: int = 1024 * 1024 * 1024,
+                 memory_budget_bytes: int = 64 * 1024 * 1024, memory_threshold_bytes: int = 1024 * 1024):
+        self.directory = directory or os.path.join(tempfile.gettempdir(), 'stt_upload_spool')
+        self.max_disk_bytes = max(0, max_disk_bytes)
+        self.memory_budget_bytes = max(0, memory_budget_bytes)
+        self.memory_threshold_bytes = max(0, memory_threshold_bytes)
+        os.makedirs(self.directory, exist_ok=True)
+        self._remove_stale_files()
+
+        self._lock = threading.Lock()
+        self._memory_used = 0
+        self._disk_used = 0
+        self._counters = {'in_memory': 0, 'on_disk': 0, 'rejected': 0}
+
+    def _remove_stale_files(self) -> None:
+        """Delete spool files left behind by processes that are gone (crash, restart, shutdown mid-job).
+
+        Files are named upload-<pid>-*.part, so other live workers sharing the directory keep theirs.
+        """
+        removed = 0
+        for name in os.listdir(self.directory):
+            if not (name.startswith('upload-') and name.endswith('.part')):
+                continue
+            owner = name.split('-')[1]
+            if owner.isdigit() and int(owner) != os.getpid() and _process_alive(int(owner)):
+                continue
+            try:
+                os.unlink(os.path.join(self.directory, name))
+                removed += 1
+            except OSError:
+                pass
+        if removed:
+            print(f"[upload-spool] Removed {removed} stale spool file(s) from {self.directory}")
+
+    # --- Stream factory (called by the request parser for each uploaded file) ---
+    def create_stream(self, expected_bytes: int = None):
+        """Writable binary stream for an incoming upload of at most `expected_bytes`.
+
+        In memory if it fits under the threshold and the remaining memory budget,
+        otherwise a file in the spool directory; raises SpoolFullError if neither fits.
+        """
+        expected = expected_bytes if expected_bytes is not None else self.memory_threshold_bytes + 1
+        with self._lock:
+            if expected <= self.memory_threshold_bytes and self._memory_used + expected <= self.memory_budget_bytes:
+                self._memory_used += expected
+                stream = _HashingStream(io.BytesIO())
+                stream.spool_reserved = ('memory', expected)
+                return stream
+            if self._disk_used + expected > self.max_disk_bytes:
+                self._counters['rejected'] += 1
+                raise SpoolFullError('Upload spool is full. Please try again shortly.')
+            self._disk_used += expected
+        try:
+            stream = _HashingStream(tempfile.NamedTemporaryFile('w+b', dir=self.directory, prefix=f'upload-{os.getpid()}-', suffix='.part', delete=False))
+        except OSError:
+            with self._lock:
+                self._disk_used -= expected
+            raise
+        stream.spool_reserved = ('disk', expected)
+        return stream
+
+    def adopt(self, stream, content_type: str = None, filename: str = None) -> SpooledAudio:
+        """Take ownership of a stream from create_stream(); its reservation shrinks to the real size."""
+        kind, reserved = stream.spool_reserved
+        stream.spool_reserved = None  # no longer discard()-able
+        digest = stream.hasher.hexdigest()
+        if kind == 'memory':
+            data = stream.getvalue()
+            audio = SpooledAudio(self, len(data), content_type, filename, data=data, sha256=digest)
+            with self._lock:
+                self._memory_used += audio.size - reserved
+                self._counters['in_memory'] += 1
+        else:
+            stream.flush()
+            size = os.fstat(stream.fileno()).st_size
+            stream.close()
+            audio = SpooledAudio(self, size, content_type, filename, path=stream.name, sha256=digest)
+            with self._lock:
+                self._disk_used += size - reserved
+                self._counters['on_disk'] += 1
+        return audio
+
+    def discard(self, stream) -> None:
+        """Drop a stream that was never adopted (e.g. the request failed validation)."""
+        reserved = getattr(stream, 'spool_reserved', None)
+        if not reserved:
+            return
+        stream.spool_reserved = None
+        kind, amount = reserved
+        try:
+            stream.close()
+            if kind == 'disk':
+                os.unlink(stream.name)
+        except OSError:
+            pass
+        with self._lock:
+            if kind == 'memory':
+                self._memory_used -= amount
+            else:
+                self._disk_used -= amount
+
+    def _release(self, audio: SpooledAudio) -> None:
+        if not audio.in_memory:
+            try:
+                os.unlink(audio.path)
+            except OSError as e:
+                print(f"[upload-spool] Could not remove {audio.path}: {e}")
+        with self._lock:
+            if audio.in_memory:
+                self._memory_used -= audio.size
+            else:
+                self._disk_used -= audio.size
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._counters)
+            stats.update({
+                'memory_used_bytes': self._memory_used,
+                'memory_budget_bytes': self.memory_budget_bytes,
+                'disk_used_bytes': self._disk_used,
+                'max_disk_bytes': self.max_disk_bytes,
+            })
+        return stats
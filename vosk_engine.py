@@ -0,0 +1,311 @@
+"""
+Process-wide Vosk model registry and streaming decode pipeline for the local
+transcription fallback.
+
+The acoustic model is read from disk once per process and shared by every
+fallback job. KaldiRecognizer instances are pooled per sample rate and reset
+between uses, so a burst of fallback jobs pays neither the model load nor the
+recognizer construction more than once.
+
+Audio is decoded by an ffmpeg subprocess: the upload is piped into its stdin
+and raw PCM is fed to the recognizer as it comes out of stdout, so memory use
+does not depend on the length of the recording.
+"""
+
+import json
+import os
+import subprocess
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+SAMPLE_RATE = 16000
+BYTES_PER_SAMPLE = 2  # ffmpeg emits 16-bit little-endian mono PCM
+PCM_CHUNK_BYTES = 4000 * BYTES_PER_SAMPLE
+PIPE_WRITE_BYTES = 64 * 1024
+
+# Containers whose index may sit at the end of the file; ffmpeg needs to seek
+# to read them, so they are decoded from a (self-deleting) temp file instead of stdin.
+SEEKABLE_CONTENT_HINTS = ('mp4', 'm4a', 'quicktime', '3gp')
+
+
+class VoskModelRegistry:
+    """Loads a Vosk model once and hands out warm, pooled recognizers.
+
+    A failed load is remembered for `load_retry_secs`, so fallback jobs in the
+    meantime fail fast instead of each paying for (and logging) another attempt.
+    """
+
+    def __init__(self, model_path: str = None, max_pool_size: int = 4, load_retry_secs: float = 60):
+        self.model_path = model_path or os.getenv('VOSK_MODEL_PATH', 'vosk-model-small-en-us-0.15')
+        self.max_pool_size = max(1, max_pool_size)
+        self.load_retry_secs = max(0.0, load_retry_secs)
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._model = None
+        self._load_secs = None
+        self._load_error = None
+        self._retry_at = 0.0
+        self._load_failures = 0
+        self._idle = {}       # sample_rate -> [KaldiRecognizer, ...]
+        self._in_use = {}     # sample_rate -> number of checked-out recognizers
+        self._created = 0
+        self._reused = 0
+
+    def get_model(self):
+        """Return the shared model, loading it on first use.
+
+        Returns None if unavailable; after a failure no new attempt is made for `load_retry_secs`.
+        """
+        if self._model is not None:
+            return self._model
+        if time.monotonic() < self._retry_at:
+            return None
+        with self._load_lock:
+            if self._model is not None:
+                return self._model
+            if time.monotonic() < self._retry_at:
+                return None
+            if not os.path.isdir(self.model_path):
+                self._load_failed(f"model not found at '{self.model_path}' (download it and set VOSK_MODEL_PATH)")
+                return None
+            started = time.perf_counter()
+            try:
+                from vosk import Model
+                self._model = Model(self.model_path)
+            except Exception as e:
+                self._load_failed(f"failed to load model '{self.model_path}': {e}")
+                return None
+            self._load_secs = time.perf_counter() - started
+            self._load_error = None
+            print(f"[vosk-registry] Loaded model '{self.model_path}' in {self._load_secs:.2f}s")
+            return self._model
+
+    def _load_failed(self, error: str):
+        self._load_error = error
+        self._load_failures += 1
+        self._retry_at = time.monotonic() + self.load_retry_secs
+        print(f"[vosk-registry] Vosk {error}; not retrying for {self.load_retry_secs:.0f}s")
+
+    def fork_copy(self, max_pool_size: int = 1) -> 'VoskModelRegistry':
+        """Registry for a forked child process: the same (inherited) model, fresh locks and an empty pool.
+
+        Locks copied by fork may have been held by another parent thread, so a child never uses them.
+        """
+        child = VoskModelRegistry(self.model_path, max_pool_size, self.load_retry_secs)
+        child._model = self._model
+        child._load_secs = self._load_secs
+        return child
+
+    @contextmanager
+    def recognizer(self, sample_rate: int):
+        """Check out a recognizer for `sample_rate`; it is reset and returned to the pool on exit.
+
+        Yields None when the model cannot be loaded.
+        """
+        model = self.get_model()
+        if model is None:
+            yield None
+            return
+
+        rec = None
+        with self._lock:
+            idle = self._idle.get(sample_rate)
+            if idle:
+                rec = idle.pop()
+                self._reused += 1
+            self._in_use[sample_rate] = self._in_use.get(sample_rate, 0) + 1
+
+        try:
+            if rec is None:
+                from vosk import KaldiRecognizer
+                rec = KaldiRecognizer(model, sample_rate)
+                rec.SetWords(True)
+                with self._lock:
+                    self._created += 1
+            yield rec
+        finally:
+            reusable = False
+            if rec is not None:
+                try:
+                    rec.Reset()
+                    reusable = True
+                except Exception as e:
+                    print(f"[vosk-registry] Discarding recognizer that failed to reset: {e}")
+            with self._lock:
+                self._in_use[sample_rate] -= 1
+                idle = self._idle.setdefault(sample_rate, [])
+                if reusable and len(idle) < self.max_pool_size:
+                    idle.append(rec)
+
+    def stats(self) -> dict:
+        """Snapshot of model load time and pool occupancy, keyed by sample rate."""
+        with self._lock:
+            rates = sorted(set(self._idle) | set(self._in_use))
+            return {
+                'model_path': self.model_path,
+                'model_loaded': self._model is not None,
+                'model_load_secs': self._load_secs,
+                'model_load_failures': self._load_failures,
+                'model_load_error': self._load_error,
+                'model_retry_in_secs': max(0.0, round(self._retry_at - time.monotonic(), 1)) if self._load_error else None,
+                'max_pool_size': self.max_pool_size,
+                'recognizers_created': self._created,
+                'recognizers_reused': self._reused,
+                'pools': {
+                    str(rate): {
+                        'idle': len(self._idle.get(rate, [])),
+                        'in_use': self._in_use.get(rate, 0),
+                    }
+                    for rate in rates
+                },
+            }
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry(model_path: str = None, max_pool_size: int = 4, load_retry_secs: float = 60) -> VoskModelRegistry:
+    """Return the process-wide registry, creating it on first call."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = VoskModelRegistry(model_path, max_pool_size, load_retry_secs)
+    return _registry
+
+
+def _needs_seekable_input(content_type: str) -> bool:
+    content_type = (content_type or '').lower()
+    return any(hint in content_type for hint in SEEKABLE_CONTENT_HINTS)
+
+
+def _iter_source(source):
+    """Yield byte blocks from raw bytes or a binary file object."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        view = memoryview(source)
+        for i in range(0, len(view), PIPE_WRITE_BYTES):
+            yield view[i:i + PIPE_WRITE_BYTES]
+        return
+    while True:
+        block = source.read(PIPE_WRITE_BYTES)
+        if not block:
+            return
+        yield block
+
+
+def _feed_stdin(proc, source):
+    try:
+        for block in _iter_source(source):
+            proc.stdin.write(block)
+    except (BrokenPipeError, ValueError):
+        # ffmpeg exited early (bad input); its return code reports the failure
+        pass
+    except Exception as e:
+        print(f"[fallback-local] Failed to feed audio to ffmpeg: {e}")
+    finally:
+        try:
+            proc.stdin.close()
+        except Exception:
+            pass
+
+
+@contextmanager
+def decode_pcm(source, content_type: str = None, sample_rate: int = SAMPLE_RATE):
+    """Decode `source` (bytes, binary file object or file path) with ffmpeg.
+
+    Yields an iterator of raw mono s16le PCM chunks. Input is streamed into
+    ffmpeg's stdin from a writer thread so decoding overlaps with reading the
+    output; nothing is written to disk except for containers that need seeking.
+    Raises RuntimeError if ffmpeg exits with an error.
+    """
+    tmp_path = None
+    if isinstance(source, str):
+        input_arg = source
+    elif _needs_seekable_input(content_type):
+        with tempfile.NamedTemporaryFile(suffix='.input', delete=False) as tmp:
+            for block in _iter_source(source):
+                tmp.write(block)
+            tmp_path = tmp.name
+        input_arg = tmp_path
+    else:
+        input_arg = 'pipe:0'
+
+    piped = input_arg == 'pipe:0'
+    ffmpeg_cmd = [
+        'ffmpeg', '-hide_banner', '-loglevel', 'error',
+        '-i', input_arg,
+        '-f', 's16le', '-acodec', 'pcm_s16le', '-ac', '1', '-ar', str(sample_rate),
+        'pipe:1',
+    ]
+    proc = None
+    writer = None
+    try:
+        proc = subprocess.Popen(
+            ffmpeg_cmd,
+            stdin=subprocess.PIPE if piped else subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        if piped:
+            writer = threading.Thread(target=_feed_stdin, args=(proc, source), daemon=True)
+            writer.start()
+
+        def chunks():
+            while True:
+                chunk = proc.stdout.read(PCM_CHUNK_BYTES)
+                if not chunk:
+                    break
+                yield chunk
+            if proc.wait() != 0:
+                err = proc.stderr.read().decode('utf-8', 'replace').strip()
+                raise RuntimeError(f"ffmpeg exited with code {proc.returncode}: {err}")
+
+        yield chunks()
+    finally:
+        if proc is not None:
+            if proc.poll() is None:
+                proc.kill()
+            proc.wait()
+            for stream in (proc.stdout, proc.stderr):
+                if stream:
+                    stream.close()
+        if writer is not None:
+            writer.join(timeout=5)
+        if tmp_path:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+
+def transcribe_stream(registry: VoskModelRegistry, source, content_type: str = None) -> dict:
+    """Decode and recognize `source` in one streaming pass.
+
+    Returns {'text': str, 'words': [...], 'duration': secs} with utterances
+    joined in order, or None if the model, ffmpeg or the decode is unavailable.
+    """
+    pcm_bytes = 0
+    try:
+        with registry.recognizer(SAMPLE_RATE) as rec:
+            if rec is None:
+                return None
+            with decode_pcm(source, content_type) as chunks:
+                utterances = []
+                for chunk in chunks:
+                    pcm_bytes += len(chunk)
+                    if rec.AcceptWaveform(chunk):
+                        utterances.append(json.loads(rec.Result()))
+                utterances.append(json.loads(rec.FinalResult()))
+    except FileNotFoundError as e:
+        print(f"[fallback-local] ffmpeg not found: {e}. If newly installed, restart the server.")
+        return None
+    except RuntimeError as e:
+        print(f"[fallback-local] ffmpeg failed to decode audio: {e}")
+        return None
+
+    text = ' '.join(u.get('text', '').strip() for u in utterances if u.get('text', '').strip())
+    words = [w for u in utterances for w in u.get('result', [])]
+    return {'text': text, 'words': words, 'duration': pcm_bytes / (SAMPLE_RATE * BYTES_PER_SAMPLE)}
@@ -0,0 +1,282 @@
+"""
+Parallel chunked transcription for long recordings.
+
+transcribe_stream() runs a whole recording through one recognizer on one
+thread, so fallback latency grows with the length of the audio and only one
+core is busy. When a worker pool is running, ParallelTranscriber decodes the
+audio once to a raw PCM temp file; recordings of at least
+VOSK_PARALLEL_MIN_SECS are cut inside pauses (found from per-frame energy)
+into segments of roughly VOSK_SEGMENT_TARGET_SECS, and the segments are
+recognized concurrently on the pool. Text and word timings are stitched back
+together in order, with timings relative to the start of the recording.
+
+The pool is forked by start(), after the model has been loaded, so every
+worker shares the parent's model pages instead of loading its own copy.
+start() must run before the process starts any other thread: forking a
+multi-threaded process can copy locks another thread holds and deadlock the
+child. The pool is therefore never forked lazily or re-forked at runtime.
+Without a running pool (not started, pool broken, no fork on the platform,
+a single worker) recordings go straight to transcribe_stream(), so decoding
+and recognition still overlap and nothing is written to disk.
+"""
+
+import json
+import multiprocessing
+import operator
+import os
+import sys
+import tempfile
+import threading
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from vosk_engine import SAMPLE_RATE, BYTES_PER_SAMPLE, PCM_CHUNK_BYTES, decode_pcm, transcribe_stream
+
+FRAME_MS = 30
+FRAME_BYTES = SAMPLE_RATE * FRAME_MS // 1000 * BYTES_PER_SAMPLE
+FRAME_SECS = FRAME_MS / 1000.0
+# A frame is silent below SILENCE_RATIO x the 90th percentile frame energy (-20 dB), or SILENCE_FLOOR
+SILENCE_RATIO = 0.01
+SILENCE_FLOOR = 400.0
+MIN_PAUSE_SECS = 0.3
+
+
+def frame_energy(frame: bytes) -> float:
+    """Mean square of a frame of s16le PCM (every other sample is enough to tell speech from silence)."""
+    samples = array('h', frame)
+    if sys.byteorder == 'big':
+        samples.byteswap()
+    samples = samples[::2]
+    return sum(map(operator.mul, samples, samples)) / max(len(samples), 1)
+
+
+def pcm_frame_energies(pcm_path: str) -> list:
+    """frame_energy() of every FRAME_MS frame of a raw PCM file (the last frame may be short)."""
+    energies = []
+    with open(pcm_path, 'rb') as f:
+        while True:
+            frame = f.read(FRAME_BYTES)
+            if not frame:
+                return energies
+            energies.append(frame_energy(frame))
+
+
+def split_at_silence(energies, target_secs: float, max_secs: float, min_pause_secs: float = MIN_PAUSE_SECS):
+    """Cut a recording, given per-frame energies, into [(start_frame, end_frame), ...] covering every frame.
+
+    Each cut falls in the middle of a pause: the longest pause between half the target
+    length and the maximum length of the current segment, or the quietest frame there
+    if the speaker never pauses.
+    """
+    n = len(energies)
+    if n == 0:
+        return []
+    target = max(1, int(target_secs / FRAME_SECS))
+    longest = max(target, int(max_secs / FRAME_SECS))
+    if n <= longest:
+        return [(0, n)]
+
+    threshold = max(SILENCE_FLOOR, sorted(energies)[int(n * 0.9)] * SILENCE_RATIO)
+    min_pause = max(1, int(min_pause_secs / FRAME_SECS))
+    pauses = []  # (middle frame, length in frames), in order
+    run_start = None
+    for i in range(n + 1):
+        if i < n and energies[i] < threshold:
+            if run_start is None:
+                run_start = i
+        elif run_start is not None:
+            if i - run_start >= min_pause:
+                pauses.append((run_start + (i - run_start) // 2, i - run_start))
+            run_start = None
+
+    segments = []
+    start = 0
+    while n - start > longest:
+        lo, hi = start + target // 2, start + longest
+        candidates = [(length, -abs(mid - start - target), mid) for mid, length in pauses if lo < mid <= hi]
+        if candidates:
+            cut = max(candidates)[2]
+        else:
+            cut = min(range(lo + 1, hi + 1), key=lambda i: energies[i])
+        segments.append((start, cut))
+        start = cut
+    segments.append((start, n))
+    return segments
+
+
+def recognize_segment(registry, pcm_path: str, start_byte: int, end_byte: int, offset_secs: float) -> dict:
+    """Recognize one byte range of a raw PCM file; word timings are shifted by `offset_secs`."""
+    utterances = []
+    with registry.recognizer(SAMPLE_RATE) as rec:
+        if rec is None:
+            return None
+        with open(pcm_path, 'rb') as f:
+            f.seek(start_byte)
+            remaining = end_byte - start_byte
+            while remaining > 0:
+                chunk = f.read(min(PCM_CHUNK_BYTES, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                if rec.AcceptWaveform(chunk):
+                    utterances.append(json.loads(rec.Result()))
+        utterances.append(json.loads(rec.FinalResult()))
+
+    text = ' '.join(u.get('text', '').strip() for u in utterances if u.get('text', '').strip())
+    words = []
+    for u in utterances:
+        for w in u.get('result', []):
+            w = dict(w)
+            if 'start' in w:
+                w['start'] = round(w['start'] + offset_secs, 3)
+            if 'end' in w:
+                w['end'] = round(w['end'] + offset_secs, 3)
+            words.append(w)
+    return {'text': text, 'words': words}
+
+
+# --- Pool worker side ---
+_shared_registry = None  # set in the parent right before the pool forks
+_worker_registry = None
+
+
+def _init_worker():
+    global _worker_registry
+    _worker_registry = _shared_registry.fork_copy()
+
+
+def _pool_recognize(pcm_path, start_byte, end_byte, offset_secs):
+    return recognize_segment(_worker_registry, pcm_path, start_byte, end_byte, offset_secs)
+
+
+class ParallelTranscriber:
+    """Splits long recordings at pauses and recognizes the segments on a forked process pool."""
+
+    def __init__(self, registry, workers: int = 1, min_parallel_secs: float = 45,
+                 target_segment_secs: float = 20, max_segment_secs: float = 40):
+        self.registry = registry
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        if 'fork' not in multiprocessing.get_all_start_methods():
+            self.workers = 1
+        self.min_parallel_secs = min_parallel_secs
+        self.target_segment_secs = target_segment_secs
+        self.max_segment_secs = max(max_segment_secs, target_segment_secs)
+        self._lock = threading.Lock()
+        self._pool = None
+        self._counters = {'jobs': 0, 'parallel_jobs': 0, 'segments': 0, 'audio_secs': 0.0, 'pool_failures': 0}
+
+    def start(self) -> bool:
+        """Load the model and fork the pool.
+
+        Call once at startup, before any other thread exists in the process.
+        """
+        global _shared_registry
+        if self.registry.get_model() is None:
+            return False
+        with self._lock:
+            if self.workers <= 1 or self._pool is not None:
+                return True
+            _shared_registry = self.registry
+            pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context('fork'),
+                initializer=_init_worker,
+            )
+            # ProcessPoolExecutor forks on demand; start every worker now, while this is the only thread
+            futures = [pool.submit(os.getpid) for _ in range(self.workers)]
+            for future in futures:
+                future.result()
+            self._pool = pool
+        print(f"[vosk-parallel] Forked {self.workers} transcription workers")
+        return True
+
+    def _discard_pool(self, pool):
+        """Drop a broken pool for good; re-forking now would fork a multi-threaded process."""
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+                self._counters['pool_failures'] += 1
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def transcribe(self, source, content_type: str = None) -> dict:
+        """Same contract as vosk_engine.transcribe_stream, plus the number of segments.
+
+        Returns {'text': str, 'words': [...], 'segments': int}, or None if the model,
+        ffmpeg or the decode is unavailable.
+        """
+        with self._lock:
+            pool = self._pool
+        if pool is None:
+            result = transcribe_stream(self.registry, source, content_type)
+            if result is not None:
+                self._count(False, 1, result['duration'])
+                result['segments'] = 1
+            return result
+        if self.registry.get_model() is None:
+            return None
+        try:
+            with tempfile.NamedTemporaryFile(prefix='pcm-', suffix='.raw') as pcm:
+                with decode_pcm(source, content_type) as chunks:
+                    for chunk in chunks:
+                        pcm.write(chunk)
+                pcm.flush()
+                return self._recognize(pool, pcm.name, pcm.tell())
+        except FileNotFoundError as e:
+            print(f"[fallback-local] ffmpeg not found: {e}. If newly installed, restart the server.")
+            return None
+        except RuntimeError as e:
+            print(f"[fallback-local] ffmpeg failed to decode audio: {e}")
+            return None
+
+    def _recognize(self, pool, pcm_path: str, total_bytes: int) -> dict:
+        duration = total_bytes / (SAMPLE_RATE * BYTES_PER_SAMPLE)
+        if duration >= self.min_parallel_secs:
+            energies = pcm_frame_energies(pcm_path)
+            frames = split_at_silence(energies, self.target_segment_secs, self.max_segment_secs)
+        else:
+            frames = [(0, -(-total_bytes // FRAME_BYTES))]
+        tasks = [
+            (pcm_path, start * FRAME_BYTES, min(end * FRAME_BYTES, total_bytes), start * FRAME_SECS)
+            for start, end in frames
+        ]
+
+        results = None
+        if len(tasks) > 1:
+            try:
+                results = list(pool.map(_pool_recognize, *zip(*tasks)))
+            except BrokenProcessPool as e:
+                print(f"[vosk-parallel] Worker pool broke ({e}); transcribing in-process from now on")
+                self._discard_pool(pool)
+        parallel = results is not None
+        if results is None:
+            results = [recognize_segment(self.registry, *task) for task in tasks]
+        if any(r is None for r in results):
+            return None
+
+        self._count(parallel, len(tasks), duration)
+        return {
+            'text': ' '.join(r['text'] for r in results if r['text']),
+            'words': [w for r in results for w in r['words']],
+            'segments': len(tasks),
+        }
+
+    def _count(self, parallel: bool, segments: int, duration: float):
+        with self._lock:
+            self._counters['jobs'] += 1
+            self._counters['parallel_jobs'] += parallel
+            self._counters['segments'] += segments
+            self._counters['audio_secs'] += duration
+
+    def shutdown(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._counters)
+            stats.update({'workers': self.workers, 'pool_running': self._pool is not None})
+        stats['audio_secs'] = round(stats['audio_secs'], 1)
+        return stats